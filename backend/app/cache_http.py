@@ -0,0 +1,104 @@
+# app/cache_http.py
+
+"""
+Peticiones condicionales (ETag / If-None-Match) y Cache-Control.
+Los catálogos y los lotes cerrados casi no cambian: el navegador guarda la
+respuesta, la reutiliza mientras está fresca y después la revalida con
+If-None-Match. Si no cambió recibe un 304 sin cuerpo, que en conexiones
+rurales lentas ahorra descargar todo de nuevo.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from app.config import settings
+from app.respuestas import codificar_json, copiar_cabeceras
+
+
+def _etag(contenido: bytes) -> str:
+    return '"' + hashlib.blake2b(contenido, digest_size=16).hexdigest() + '"'
+
+
+def calcular_etag(*partes: Any) -> str:
+    """
+    ETag fuerte a partir del contenido.
+    
+    Se calcula sobre las filas tal como llegan de Supabase (y los parámetros
+    de la petición), antes de validarlas y serializarlas con el modelo.
+    """
+    return _etag(json.dumps(partes, sort_keys=True, default=str, separators=(",", ":")).encode())
+
+
+def politica_catalogo() -> str:
+    """Cache-Control de corrales y alimentos"""
+    return (
+        f"private, max-age={settings.http_cache_catalogo_segundos}, "
+        f"stale-while-revalidate={settings.http_cache_revalidar_segundos}"
+    )
+
+
+def politica_lote(cerrado: bool) -> str:
+    """Cache-Control de un lote y sus reportes: los activos se revalidan siempre"""
+    if not cerrado:
+        return "private, no-cache"
+    return (
+        f"private, max-age={settings.http_cache_cerrados_segundos}, "
+        f"stale-while-revalidate={settings.http_cache_revalidar_segundos}"
+    )
+
+
+def _coincide(request: Request, etag: str) -> bool:
+    """If-None-Match usa comparación débil: W/"x" coincide con "x" """
+    encabezado = request.headers.get("if-none-match")
+    if not encabezado:
+        return False
+    if encabezado.strip() == "*":
+        return True
+    return any(valor.strip().removeprefix("W/") == etag for valor in encabezado.split(","))
+
+
+def condicional(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str
+) -> Optional[Response]:
+    """
+    Pone ETag y Cache-Control en la respuesta de la ruta.
+    
+    Returns:
+        Un 304 si el cliente ya tiene esta versión; None si hay que enviar el cuerpo
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    
+    if _coincide(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    
+    return None
+
+
+@dataclass(frozen=True)
+class Version:
+    """Reporte ya serializado, con su ETag y su política de cache"""
+    cuerpo: bytes
+    etag: str
+    cache_control: str
+    
+    @classmethod
+    def de(cls, datos: Any, cache_control: str) -> "Version":
+        """Serializa una vez; el ETag es el hash de esos mismos bytes"""
+        cuerpo = codificar_json(datos)
+        return cls(cuerpo=cuerpo, etag=_etag(cuerpo), cache_control=cache_control)
+    
+    def responder(self, request: Request, response: Response) -> Response:
+        """304 si el cliente ya la tiene; si no, el cuerpo guardado tal cual"""
+        no_modificado = condicional(request, response, self.etag, self.cache_control)
+        if no_modificado:
+            return no_modificado
+        
+        return copiar_cabeceras(response, Response(self.cuerpo, media_type="application/json"))
@@ -0,0 +1,162 @@
+# app/campos.py
+
+"""
+Selección de campos (`fields=`) y recursos embebidos (`expand=`) en los
+endpoints de lectura.
+Los campos pedidos se traducen a un `select` angosto de PostgREST y la
+respuesta se valida y serializa con un modelo reducido, así viajan y se
+procesan solo las columnas que la pantalla necesita.
+
+Ejemplo:
+    GET /api/corrales/?fields=id,nombre
+    GET /api/lotes/{id}?fields=numero_lote,estado&expand=corrales_asignados
+"""
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel, TypeAdapter, create_model
+
+from app.respuestas import copiar_cabeceras
+
+
+@dataclass
+class Campos:
+    """Campos y embebidos pedidos en una petición"""
+    modelo: type[BaseModel]
+    columnas: Optional[list[str]] = None   # None: todos los campos del modelo
+    expandir: list[str] = field(default_factory=list)
+    embebidos: dict[str, str] = field(default_factory=dict)
+    
+    @property
+    def completos(self) -> bool:
+        """No se pidió nada: respuesta con el modelo completo de siempre"""
+        return self.columnas is None and not self.expandir
+    
+    def pedidos(self) -> set[str]:
+        """Nombres de los campos que debe llevar la respuesta"""
+        return set(self.columnas or self.modelo.model_fields) | set(self.expandir)
+    
+    def seleccion(self, obligatorias: list[str] = ()) -> str:
+        """
+        Proyección de PostgREST para los campos pedidos.
+        
+        Args:
+            obligatorias: Columnas que la ruta necesita aunque no se pidan
+                          (ej. las de orden para el cursor de paginación)
+        """
+        if self.columnas is None:
+            partes = ["*"]
+        else:
+            partes = [", ".join(dict.fromkeys([*obligatorias, *self.columnas]))]
+        
+        partes += [self.embebidos[nombre] for nombre in self.expandir]
+        return ", ".join(partes)
+    
+    def responder(self, datos: Any, response: Optional[Response] = None) -> Any:
+        """
+        Serializa `datos` (una fila o una lista) con el modelo reducido.
+        
+        Sin `fields` ni `expand` devuelve los datos tal cual para que los
+        valide el response_model de la ruta.
+        """
+        if self.completos:
+            return datos
+        
+        adaptador = _adaptador(
+            self.modelo,
+            tuple(self.columnas or self.modelo.model_fields),
+            tuple(self.expandir),
+            isinstance(datos, list)
+        )
+        respuesta = Response(
+            content=adaptador.dump_json(adaptador.validate_python(datos)),
+            media_type="application/json"
+        )
+        
+        # Cabeceras que la ruta puso en el Response inyectado (ej. cursor de paginación)
+        return copiar_cabeceras(response, respuesta) if response is not None else respuesta
+
+
+@lru_cache(maxsize=256)
+def _modelo_parcial(
+    modelo: type[BaseModel],
+    nombres: tuple[str, ...],
+    expandidos: tuple[str, ...]
+) -> type[BaseModel]:
+    """Modelo con solo los campos pedidos de `modelo` (y los embebidos, sin tipo fijo)"""
+    definiciones = {
+        nombre: (modelo.model_fields[nombre].annotation, modelo.model_fields[nombre])
+        for nombre in nombres if nombre not in expandidos
+    }
+    definiciones.update({nombre: (Optional[Any], None) for nombre in expandidos})
+    
+    return create_model(f"{modelo.__name__}Parcial", **definiciones)
+
+
+@lru_cache(maxsize=256)
+def _adaptador(
+    modelo: type[BaseModel],
+    nombres: tuple[str, ...],
+    expandidos: tuple[str, ...],
+    lista: bool
+) -> TypeAdapter:
+    parcial = _modelo_parcial(modelo, nombres, expandidos)
+    return TypeAdapter(list[parcial] if lista else parcial)
+
+
+def parametros_campos(modelo: type[BaseModel], embebidos: Optional[dict[str, str]] = None):
+    """
+    Crea la dependencia de FastAPI que lee `fields` y `expand` para una ruta.
+    
+    Args:
+        modelo: Modelo de respuesta completo de la ruta
+        embebidos: Nombre expandible -> recurso embebido de PostgREST,
+                   ej. {"alimento": "alimento:alimentos(nombre, tipo)"}
+    """
+    embebidos = embebidos or {}
+    
+    def dependencia(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Campos a devolver separados por coma: {', '.join(modelo.model_fields)}"
+        ),
+        expand: Optional[str] = Query(
+            None,
+            description=(
+                f"Recursos embebidos separados por coma: {', '.join(embebidos) or 'ninguno'}"
+            )
+        )
+    ) -> Campos:
+        columnas = _lista(fields) or None
+        expandir = _lista(expand) or []
+        
+        desconocidos = [c for c in columnas or [] if c not in modelo.model_fields]
+        if desconocidos:
+            raise HTTPException(
+                status_code=400, detail=f"Campos desconocidos: {', '.join(desconocidos)}"
+            )
+        
+        desconocidos = [e for e in expandir if e not in embebidos]
+        if desconocidos:
+            raise HTTPException(
+                status_code=400, detail=f"No se puede expandir: {', '.join(desconocidos)}"
+            )
+        
+        return Campos(
+            modelo=modelo,
+            columnas=[c for c in columnas if c not in expandir] if columnas is not None else None,
+            expandir=expandir,
+            embebidos=embebidos
+        )
+    
+    return dependencia
+
+
+def _lista(valor: Optional[str]) -> Optional[list[str]]:
+    """Ej. "a, b,,a" -> ["a", "b"]; None si no vino el parámetro"""
+    if valor is None:
+        return None
+    return list(dict.fromkeys(parte.strip() for parte in valor.split(",") if parte.strip()))
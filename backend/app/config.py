@@ -6,6 +6,8 @@ Lee las variables de entorno del archivo .env y las hace disponibles
 en toda la aplicación de forma tipo-segura.
 """
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -23,11 +25,74 @@ class Settings(BaseSettings):
     supabase_url: str  # URL del proyecto de Supabase
     supabase_key: str  # API Key pública (anon key)
     
+    # Hilos dedicados a las consultas a Supabase (el cliente es síncrono)
+    db_max_workers: int = 10
+    
+    # Transporte HTTP hacia PostgREST (ver app/transporte_db.py)
+    db_pool_conexiones: int = 10                  # Máximo de conexiones abiertas (= db_max_workers)
+    db_pool_conexiones_ociosas: int = 10          # Conexiones que quedan abiertas entre consultas
+    db_keepalive_segundos: float = 60             # Tiempo que una conexión ociosa sigue abierta
+    db_http2: bool = False                        # HTTP/2 (requiere h2); con pool, HTTP/1.1 basta
+    db_timeout_conexion_segundos: float = 5       # Conectar (TCP + TLS) o esperar lugar en el pool
+    db_timeout_lectura_segundos: float = 30       # Respuesta de una consulta
+    db_reintentos: int = 2                        # Reintentos de GET por red caída o 502/503/504
+    db_reintento_espera_base_segundos: float = 0.1
+    db_reintento_espera_maxima_segundos: float = 2
+    # Filas por consulta al leer por bloques; no más que max_rows de PostgREST
+    db_filas_por_bloque: int = 1000
+    
+    # Arranque y sondas de salud (/livez, /readyz, /health)
+    calentar_al_iniciar: bool = True       # Crear cliente y probar BD al arrancar, en segundo plano
+    salud_cache_segundos: float = 10       # Vigencia del último resultado de la sonda a la BD
+    salud_timeout_segundos: float = 5      # Tiempo máximo de la consulta de prueba
+    
     # Configuración del servidor backend
     backend_host: str = "0.0.0.0"  # IP donde corre el servidor
     backend_port: int = 8000        # Puerto del servidor
     backend_reload: bool = True     # Auto-reload en desarrollo
     
+    # Cache de reportes en memoria
+    reportes_cache_max_entradas: int = 512   # Máximo de resultados guardados
+    reportes_cache_ttl_segundos: int = 300   # Vigencia de cada resultado
+    
+    # Motor del resumen de la granja: "decimal" (fila a fila) o "vectorizado" (NumPy)
+    motor_resumen: Literal["decimal", "vectorizado"] = "decimal"
+    
+    # Etapa de cálculo de costos, indicadores y resumen (ver app/services/pool_calculo.py)
+    calculo_procesos: int = 0                 # Procesos dedicados; 0 = calcular en el event loop
+    # Trabajo estimado (meses × lotes + filas) desde el que se usa el pool
+    calculo_umbral_trabajo: int = 20000
+    
+    # Paginación de los endpoints de listas
+    paginacion_limite_defecto: int = 100   # Filas por página si llega `cursor` sin `limite`
+    paginacion_limite_maximo: int = 500    # Tope de `limite`
+    
+    # Series de consumo (/consumo-alimento/.../serie)
+    serie_consumo_max_puntos: int = 120   # Tope de puntos; más períodos se juntan por punto
+    
+    # Cache HTTP (Cache-Control) de catálogos y lotes cerrados
+    http_cache_catalogo_segundos: int = 60        # Corrales y alimentos frescos en el navegador
+    http_cache_cerrados_segundos: int = 600       # Lotes cerrados y sus reportes
+    http_cache_revalidar_segundos: int = 86400    # stale-while-revalidate
+    
+    # Máximo de filas por petición en los endpoints /bulk
+    carga_masiva_max_registros: int = 1000
+    
+    # Presupuesto de consultas a Supabase por petición (detecta patrones N+1)
+    # Formato "modulo.funcion=N,...", ej. "reportes.get_costos_lote=8"
+    # El resumen lee las vistas por bloques: 7 consultas más una por cada
+    # db_filas_por_bloque filas extra (12 con 500 lotes y 3 años)
+    presupuesto_consultas: str = (
+        "reportes.get_costos_lote=8,"
+        "reportes.get_indicadores_lote=10,"
+        "reportes.get_prorrateo_mes=5,"
+        "reportes.get_prorrateo_mes_granja=5,"
+        "reportes.get_resumen_granja=16,"
+        "lotes.get_lote=3"
+    )
+    presupuesto_consultas_defecto: int = 0        # Rutas sin presupuesto propio (0 = sin límite)
+    presupuesto_consultas_estricto: bool = False  # En tests: exceder responde 500 en vez de avisar
+    
     # Configuración CORS (orígenes permitidos)
     cors_origins: str = "http://localhost:5173,http://localhost:3000"
     
@@ -50,6 +115,21 @@ class Settings(BaseSettings):
         -> ["http://localhost:5173", "http://localhost:3000"]
         """
         return [origin.strip() for origin in self.cors_origins.split(",")]
+    
+    def get_presupuesto_consultas(self) -> dict[str, int]:
+        """
+        Convierte la cadena de presupuestos en un dict.
+        
+        Ejemplo:
+        "reportes.get_costos_lote=8,lotes.get_lote=4"
+        -> {"reportes.get_costos_lote": 8, "lotes.get_lote": 4}
+        """
+        presupuestos = {}
+        for entrada in self.presupuesto_consultas.split(","):
+            ruta, _, limite = entrada.partition("=")
+            if ruta.strip():
+                presupuestos[ruta.strip()] = int(limite)
+        return presupuestos
 
 
 # Instancia única de configuración (Singleton)
@@ -3,14 +3,30 @@
 """
 Módulo de conexión a Supabase.
 Proporciona una función para obtener el cliente de Supabase
-configurado con las credenciales del archivo .env
+configurado con las credenciales del archivo .env, y un cliente
+asíncrono (`db`) para usar desde las rutas `async def` sin bloquear
+el event loop.
+
+El cliente se crea en el primer uso, no al importar: importar `supabase`
+(httpx, gotrue, postgrest...) es buena parte del arranque en frío. El
+arranque de la app lo calienta en segundo plano (ver app/salud.py).
 """
 
-from supabase import create_client, Client
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
 from app.config import settings
+from app.metricas import consultas_db
+from app.registro_consultas import registrar_consulta
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 
-def get_supabase_client() -> Client:
+def get_supabase_client() -> "Client":
     """
     Crea y retorna un cliente de Supabase configurado.
     
@@ -22,14 +38,17 @@ def get_supabase_client() -> Client:
     
     Returns:
         Client: Instancia del cliente de Supabase
-        
+    
     Ejemplo de uso:
         supabase = get_supabase_client()
         response = supabase.table("lotes").select("*").execute()
     """
     
-    # Crear cliente usando las credenciales de config.py
-    supabase: Client = create_client(
+    from app.transporte_db import ClienteSupabase
+    
+    # Crear cliente usando las credenciales de config.py; las consultas
+    # usan el pool de conexiones y los reintentos de app/transporte_db.py
+    supabase = ClienteSupabase.create(
         supabase_url=settings.supabase_url,
         supabase_key=settings.supabase_key
     )
@@ -37,6 +56,118 @@ def get_supabase_client() -> Client:
     return supabase
 
 
-# Variable global para reutilizar la conexión (opcional pero recomendado)
-# En lugar de crear un nuevo cliente cada vez, reutilizamos el mismo
-supabase_client = get_supabase_client()
\ No newline at end of file
+# Pool acotado donde corren las llamadas HTTP del cliente síncrono
+_executor = ThreadPoolExecutor(
+    max_workers=settings.db_max_workers,
+    thread_name_prefix="supabase"
+)
+
+
+class AsyncQuery:
+    """
+    Envuelve un query builder de postgrest.
+    
+    Los métodos del builder (select, eq, order, ...) se encadenan igual que
+    en el cliente síncrono; solo execute() cambia y devuelve un awaitable
+    que corre la petición en el pool de hilos y la anota (tabla y duración)
+    en el registro de consultas de la petición en curso.
+    """
+    
+    def __init__(self, builder: Any, tabla: str):
+        self._builder = builder
+        self._tabla = tabla
+    
+    def __getattr__(self, nombre: str) -> Any:
+        atributo = getattr(self._builder, nombre)
+        
+        if not callable(atributo):
+            return atributo
+        
+        def encadenar(*args, **kwargs):
+            return AsyncQuery(atributo(*args, **kwargs), self._tabla)
+        
+        return encadenar
+    
+    async def execute(self):
+        loop = asyncio.get_running_loop()
+        inicio = time.perf_counter()
+        try:
+            return await loop.run_in_executor(_executor, self._builder.execute)
+        finally:
+            segundos = time.perf_counter() - inicio
+            registrar_consulta(self._tabla, segundos)
+            consultas_db.observar((self._tabla,), segundos)
+
+
+class AsyncSupabaseClient:
+    """
+    Cliente asíncrono sobre un único cliente de Supabase, creado en el primer uso.
+    
+    Ejemplo de uso:
+        response = await db.table("lotes").select("*").execute()
+    
+    Las consultas independientes pueden correr en paralelo con asyncio.gather.
+    """
+    
+    def __init__(self, client: Optional["Client"] = None):
+        # Variable para reutilizar la conexión: se crea una sola vez
+        self._client = client
+        self._candado = threading.Lock()
+    
+    @property
+    def conectado(self) -> bool:
+        """El cliente ya se creó"""
+        return self._client is not None
+    
+    def conectar(self) -> "Client":
+        """
+        Retorna el cliente, creándolo si es el primer uso.
+        
+        La primera llamada importa `supabase`: desde el event loop conviene
+        hacerla en un hilo (await asyncio.to_thread(db.conectar)).
+        """
+        if self._client is None:
+            with self._candado:
+                if self._client is None:
+                    self._client = get_supabase_client()
+        return self._client
+    
+    def table(self, nombre: str) -> AsyncQuery:
+        return AsyncQuery(self.conectar().table(nombre), nombre)
+    
+    def rpc(self, funcion: str, parametros: Optional[dict] = None) -> AsyncQuery:
+        """Llamada a una función de Postgres (ver migrations/)"""
+        return AsyncQuery(self.conectar().rpc(funcion, parametros or {}), funcion)
+
+
+db = AsyncSupabaseClient()
+
+
+async def leer_por_bloques(consulta: Callable[[], AsyncQuery], *orden: str) -> list[dict]:
+    """
+    Todas las filas de una consulta, pedidas de a `db_filas_por_bloque`.
+    
+    PostgREST corta cada respuesta en `max_rows` filas (1000 en Supabase)
+    sin avisar, así que las tablas y vistas que crecen con la granja se leen
+    por rangos. `consulta` arma la consulta de nuevo en cada bloque (el
+    builder de postgrest se modifica al encadenar) y las columnas de `orden`
+    deben identificar cada fila, para que los bloques no se solapen ni dejen
+    huecos.
+    
+    Ejemplo de uso:
+        filas = await leer_por_bloques(
+            lambda: db.table("consumo_por_lote_mes").select("*"), "lote_id", "mes", "tipo"
+        )
+    """
+    por_bloque = settings.db_filas_por_bloque
+    filas: list[dict] = []
+    while True:
+        query = consulta()
+        for columna in orden:
+            query = query.order(columna)
+        
+        bloque = await query.range(len(filas), len(filas) + por_bloque - 1).execute()
+        filas.extend(bloque.data)
+        
+        if len(bloque.data) < por_bloque:
+            return filas
@@ -0,0 +1,60 @@
+# app/importar_liquidacion.py
+
+"""
+Comando para importar el libro de liquidación histórico.
+
+Uso (desde backend/):
+    python -m app.importar_liquidacion "../Liquidación Lotes - Ceba El Sendero.xlsx" --dry-run
+    python -m app.importar_liquidacion libro.xlsx --corrales "Lote 1=Corral 1,Corral 2"
+"""
+
+import argparse
+import asyncio
+import json
+
+from app.services.importador_liquidacion import ImportadorLiquidacion
+
+
+def _corrales_por_hoja(asignaciones: list[str]) -> dict[str, list[str]]:
+    """["Lote 1=Corral 1,Corral 2"] -> {"Lote 1": ["Corral 1", "Corral 2"]}"""
+    resultado = {}
+    for asignacion in asignaciones:
+        hoja, _, corrales = asignacion.partition("=")
+        resultado[hoja.strip()] = [
+            nombre.strip() for nombre in corrales.split(",") if nombre.strip()
+        ]
+    return resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Importa el libro de liquidación de lotes a Supabase"
+    )
+    parser.add_argument("archivo", help="Ruta del .xlsx")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Solo leer y validar: reporta errores y velocidad sin insertar nada"
+    )
+    parser.add_argument(
+        "--corrales",
+        action="append",
+        default=[],
+        metavar="HOJA=CORRAL[,CORRAL...]",
+        help="Corrales (por nombre) que ocupó el lote de una hoja; se puede repetir"
+    )
+    parser.add_argument("--tamano-bloque", type=int, default=500, help="Filas por inserción")
+    args = parser.parse_args()
+    
+    importador = ImportadorLiquidacion(
+        corrales_por_hoja=_corrales_por_hoja(args.corrales),
+        tamano_bloque=args.tamano_bloque,
+        dry_run=args.dry_run
+    )
+    resumen = asyncio.run(importador.importar(args.archivo))
+    
+    print(json.dumps(resumen, indent=2, ensure_ascii=False, default=str))
+
+
+if __name__ == "__main__":
+    main()
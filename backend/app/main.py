@@ -4,28 +4,54 @@
 Punto de entrada principal de la aplicación FastAPI.
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+
 from app.config import settings
+from app.metricas import exponer_metricas, medir_peticiones
+from app.paginacion import CABECERA_CURSOR
+from app.registro_consultas import CABECERA_SERVER_TIMING, contabilizar_consultas
+from app.respuestas import RespuestaJSON
 
 # Importar routers
 from app.routes import (
-    corrales,
     alimentos,
-    lotes,
     consumo_alimento,
-    mortalidad,
+    corrales,
     cosechas,
-    gastos_mensuales,
     gastos_directos,
-    reportes 
+    gastos_mensuales,
+    lotes,
+    mortalidad,
+    reportes,
 )
+from app.salud import calentar, sonda_bd
+from app.services.pool_calculo import pool_calculo
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Calienta la conexión a Supabase y el pool de cálculo sin demorar el arranque del servidor"""
+    calentamientos = [asyncio.create_task(pool_calculo.calentar())]
+    if settings.calentar_al_iniciar:
+        calentamientos.append(asyncio.create_task(calentar()))
+    yield
+    for calentamiento in calentamientos:
+        calentamiento.cancel()
+    pool_calculo.cerrar()
+
 
 # Crear la aplicación FastAPI
 app = FastAPI(
     title="Sistema de Control de Costos - Ceba de Cerdos",
     description="API Backend para gestión de lotes, costos y análisis de producción",
     version="0.1.0",
+    default_response_class=RespuestaJSON,  # orjson; Decimal como número exacto
+    lifespan=lifespan,
 )
 
 # Configurar CORS
@@ -35,8 +61,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CABECERA_CURSOR, CABECERA_SERVER_TIMING],
 )
 
+# Consultas a Supabase por petición (cabecera Server-Timing y presupuesto por ruta)
+app.middleware("http")(contabilizar_consultas)
+
+# Latencia por ruta y peticiones en curso para /metrics
+app.middleware("http")(medir_peticiones)
+
 
 # ============================================
 # ENDPOINTS DE PRUEBA
@@ -53,24 +86,42 @@ async def root():
     }
 
 
+@app.get("/livez")
+async def livez():
+    """Liveness - El proceso responde; no consulta la BD"""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness - La BD responde (resultado en cache SALUD_CACHE_SEGUNDOS); 503 si no"""
+    resultado = await sonda_bd.verificar()
+    return RespuestaJSON(
+        {"status": "ready" if resultado.ok else "not_ready", "database": resultado.detalle},
+        status_code=200 if resultado.ok else 503
+    )
+
+
 @app.get("/health")
 async def health_check():
-    """Endpoint de salud - Verifica el servidor y la BD"""
-    from app.database import supabase_client
-    
-    try:
-        supabase_client.table("corrales").select("id").limit(1).execute()
-        db_status = "connected"
-    except Exception as e:
-        db_status = f"error: {str(e)}"
+    """Endpoint de salud - Verifica el servidor y la BD (misma sonda en cache que /readyz)"""
+    resultado = await sonda_bd.verificar()
     
     return {
         "status": "healthy",
-        "database": db_status,
+        "database": resultado.detalle,
         "environment": settings.environment
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Métricas en formato de texto de Prometheus"""
+    return PlainTextResponse(
+        exponer_metricas(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 # ============================================
 # INCLUIR ROUTERS
 # ============================================
@@ -0,0 +1,148 @@
+# app/metricas.py
+
+"""
+Métricas de la API en formato de texto de Prometheus, sin dependencias.
+Histogramas de latencia por ruta (plantilla, no URL) y código de estado,
+peticiones en curso, latencia de las consultas a Supabase por tabla,
+aciertos de la cache de reportes y memoria del proceso. Se exponen en
+GET /metrics para que cualquier scraper de Prometheus las recoja.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.services.cache_reportes import cache_reportes
+
+# Límites de los buckets en segundos
+LIMITES_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _etiquetas(nombres: tuple[str, ...], valores: tuple[str, ...], extra: str = "") -> str:
+    pares = [f'{nombre}="{_escapar(valor)}"' for nombre, valor in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+class Histograma:
+    """Histograma acumulativo de Prometheus con etiquetas"""
+    
+    def __init__(self, nombre: str, ayuda: str, etiquetas: tuple[str, ...]):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = etiquetas
+        self._series: dict[tuple[str, ...], list] = {}
+        self._candado = threading.Lock()
+    
+    def observar(self, valores: tuple[str, ...], segundos: float) -> None:
+        with self._candado:
+            # [conteo por bucket (sin acumular), suma, total]
+            serie = self._series.setdefault(valores, [[0] * (len(LIMITES_SEGUNDOS) + 1), 0.0, 0])
+            serie[0][bisect_left(LIMITES_SEGUNDOS, segundos)] += 1
+            serie[1] += segundos
+            serie[2] += 1
+    
+    def exponer(self) -> list[str]:
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} histogram"]
+        with self._candado:
+            series = [
+                (valores, list(b), s, n) for valores, (b, s, n) in sorted(self._series.items())
+            ]
+        
+        for valores, buckets, suma, total in series:
+            acumulado = 0
+            for limite, cantidad in zip(LIMITES_SEGUNDOS + ("+Inf",), buckets):
+                acumulado += cantidad
+                etiquetas = _etiquetas(self.etiquetas, valores, f'le="{limite}"')
+                lineas.append(f"{self.nombre}_bucket{etiquetas} {acumulado}")
+            lineas.append(f"{self.nombre}_sum{_etiquetas(self.etiquetas, valores)} {suma}")
+            lineas.append(f"{self.nombre}_count{_etiquetas(self.etiquetas, valores)} {total}")
+        return lineas
+
+
+peticiones_http = Histograma(
+    "cerdos_http_peticion_segundos",
+    "Duración de las peticiones HTTP por ruta y código de estado",
+    ("metodo", "ruta", "estado")
+)
+
+consultas_db = Histograma(
+    "cerdos_db_consulta_segundos",
+    "Duración de las consultas a Supabase (PostgREST) por tabla",
+    ("tabla",)
+)
+
+_en_curso = 0
+
+
+def _memoria_residente() -> Optional[int]:
+    """RSS del proceso en bytes (Linux); None donde no hay /proc"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _gauge(nombre: str, ayuda: str, valor: float, tipo: str = "gauge") -> list[str]:
+    return [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} {tipo}", f"{nombre} {valor}"]
+
+
+def exponer_metricas() -> str:
+    """Todas las métricas en el formato de texto de Prometheus 0.0.4"""
+    consultas_cache = cache_reportes.aciertos + cache_reportes.fallos
+    
+    lineas = peticiones_http.exponer() + consultas_db.exponer()
+    lineas += _gauge(
+        "cerdos_http_peticiones_en_curso", "Peticiones HTTP atendiéndose ahora", _en_curso
+    )
+    lineas += _gauge(
+        "cerdos_cache_reportes_aciertos_total", "Lecturas de la cache de reportes con acierto",
+        cache_reportes.aciertos, "counter"
+    )
+    lineas += _gauge(
+        "cerdos_cache_reportes_fallos_total", "Lecturas de la cache de reportes sin acierto",
+        cache_reportes.fallos, "counter"
+    )
+    lineas += _gauge(
+        "cerdos_cache_reportes_ratio_aciertos", "Aciertos / lecturas de la cache de reportes",
+        cache_reportes.aciertos / consultas_cache if consultas_cache else 0
+    )
+    lineas += _gauge(
+        "cerdos_cache_reportes_entradas", "Entradas en la cache de reportes", len(cache_reportes)
+    )
+    
+    memoria = _memoria_residente()
+    if memoria is not None:
+        lineas += _gauge(
+            "cerdos_proceso_memoria_residente_bytes", "Memoria residente del proceso", memoria
+        )
+    
+    return "\n".join(lineas) + "\n"
+
+
+async def medir_peticiones(request: Request, call_next) -> Response:
+    """Middleware: latencia por plantilla de ruta y peticiones en curso"""
+    global _en_curso
+    _en_curso += 1
+    inicio = time.perf_counter()
+    estado = "500"
+    
+    try:
+        response = await call_next(request)
+        estado = str(response.status_code)
+        return response
+    finally:
+        _en_curso -= 1
+        # La plantilla (/api/lotes/{lote_id}) y no la URL, para no crear una serie por id
+        ruta = getattr(request.scope.get("route"), "path", "sin_ruta")
+        peticiones_http.observar((request.method, ruta, estado), time.perf_counter() - inicio)
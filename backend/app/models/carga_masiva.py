@@ -0,0 +1,26 @@
+# app/models/carga_masiva.py
+
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class ErrorCampo(BaseModel):
+    """Error de validación de un campo de una fila"""
+    campo: str
+    mensaje: str
+
+
+class ErrorFila(BaseModel):
+    """Fila rechazada de una carga masiva (posición en la lista enviada)"""
+    fila: int
+    errores: list[ErrorCampo]
+
+
+class ResultadoCargaMasiva(BaseModel, Generic[T]):
+    """Resultado de una carga masiva: filas insertadas y filas rechazadas"""
+    insertados: int
+    registros: list[T]
+    errores: list[ErrorFila]
@@ -4,7 +4,8 @@ from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Literal, Optional
+from app.models.reporte import Numero
 
 
 class ConsumoAlimentoBase(BaseModel):
@@ -32,6 +33,33 @@ class ConsumoAlimentoResponse(ConsumoAlimentoBase):
     id: UUID
     created_at: datetime
     updated_at: datetime
-
+    
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# ===== SERIES DE CONSUMO =====
+
+class TotalesConsumo(BaseModel):
+    """Bultos, kilos y costo de alimento"""
+    bultos: Numero
+    kg: Numero
+    costo: Numero
+
+
+class PuntoSerieConsumo(TotalesConsumo):
+    """Consumo de un período de la serie, total y por tipo de alimento"""
+    desde: date
+    hasta: date
+    por_tipo: dict[str, TotalesConsumo]
+
+
+class SerieConsumoResponse(BaseModel):
+    """Respuesta de GET /consumo-alimento/serie y /consumo-alimento/lote/{id}/serie"""
+    lote_id: Optional[UUID] = None  # None: toda la granja
+    bucket: Literal["dia", "semana", "mes"]
+    periodos_por_punto: int  # > 1 si la serie se submuestreó para no pasar del máximo de puntos
+    desde: Optional[date] = None
+    hasta: Optional[date] = None
+    totales: TotalesConsumo
+    puntos: list[PuntoSerieConsumo]
@@ -0,0 +1,165 @@
+# app/models/reporte.py
+
+from datetime import date
+from decimal import Decimal
+from typing import Annotated, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, WithJsonSchema
+
+# Decimal exacto que viaja como número JSON (ver app/respuestas.py)
+Numero = Annotated[Decimal, WithJsonSchema({"type": "number"})]
+
+
+# ===== COSTOS =====
+
+class ConsumoPorTipo(BaseModel):
+    """Consumo de un tipo de alimento"""
+    costo: Numero
+    kg: Numero
+    bultos: Numero
+
+
+class DetalleAlimento(BaseModel):
+    """Costo y kilos de alimento del lote"""
+    costo_total: Numero
+    kg_total: Numero
+    detalle: dict[str, ConsumoPorTipo]
+
+
+class DetalleGastosDirectos(BaseModel):
+    """Gastos directos del lote, total y por tipo"""
+    total: Numero
+    detalle: dict[str, Numero]
+
+
+class GastoProrrateado(BaseModel):
+    """Parte de un gasto mensual que le toca al lote"""
+    tipo: str
+    monto_total: Numero
+    monto_prorrateado: Numero
+
+
+class MetadataProrrateo(BaseModel):
+    """Datos con los que se repartió el mes"""
+    area_lote_m2: Numero
+    dias_activos: int
+    dias_mes: int
+    suma_areas_activas_m2: Numero
+
+
+class ProrrateoMes(BaseModel):
+    """Prorrateo de los gastos de un mes para un lote (sin metadata si no ocupó área)"""
+    total: Numero
+    detalle: dict[str, GastoProrrateado]
+    metadata: Optional[MetadataProrrateo] = None
+
+
+class DetalleCostos(BaseModel):
+    """Costo total del lote por concepto"""
+    lechones: Numero
+    alimento: Numero
+    gastos_directos: Numero
+    gastos_prorrateados: Numero
+
+
+class CostosLoteResponse(BaseModel):
+    """Respuesta de GET /reportes/lote/{id}/costos"""
+    lote_id: UUID
+    numero_lote: str
+    fecha_inicio: date
+    fecha_cierre: Optional[date] = None
+    costo_total: Numero
+    detalle_costos: DetalleCostos
+    detalle_alimento: DetalleAlimento
+    detalle_gastos_directos: DetalleGastosDirectos
+    detalle_gastos_prorrateados: dict[str, ProrrateoMes]  # Clave "AAAA-MM"
+
+
+# ===== INDICADORES =====
+
+class IndicadoresAnimales(BaseModel):
+    """Animales iniciales, muertos y vendidos"""
+    iniciales: int
+    mortalidad: int
+    vendidos: int
+    porcentaje_mortalidad: Numero
+
+
+class IndicadoresPesos(BaseModel):
+    """Pesos promedio y totales en kg"""
+    inicial_promedio_kg: Numero
+    final_promedio_kg: Numero
+    ganancia_promedio_kg: Numero
+    total_vendido_kg: Numero
+
+
+class IndicadoresAlimento(BaseModel):
+    """Consumo de alimento y conversión"""
+    total_consumido_kg: Numero
+    conversion_alimenticia: Numero  # kg alimento / kg ganancia
+
+
+class IndicadoresCostos(BaseModel):
+    """Costo total y unitarios"""
+    costo_total: Numero
+    costo_por_animal: Numero
+    costo_por_kg_producido: Numero
+
+
+class IndicadoresLoteResponse(BaseModel):
+    """Respuesta de GET /reportes/lote/{id}/indicadores"""
+    lote_id: UUID
+    numero_lote: str
+    animales: IndicadoresAnimales
+    pesos: IndicadoresPesos
+    alimento: IndicadoresAlimento
+    costos: IndicadoresCostos
+
+
+# ===== PRORRATEO =====
+
+class ProrrateoMesGranjaResponse(BaseModel):
+    """Respuesta de GET /reportes/prorrateo/{anio}/{mes}"""
+    anio: int
+    mes: int
+    total_gastos: Numero
+    total_prorrateado: Numero
+    lotes: dict[str, ProrrateoMes]  # Clave lote_id
+
+
+# ===== RESUMEN DE LA GRANJA =====
+
+class ResumenLote(BaseModel):
+    """Costos e indicadores de un lote en el resumen"""
+    lote_id: UUID
+    numero_lote: str
+    estado: str
+    fecha_inicio: date
+    fecha_cierre: Optional[date] = None
+    costo_total: Numero
+    detalle_costos: DetalleCostos
+    kg_alimento: Numero
+    animales: IndicadoresAnimales
+    total_vendido_kg: Numero
+    conversion_alimenticia: Numero
+    costo_por_animal: Numero
+    costo_por_kg_producido: Numero
+
+
+class TotalesGranja(BaseModel):
+    """Totales de los lotes del resumen"""
+    lotes: int
+    costo_total: Numero
+    animales_iniciales: int
+    mortalidad: int
+    vendidos: int
+    porcentaje_mortalidad: Numero
+    total_vendido_kg: Numero
+    costo_por_kg_producido: Numero
+
+
+class ResumenGranjaResponse(BaseModel):
+    """Respuesta de GET /reportes/resumen"""
+    lotes: list[ResumenLote]
+    totales: TotalesGranja
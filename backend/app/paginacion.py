@@ -0,0 +1,140 @@
+# app/paginacion.py
+
+"""
+Paginación por cursor (keyset) para los endpoints de listas.
+En lugar de OFFSET, cada página continúa después de la última fila de la
+anterior según las columnas de orden, así el costo de una página no crece
+con la cantidad de datos históricos.
+Solo se pagina si la petición trae `limite` o `cursor`; sin ninguno de los
+dos la lista sale completa, como antes de paginar.
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, Query, Response
+
+from app.config import settings
+
+# Cabecera con el cursor de la siguiente página (ausente en la última)
+CABECERA_CURSOR = "X-Next-Cursor"
+
+
+@dataclass
+class Pagina:
+    """Parámetros de paginación de una petición; `limite` None = lista completa"""
+    limite: Optional[int]
+    cursor: Optional[list] = None
+
+
+def parametros_pagina(
+    limite: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.paginacion_limite_maximo,
+        description=(
+            "Cantidad máxima de filas por página; sin `limite` ni `cursor` "
+            "la lista sale completa"
+        )
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description=f"Valor de la cabecera {CABECERA_CURSOR} de la página anterior"
+    )
+) -> Pagina:
+    """Dependencia de FastAPI: lee `limite` y `cursor` de la query string"""
+    if cursor:
+        return Pagina(
+            limite=limite or settings.paginacion_limite_defecto,
+            cursor=_decodificar_cursor(cursor)
+        )
+    return Pagina(limite=limite)
+
+
+def _codificar_cursor(valores: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(valores).encode()).decode()
+
+
+def _decodificar_cursor(cursor: str) -> list:
+    try:
+        valores = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    
+    if not isinstance(valores, list):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    
+    return valores
+
+
+def _valor_filtro(valor) -> str:
+    """Valor entre comillas para los filtros `or` de PostgREST (admite comas y paréntesis)"""
+    texto = str(valor).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{texto}"'
+
+
+def columnas_cursor(orden: list[tuple[str, bool]]) -> list[str]:
+    """Columnas que deben venir en cada fila para armar el cursor"""
+    return [columna for columna, _ in orden] + ["id"]
+
+
+def paginar(query, orden: list[tuple[str, bool]], pagina: Pagina):
+    """
+    Ordena, filtra después del cursor y limita una consulta.
+    
+    Args:
+        query: Consulta de `db.table(...).select(...)` con sus filtros
+        orden: Columnas de orden como (columna, descendente); se agrega `id` para desempatar
+        pagina: Parámetros de la petición
+    
+    Returns:
+        La consulta lista para ejecutar; pide una fila de más para saber si hay
+        otra página. Sin `limite` solo se ordena.
+    """
+    columnas = orden + [("id", orden[-1][1])]
+    
+    for columna, descendente in columnas:
+        query = query.order(columna, desc=descendente)
+    
+    if pagina.limite is None:
+        return query
+    
+    if pagina.cursor is not None:
+        if len(pagina.cursor) != len(columnas):
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+        
+        # (c1 después de v1) o (c1 = v1 y c2 después de v2) o ...
+        condiciones = []
+        for i, (columna, descendente) in enumerate(columnas):
+            iguales = [
+                f"{c}.eq.{_valor_filtro(v)}" for (c, _), v in zip(columnas[:i], pagina.cursor)
+            ]
+            operador = "lt" if descendente else "gt"
+            siguiente = f"{columna}.{operador}.{_valor_filtro(pagina.cursor[i])}"
+            partes = iguales + [siguiente]
+            condiciones.append(f"and({','.join(partes)})" if len(partes) > 1 else siguiente)
+        
+        query = query.or_(",".join(condiciones))
+    
+    return query.limit(pagina.limite + 1)
+
+
+def responder_pagina(
+    filas: list[dict],
+    orden: list[tuple[str, bool]],
+    pagina: Pagina,
+    response: Response
+) -> list[dict]:
+    """Recorta la fila extra y, si hay más páginas, pone su cursor en la cabecera"""
+    if pagina.limite is None or len(filas) <= pagina.limite:
+        return filas
+    
+    filas = filas[:pagina.limite]
+    ultima = filas[-1]
+    response.headers[CABECERA_CURSOR] = _codificar_cursor(
+        [ultima[columna] for columna, _ in orden] + [ultima["id"]]
+    )
+    
+    return filas
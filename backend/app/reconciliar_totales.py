@@ -0,0 +1,33 @@
+# app/reconciliar_totales.py
+
+"""
+Comando para recalcular desde cero los totales acumulados por lote
+(lotes_totales). Corrige las diferencias que dejan escrituras a medias;
+se puede programar en cron.
+
+Uso (desde backend/):
+    python -m app.reconciliar_totales
+    python -m app.reconciliar_totales --lote 3f2c...e91a
+"""
+
+import argparse
+import asyncio
+from uuid import UUID
+
+from app.services.totales_lote import TotalesLoteService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recalcula los totales acumulados de los lotes")
+    parser.add_argument(
+        "--lote", type=UUID, default=None, help="Solo este lote (por defecto, todos)"
+    )
+    args = parser.parse_args()
+    
+    recalculados = asyncio.run(TotalesLoteService.reconciliar(args.lote))
+    
+    print(f"Totales recalculados: {recalculados} lote(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# app/registro_consultas.py
+
+"""
+Registro de consultas a Supabase por petición.
+El cliente asíncrono (`db`) anota cada execute() con su tabla y su duración;
+el middleware `contabilizar_consultas` abre un registro por petición, lo
+publica en la cabecera Server-Timing y compara la cantidad de consultas con
+el presupuesto configurado para la ruta, para detectar patrones N+1 antes de
+que lleguen a producción.
+"""
+
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CABECERA_SERVER_TIMING = "Server-Timing"
+
+
+@dataclass
+class RegistroConsultas:
+    """Consultas hechas durante una petición: (tabla, segundos)"""
+    consultas: list[tuple[str, float]] = field(default_factory=list)
+    
+    def agregar(self, tabla: str, segundos: float) -> None:
+        self.consultas.append((tabla, segundos))
+    
+    @property
+    def segundos(self) -> float:
+        return sum(segundos for _, segundos in self.consultas)
+    
+    def por_tabla(self) -> dict[str, tuple[int, float]]:
+        """Tabla -> (consultas, segundos)"""
+        resultado: dict[str, tuple[int, float]] = {}
+        for tabla, segundos in self.consultas:
+            cantidad, acumulado = resultado.get(tabla, (0, 0.0))
+            resultado[tabla] = (cantidad + 1, acumulado + segundos)
+        return resultado
+    
+    def server_timing(self, segundos_totales: float) -> str:
+        """
+        Valor de la cabecera Server-Timing.
+        
+        Ejemplo: db;dur=12.3;desc="5 consultas", db-lotes;dur=2.1;desc="1", app;dur=30.4
+        
+        Las consultas en paralelo se solapan: la suma de `db` puede superar `app`.
+        """
+        metricas = [f'db;dur={self.segundos * 1000:.1f};desc="{len(self.consultas)} consultas"']
+        metricas += [
+            f'db-{tabla};dur={segundos * 1000:.1f};desc="{cantidad}"'
+            for tabla, (cantidad, segundos) in sorted(self.por_tabla().items())
+        ]
+        metricas.append(f"app;dur={segundos_totales * 1000:.1f}")
+        return ", ".join(metricas)
+
+
+_registro_actual: ContextVar[Optional[RegistroConsultas]] = ContextVar(
+    "registro_consultas", default=None
+)
+
+
+def registrar_consulta(tabla: str, segundos: float) -> None:
+    """Anota una consulta en el registro de la petición en curso, si lo hay"""
+    registro = _registro_actual.get()
+    if registro is not None:
+        registro.agregar(tabla, segundos)
+
+
+def nombre_ruta(request: Request) -> Optional[str]:
+    """Nombre de la ruta atendida como `modulo.funcion`, ej. reportes.get_costos_lote"""
+    ruta = request.scope.get("route")
+    endpoint = getattr(ruta, "endpoint", None)
+    if endpoint is None:
+        return None
+    return f"{endpoint.__module__.rsplit('.', 1)[-1]}.{endpoint.__name__}"
+
+
+async def contabilizar_consultas(request: Request, call_next) -> Response:
+    """
+    Middleware: cuenta las consultas de la petición y aplica el presupuesto.
+    
+    Si una ruta supera su presupuesto se registra una advertencia; con
+    `presupuesto_consultas_estricto` (tests) la petición falla con 500.
+    Las consultas de un StreamingResponse ocurren después de enviar las
+    cabeceras y no entran en la cuenta.
+    """
+    registro = RegistroConsultas()
+    token = _registro_actual.set(registro)
+    inicio = time.perf_counter()
+    
+    try:
+        response = await call_next(request)
+    finally:
+        _registro_actual.reset(token)
+    
+    ruta = nombre_ruta(request)
+    presupuesto = settings.get_presupuesto_consultas().get(
+        ruta, settings.presupuesto_consultas_defecto
+    )
+    
+    if ruta and presupuesto and len(registro.consultas) > presupuesto:
+        tablas = ", ".join(
+            f"{tabla}={cantidad}" for tabla, (cantidad, _) in sorted(registro.por_tabla().items())
+        )
+        detalle = (
+            f"Presupuesto de consultas excedido en {ruta}: "
+            f"{len(registro.consultas)} > {presupuesto} ({tablas})"
+        )
+        if settings.presupuesto_consultas_estricto:
+            response = JSONResponse(status_code=500, content={"detail": detalle})
+        else:
+            logger.warning(detalle)
+    
+    response.headers[CABECERA_SERVER_TIMING] = registro.server_timing(time.perf_counter() - inicio)
+    return response
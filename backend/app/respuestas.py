@@ -0,0 +1,78 @@
+# app/respuestas.py
+
+"""
+Serialización JSON de las respuestas con orjson.
+Es la clase de respuesta por defecto de la app. Los Decimal salen como
+números JSON exactos (escala fija de hasta 6 decimales), sin pasar por
+float. Los reportes usan además un camino rápido: devuelven la respuesta ya
+armada, sin jsonable_encoder ni la re-validación del response_model, porque
+los datos los acaba de construir el propio backend.
+"""
+
+from decimal import Decimal, InvalidOperation
+from typing import Any, Optional
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.responses import Response
+
+# Escala máxima de los Decimal en JSON (los ceros sobrantes se omiten)
+ESCALA_DECIMAL = Decimal("0.000001")
+
+
+def _decimal(valor: Decimal) -> orjson.Fragment:
+    """Decimal como número JSON exacto: 1234.5000000001 -> 1234.5, Decimal(3) -> 3"""
+    if not valor.is_finite():
+        return orjson.Fragment(b"null")
+    
+    if valor.as_tuple().exponent < ESCALA_DECIMAL.as_tuple().exponent:
+        try:
+            valor = valor.quantize(ESCALA_DECIMAL)
+        except InvalidOperation:
+            pass  # Más dígitos de los que admite el contexto: se deja como está
+    
+    texto = format(valor, "f")
+    if "." in texto:
+        texto = texto.rstrip("0").rstrip(".")
+    return orjson.Fragment("0" if texto == "-0" else texto)
+
+
+def _por_defecto(valor: Any) -> Any:
+    """Tipos que orjson no conoce; lo raro se delega a jsonable_encoder"""
+    if isinstance(valor, Decimal):
+        return _decimal(valor)
+    if isinstance(valor, (set, frozenset)):
+        return list(valor)
+    return jsonable_encoder(valor)
+
+
+def codificar_json(datos: Any) -> bytes:
+    """JSON de `datos` (dicts, listas, Decimal, fechas, UUID...)"""
+    return orjson.dumps(datos, default=_por_defecto, option=orjson.OPT_NON_STR_KEYS)
+
+
+class RespuestaJSON(JSONResponse):
+    """JSONResponse serializada con orjson"""
+    
+    def render(self, content: Any) -> bytes:
+        return codificar_json(content)
+
+
+def copiar_cabeceras(origen: Response, destino: Response) -> Response:
+    """Pasa a `destino` las cabeceras que la ruta puso en el Response inyectado"""
+    for nombre, valor in origen.headers.items():
+        if nombre != "content-length":
+            destino.headers[nombre] = valor
+    return destino
+
+
+def responder_json(datos: Any, response: Optional[Response] = None) -> RespuestaJSON:
+    """
+    Camino rápido para datos armados por el backend.
+    
+    FastAPI no re-valida ni recorre con jsonable_encoder una respuesta ya
+    armada; el response_model de la ruta queda solo para la documentación.
+    """
+    respuesta = RespuestaJSON(datos)
+    return copiar_cabeceras(response, respuesta) if response is not None else respuesta
@@ -1,63 +1,108 @@
 # app/routes/alimentos.py
 
-from fastapi import APIRouter, HTTPException, status
 from uuid import UUID
-from app.models.alimento import AlimentoCreate, AlimentoUpdate, AlimentoResponse
-from app.database import supabase_client
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
+
+from app.cache_http import calcular_etag, condicional, politica_catalogo
+from app.campos import Campos, parametros_campos
+from app.database import db
+from app.models.alimento import AlimentoCreate, AlimentoResponse, AlimentoUpdate
+from app.paginacion import Pagina, columnas_cursor, paginar, parametros_pagina, responder_pagina
+from app.services.totales_lote import TotalesLoteService
 
 router = APIRouter()
 
+# Orden de las listas paginadas
+ORDEN = [("nombre", False)]
+
 
 @router.get("/", response_model=list[AlimentoResponse])
-async def get_alimentos(activo: bool | None = None):
-    """Obtener todos los alimentos"""
-    query = supabase_client.table("alimentos").select("*")
+async def get_alimentos(
+    request: Request,
+    response: Response,
+    activo: bool | None = None,
+    pagina: Pagina = Depends(parametros_pagina),
+    campos: Campos = Depends(parametros_campos(AlimentoResponse))
+):
+    """Obtener los alimentos (paginado, por nombre)"""
+    query = db.table("alimentos").select(campos.seleccion(columnas_cursor(ORDEN)))
     
     if activo is not None:
         query = query.eq("activo", activo)
     
-    response = query.execute()
-    return response.data
+    resultado = await paginar(query, ORDEN, pagina).execute()
+    
+    no_modificado = condicional(
+        request, response, calcular_etag(request.url.query, resultado.data), politica_catalogo()
+    )
+    if no_modificado:
+        return no_modificado
+    
+    return campos.responder(responder_pagina(resultado.data, ORDEN, pagina, response), response)
 
 
 @router.get("/{alimento_id}", response_model=AlimentoResponse)
-async def get_alimento(alimento_id: UUID):
+async def get_alimento(
+    alimento_id: UUID,
+    request: Request,
+    response: Response,
+    campos: Campos = Depends(parametros_campos(AlimentoResponse))
+):
     """Obtener un alimento por ID"""
-    response = supabase_client.table("alimentos").select("*").eq("id", str(alimento_id)).execute()
+    resultado = await db.table("alimentos")\
+        .select(campos.seleccion())\
+        .eq("id", str(alimento_id))\
+        .execute()
     
-    if not response.data:
+    if not resultado.data:
         raise HTTPException(status_code=404, detail="Alimento no encontrado")
     
-    return response.data[0]
+    no_modificado = condicional(
+        request, response, calcular_etag(request.url.query, resultado.data), politica_catalogo()
+    )
+    if no_modificado:
+        return no_modificado
+    
+    return campos.responder(resultado.data[0], response)
 
 
 @router.post("/", response_model=AlimentoResponse, status_code=status.HTTP_201_CREATED)
 async def create_alimento(alimento: AlimentoCreate):
     """Crear un nuevo alimento"""
-    response = supabase_client.table("alimentos").insert(alimento.model_dump(mode="json")).execute()
+    response = await db.table("alimentos").insert(alimento.model_dump(mode="json")).execute()
     return response.data[0]
 
 
 @router.patch("/{alimento_id}", response_model=AlimentoResponse)
-async def update_alimento(alimento_id: UUID, alimento: AlimentoUpdate):
+async def update_alimento(
+    alimento_id: UUID,
+    alimento: AlimentoUpdate,
+    background_tasks: BackgroundTasks
+):
     """Actualizar un alimento"""
     data = alimento.model_dump(exclude_unset=True, mode="json")
     
     if not data:
         raise HTTPException(status_code=400, detail="No hay datos para actualizar")
     
-    response = supabase_client.table("alimentos").update(data).eq("id", str(alimento_id)).execute()
+    response = await db.table("alimentos").update(data).eq("id", str(alimento_id)).execute()
     
     if not response.data:
         raise HTTPException(status_code=404, detail="Alimento no encontrado")
     
+    # El precio o peso del bulto cambia el kg y costo de alimento de los lotes que lo
+    # consumieron: los totales se recalculan después de responder
+    if {"costo_por_bulto", "peso_bulto_kg"} & data.keys():
+        background_tasks.add_task(TotalesLoteService.reconciliar)
+    
     return response.data[0]
 
 
 @router.delete("/{alimento_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_alimento(alimento_id: UUID):
     """Eliminar un alimento"""
-    response = supabase_client.table("alimentos").delete().eq("id", str(alimento_id)).execute()
+    response = await db.table("alimentos").delete().eq("id", str(alimento_id)).execute()
     
     if not response.data:
         raise HTTPException(status_code=404, detail="Alimento no encontrado")
\ No newline at end of file
@@ -1,32 +1,119 @@
 # app/routes/consumo_alimento.py
 
-from fastapi import APIRouter, HTTPException, status
+from datetime import date
+from typing import Annotated, Any
 from uuid import UUID
-from app.models.consumo_alimento import ConsumoAlimentoCreate, ConsumoAlimentoUpdate, ConsumoAlimentoResponse
-from app.database import supabase_client
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+
+from app.campos import Campos, parametros_campos
+from app.config import settings
+from app.database import db
+from app.models.carga_masiva import ResultadoCargaMasiva
+from app.models.consumo_alimento import (
+    ConsumoAlimentoCreate,
+    ConsumoAlimentoResponse,
+    ConsumoAlimentoUpdate,
+    SerieConsumoResponse,
+)
+from app.paginacion import Pagina, columnas_cursor, paginar, parametros_pagina, responder_pagina
+from app.respuestas import responder_json
+from app.services.cache_reportes import cache_reportes
+from app.services.carga_masiva import CargaMasivaService
+from app.services.serie_consumo import Bucket, SerieConsumoService
+from app.services.totales_lote import TotalesLoteService
 
 router = APIRouter()
 
+# Orden de las listas paginadas
+ORDEN = [("fecha", True)]
+
+# Recursos que se pueden pedir con `expand`
+EMBEBIDOS = {"alimento": "alimento:alimentos(nombre, tipo)"}
+
+# Parámetro `max_puntos` de las series
+MaxPuntos = Annotated[int, Query(
+    ge=1,
+    le=settings.serie_consumo_max_puntos,
+    description="Máximo de puntos; si el rango tiene más períodos, cada punto junta varios"
+)]
+
+
+@router.get("/serie", response_model=SerieConsumoResponse)
+async def get_serie_consumo_granja(
+    bucket: Bucket = "dia",
+    max_puntos: MaxPuntos = settings.serie_consumo_max_puntos,
+    fecha_desde: date | None = None,
+    fecha_hasta: date | None = None
+):
+    """Serie de consumo de alimento de toda la granja por día, semana o mes"""
+    serie = await SerieConsumoService.serie_granja(bucket, max_puntos, fecha_desde, fecha_hasta)
+    return responder_json(serie)
+
+
+@router.get("/lote/{lote_id}/serie", response_model=SerieConsumoResponse)
+async def get_serie_consumo_lote(
+    lote_id: UUID,
+    bucket: Bucket = "dia",
+    max_puntos: MaxPuntos = settings.serie_consumo_max_puntos,
+    fecha_desde: date | None = None,
+    fecha_hasta: date | None = None
+):
+    """
+    Serie de consumo de alimento de un lote por día, semana o mes.
+    
+    Cada punto trae bultos, kg y costo, en total y por tipo de alimento;
+    sin fechas la serie va del primer al último día con consumo.
+    """
+    serie = await SerieConsumoService.serie_lote(
+        lote_id, bucket, max_puntos, fecha_desde, fecha_hasta
+    )
+    return responder_json(serie)
+
 
 @router.get("/lote/{lote_id}", response_model=list[ConsumoAlimentoResponse])
-async def get_consumo_by_lote(lote_id: UUID):
-    """Obtener todo el consumo de alimento de un lote"""
-    response = supabase_client.table("consumo_alimento")\
-        .select("*")\
-        .eq("lote_id", str(lote_id))\
-        .order("fecha", desc=True)\
-        .execute()
+async def get_consumo_by_lote(
+    lote_id: UUID,
+    response: Response,
+    pagina: Pagina = Depends(parametros_pagina),
+    campos: Campos = Depends(parametros_campos(ConsumoAlimentoResponse, EMBEBIDOS))
+):
+    """Obtener el consumo de alimento de un lote (paginado, más recientes primero)"""
+    query = db.table("consumo_alimento")\
+        .select(campos.seleccion(columnas_cursor(ORDEN)))\
+        .eq("lote_id", str(lote_id))
     
-    return response.data
+    resultado = await paginar(query, ORDEN, pagina).execute()
+    return campos.responder(responder_pagina(resultado.data, ORDEN, pagina, response), response)
 
 
 @router.post("/", response_model=ConsumoAlimentoResponse, status_code=status.HTTP_201_CREATED)
 async def create_consumo(consumo: ConsumoAlimentoCreate):
     """Registrar consumo de alimento"""
-    response = supabase_client.table("consumo_alimento").insert(consumo.model_dump(mode="json")).execute()
+    response = await db.table("consumo_alimento").insert(consumo.model_dump(mode="json")).execute()
+    await TotalesLoteService.registrar("consumo_alimento", nuevas=response.data)
+    cache_reportes.invalidar_lote(consumo.lote_id)
     return response.data[0]
 
 
+@router.post("/bulk", response_model=ResultadoCargaMasiva[ConsumoAlimentoResponse])
+async def create_consumo_bulk(
+    registros: Annotated[list[Any], Body(max_length=settings.carga_masiva_max_registros)]
+):
+    """
+    Registrar muchos consumos de alimento en una sola petición.
+    
+    Las filas inválidas o que apuntan a registros inexistentes se devuelven en
+    `errores` con su posición; las demás se insertan igual.
+    """
+    return await CargaMasivaService.insertar(
+        "consumo_alimento",
+        ConsumoAlimentoCreate,
+        registros,
+        referencias={"lote_id": "lotes", "alimento_id": "alimentos"}
+    )
+
+
 @router.patch("/{consumo_id}", response_model=ConsumoAlimentoResponse)
 async def update_consumo(consumo_id: UUID, consumo: ConsumoAlimentoUpdate):
     """Actualizar un registro de consumo"""
@@ -35,18 +122,27 @@ async def update_consumo(consumo_id: UUID, consumo: ConsumoAlimentoUpdate):
     if not data:
         raise HTTPException(status_code=400, detail="No hay datos para actualizar")
     
-    response = supabase_client.table("consumo_alimento").update(data).eq("id", str(consumo_id)).execute()
+    anterior = await TotalesLoteService.anterior("consumo_alimento", consumo_id, data)
+    response = await db.table("consumo_alimento").update(data).eq("id", str(consumo_id)).execute()
     
     if not response.data:
         raise HTTPException(status_code=404, detail="Registro no encontrado")
     
+    if anterior:
+        await TotalesLoteService.registrar(
+            "consumo_alimento", nuevas=response.data, anteriores=[anterior]
+        )
+    cache_reportes.invalidar_lote(response.data[0]["lote_id"])
     return response.data[0]
 
 
 @router.delete("/{consumo_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_consumo(consumo_id: UUID):
     """Eliminar un registro de consumo"""
-    response = supabase_client.table("consumo_alimento").delete().eq("id", str(consumo_id)).execute()
+    response = await db.table("consumo_alimento").delete().eq("id", str(consumo_id)).execute()
     
     if not response.data:
-        raise HTTPException(status_code=404, detail="Registro no encontrado")
\ No newline at end of file
+        raise HTTPException(status_code=404, detail="Registro no encontrado")
+    
+    await TotalesLoteService.registrar("consumo_alimento", anteriores=response.data)
+    cache_reportes.invalidar_lote(response.data[0]["lote_id"])
\ No newline at end of file
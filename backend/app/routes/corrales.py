@@ -1,40 +1,88 @@
 # app/routes/corrales.py
 
-from fastapi import APIRouter, HTTPException, status
 from uuid import UUID
-from app.models.corral import CorralCreate, CorralUpdate, CorralResponse
-from app.database import supabase_client
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+
+from app.cache_http import calcular_etag, condicional, politica_catalogo
+from app.campos import Campos, parametros_campos
+from app.database import db
+from app.models.corral import CorralCreate, CorralResponse, CorralUpdate
+from app.paginacion import Pagina, columnas_cursor, paginar, parametros_pagina, responder_pagina
+from app.services.cache_reportes import cache_reportes
 
 router = APIRouter()
 
+# Orden de las listas paginadas
+ORDEN = [("nombre", False)]
+
+
+async def invalidar_reportes_corral(corral_id: UUID):
+    """El área del corral cambió: invalidar los reportes de los lotes que lo ocupan"""
+    response = await db.table("lotes_corrales")\
+        .select("lotes(id, fecha_inicio, fecha_cierre)")\
+        .eq("corral_id", str(corral_id))\
+        .execute()
+    
+    for asignacion in response.data:
+        if asignacion.get("lotes"):
+            cache_reportes.invalidar_ocupacion(asignacion["lotes"])
+
 
 @router.get("/", response_model=list[CorralResponse])
-async def get_corrales(activo: bool | None = None):
-    """Obtener todos los corrales"""
-    query = supabase_client.table("corrales").select("*")
+async def get_corrales(
+    request: Request,
+    response: Response,
+    activo: bool | None = None,
+    pagina: Pagina = Depends(parametros_pagina),
+    campos: Campos = Depends(parametros_campos(CorralResponse))
+):
+    """Obtener los corrales (paginado, por nombre)"""
+    query = db.table("corrales").select(campos.seleccion(columnas_cursor(ORDEN)))
     
     if activo is not None:
         query = query.eq("activo", activo)
     
-    response = query.execute()
-    return response.data
+    resultado = await paginar(query, ORDEN, pagina).execute()
+    
+    no_modificado = condicional(
+        request, response, calcular_etag(request.url.query, resultado.data), politica_catalogo()
+    )
+    if no_modificado:
+        return no_modificado
+    
+    return campos.responder(responder_pagina(resultado.data, ORDEN, pagina, response), response)
 
 
 @router.get("/{corral_id}", response_model=CorralResponse)
-async def get_corral(corral_id: UUID):
+async def get_corral(
+    corral_id: UUID,
+    request: Request,
+    response: Response,
+    campos: Campos = Depends(parametros_campos(CorralResponse))
+):
     """Obtener un corral por ID"""
-    response = supabase_client.table("corrales").select("*").eq("id", str(corral_id)).execute()
+    resultado = await db.table("corrales")\
+        .select(campos.seleccion())\
+        .eq("id", str(corral_id))\
+        .execute()
     
-    if not response.data:
+    if not resultado.data:
         raise HTTPException(status_code=404, detail="Corral no encontrado")
     
-    return response.data[0]
+    no_modificado = condicional(
+        request, response, calcular_etag(request.url.query, resultado.data), politica_catalogo()
+    )
+    if no_modificado:
+        return no_modificado
+    
+    return campos.responder(resultado.data[0], response)
 
 
 @router.post("/", response_model=CorralResponse, status_code=status.HTTP_201_CREATED)
 async def create_corral(corral: CorralCreate):
     """Crear un nuevo corral"""
-    response = supabase_client.table("corrales").insert(corral.model_dump(mode="json")).execute()
+    response = await db.table("corrales").insert(corral.model_dump(mode="json")).execute()
     return response.data[0]
 
 
@@ -46,18 +94,24 @@ async def update_corral(corral_id: UUID, corral: CorralUpdate):
     if not data:
         raise HTTPException(status_code=400, detail="No hay datos para actualizar")
     
-    response = supabase_client.table("corrales").update(data).eq("id", str(corral_id)).execute()
+    response = await db.table("corrales").update(data).eq("id", str(corral_id)).execute()
     
     if not response.data:
         raise HTTPException(status_code=404, detail="Corral no encontrado")
     
+    if "area_m2" in data:
+        await invalidar_reportes_corral(corral_id)
+    
     return response.data[0]
 
 
 @router.delete("/{corral_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_corral(corral_id: UUID):
     """Eliminar un corral"""
-    response = supabase_client.table("corrales").delete().eq("id", str(corral_id)).execute()
+    # Antes de borrar, mientras las asignaciones todavía existen
+    await invalidar_reportes_corral(corral_id)
+    
+    response = await db.table("corrales").delete().eq("id", str(corral_id)).execute()
     
     if not response.data:
         raise HTTPException(status_code=404, detail="Corral no encontrado")
\ No newline at end of file
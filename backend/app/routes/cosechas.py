@@ -1,43 +1,66 @@
 # app/routes/cosechas.py
 
-from fastapi import APIRouter, HTTPException, status
 from uuid import UUID
-from app.models.cosecha import CosechaCreate, CosechaUpdate, CosechaResponse
-from app.database import supabase_client
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from app.campos import Campos, parametros_campos
+from app.database import db
+from app.models.cosecha import CosechaCreate, CosechaResponse, CosechaUpdate
+from app.paginacion import Pagina, columnas_cursor, paginar, parametros_pagina, responder_pagina
+from app.services.cache_reportes import cache_reportes
+from app.services.snapshot_service import SnapshotService
+from app.services.totales_lote import TotalesLoteService
 
 router = APIRouter()
 
+# Orden de las listas paginadas
+ORDEN = [("fecha", True)]
+
 
 @router.get("/lote/{lote_id}", response_model=list[CosechaResponse])
-async def get_cosechas_by_lote(lote_id: UUID):
-    """Obtener todas las cosechas de un lote"""
-    response = supabase_client.table("cosechas")\
-        .select("*")\
-        .eq("lote_id", str(lote_id))\
-        .order("fecha", desc=True)\
-        .execute()
+async def get_cosechas_by_lote(
+    lote_id: UUID,
+    response: Response,
+    pagina: Pagina = Depends(parametros_pagina),
+    campos: Campos = Depends(parametros_campos(CosechaResponse))
+):
+    """Obtener las cosechas de un lote (paginado, más recientes primero)"""
+    query = db.table("cosechas")\
+        .select(campos.seleccion(columnas_cursor(ORDEN)))\
+        .eq("lote_id", str(lote_id))
     
-    return response.data
+    resultado = await paginar(query, ORDEN, pagina).execute()
+    return campos.responder(responder_pagina(resultado.data, ORDEN, pagina, response), response)
 
 
 @router.post("/", response_model=CosechaResponse, status_code=status.HTTP_201_CREATED)
 async def create_cosecha(cosecha: CosechaCreate):
     """Registrar una cosecha"""
-    response = supabase_client.table("cosechas").insert(cosecha.model_dump(mode="json")).execute()
+    response = await db.table("cosechas").insert(cosecha.model_dump(mode="json")).execute()
     cosecha_creada = response.data[0]
+    await TotalesLoteService.registrar("cosechas", nuevas=response.data)
+    cache_reportes.invalidar_lote(cosecha.lote_id)
     
     # Si es la última cosecha, cerrar el lote automáticamente
     if cosecha.es_ultima_cosecha:
         from datetime import date
-        supabase_client.table("lotes").update({
+        lote_response = await db.table("lotes").update({
             "estado": "cerrado",
             "fecha_cierre": str(date.today())
         }).eq("id", str(cosecha.lote_id)).execute()
         
+        # Congelar costos e indicadores del lote cerrado, antes de liberar sus corrales
+        await SnapshotService.crear_snapshot_al_cerrar(cosecha.lote_id)
+        
         # Liberar corrales
-        supabase_client.table("lotes_corrales").update({
+        await db.table("lotes_corrales").update({
             "fecha_liberacion": str(date.today())
         }).eq("lote_id", str(cosecha.lote_id)).is_("fecha_liberacion", "null").execute()
+        
+        # El cierre cambia el reparto de gastos de los lotes que compartían sus meses
+        if lote_response.data:
+            cache_reportes.invalidar_ocupacion(lote_response.data[0])
     
     return cosecha_creada
 
@@ -50,18 +73,25 @@ async def update_cosecha(cosecha_id: UUID, cosecha: CosechaUpdate):
     if not data:
         raise HTTPException(status_code=400, detail="No hay datos para actualizar")
     
-    response = supabase_client.table("cosechas").update(data).eq("id", str(cosecha_id)).execute()
+    anterior = await TotalesLoteService.anterior("cosechas", cosecha_id, data)
+    response = await db.table("cosechas").update(data).eq("id", str(cosecha_id)).execute()
     
     if not response.data:
         raise HTTPException(status_code=404, detail="Cosecha no encontrada")
     
+    if anterior:
+        await TotalesLoteService.registrar("cosechas", nuevas=response.data, anteriores=[anterior])
+    cache_reportes.invalidar_lote(response.data[0]["lote_id"])
     return response.data[0]
 
 
 @router.delete("/{cosecha_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_cosecha(cosecha_id: UUID):
     """Eliminar una cosecha"""
-    response = supabase_client.table("cosechas").delete().eq("id", str(cosecha_id)).execute()
+    response = await db.table("cosechas").delete().eq("id", str(cosecha_id)).execute()
     
     if not response.data:
-        raise HTTPException(status_code=404, detail="Cosecha no encontrada")
\ No newline at end of file
+        raise HTTPException(status_code=404, detail="Cosecha no encontrada")
+    
+    await TotalesLoteService.registrar("cosechas", anteriores=response.data)
+    cache_reportes.invalidar_lote(response.data[0]["lote_id"])
\ No newline at end of file
@@ -1,32 +1,66 @@
 # app/routes/gastos_directos.py
 
-from fastapi import APIRouter, HTTPException, status
+from typing import Annotated, Any
 from uuid import UUID
-from app.models.gasto_directo import GastoDirectoCreate, GastoDirectoUpdate, GastoDirectoResponse
-from app.database import supabase_client
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Response, status
+
+from app.campos import Campos, parametros_campos
+from app.config import settings
+from app.database import db
+from app.models.carga_masiva import ResultadoCargaMasiva
+from app.models.gasto_directo import GastoDirectoCreate, GastoDirectoResponse, GastoDirectoUpdate
+from app.paginacion import Pagina, columnas_cursor, paginar, parametros_pagina, responder_pagina
+from app.services.cache_reportes import cache_reportes
+from app.services.carga_masiva import CargaMasivaService
+from app.services.totales_lote import TotalesLoteService
 
 router = APIRouter()
 
+# Orden de las listas paginadas
+ORDEN = [("fecha", True)]
+
 
 @router.get("/lote/{lote_id}", response_model=list[GastoDirectoResponse])
-async def get_gastos_by_lote(lote_id: UUID):
-    """Obtener todos los gastos directos de un lote"""
-    response = supabase_client.table("gastos_directos")\
-        .select("*")\
-        .eq("lote_id", str(lote_id))\
-        .order("fecha", desc=True)\
-        .execute()
+async def get_gastos_by_lote(
+    lote_id: UUID,
+    response: Response,
+    pagina: Pagina = Depends(parametros_pagina),
+    campos: Campos = Depends(parametros_campos(GastoDirectoResponse))
+):
+    """Obtener los gastos directos de un lote (paginado, más recientes primero)"""
+    query = db.table("gastos_directos")\
+        .select(campos.seleccion(columnas_cursor(ORDEN)))\
+        .eq("lote_id", str(lote_id))
     
-    return response.data
+    resultado = await paginar(query, ORDEN, pagina).execute()
+    return campos.responder(responder_pagina(resultado.data, ORDEN, pagina, response), response)
 
 
 @router.post("/", response_model=GastoDirectoResponse, status_code=status.HTTP_201_CREATED)
 async def create_gasto_directo(gasto: GastoDirectoCreate):
     """Registrar un gasto directo"""
-    response = supabase_client.table("gastos_directos").insert(gasto.model_dump(mode="json")).execute()
+    response = await db.table("gastos_directos").insert(gasto.model_dump(mode="json")).execute()
+    await TotalesLoteService.registrar("gastos_directos", nuevas=response.data)
+    cache_reportes.invalidar_lote(gasto.lote_id)
     return response.data[0]
 
 
+@router.post("/bulk", response_model=ResultadoCargaMasiva[GastoDirectoResponse])
+async def create_gastos_directos_bulk(
+    registros: Annotated[list[Any], Body(max_length=settings.carga_masiva_max_registros)]
+):
+    """
+    Registrar muchos gastos directos en una sola petición.
+    
+    Las filas inválidas o que apuntan a registros inexistentes se devuelven en
+    `errores` con su posición; las demás se insertan igual.
+    """
+    return await CargaMasivaService.insertar(
+        "gastos_directos", GastoDirectoCreate, registros, referencias={"lote_id": "lotes"}
+    )
+
+
 @router.patch("/{gasto_id}", response_model=GastoDirectoResponse)
 async def update_gasto_directo(gasto_id: UUID, gasto: GastoDirectoUpdate):
     """Actualizar un gasto directo"""
@@ -35,18 +69,27 @@ async def update_gasto_directo(gasto_id: UUID, gasto: GastoDirectoUpdate):
     if not data:
         raise HTTPException(status_code=400, detail="No hay datos para actualizar")
     
-    response = supabase_client.table("gastos_directos").update(data).eq("id", str(gasto_id)).execute()
+    anterior = await TotalesLoteService.anterior("gastos_directos", gasto_id, data)
+    response = await db.table("gastos_directos").update(data).eq("id", str(gasto_id)).execute()
     
     if not response.data:
         raise HTTPException(status_code=404, detail="Gasto no encontrado")
     
+    if anterior:
+        await TotalesLoteService.registrar(
+            "gastos_directos", nuevas=response.data, anteriores=[anterior]
+        )
+    cache_reportes.invalidar_lote(response.data[0]["lote_id"])
     return response.data[0]
 
 
 @router.delete("/{gasto_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_gasto_directo(gasto_id: UUID):
     """Eliminar un gasto directo"""
-    response = supabase_client.table("gastos_directos").delete().eq("id", str(gasto_id)).execute()
+    response = await db.table("gastos_directos").delete().eq("id", str(gasto_id)).execute()
     
     if not response.data:
-        raise HTTPException(status_code=404, detail="Gasto no encontrado")
\ No newline at end of file
+        raise HTTPException(status_code=404, detail="Gasto no encontrado")
+    
+    await TotalesLoteService.registrar("gastos_directos", anteriores=response.data)
+    cache_reportes.invalidar_lote(response.data[0]["lote_id"])
\ No newline at end of file
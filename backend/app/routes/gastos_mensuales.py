@@ -1,31 +1,46 @@
 # app/routes/gastos_mensuales.py
 
-from fastapi import APIRouter, HTTPException, status
 from uuid import UUID
-from app.models.gasto_mensual import GastoMensualCreate, GastoMensualUpdate, GastoMensualResponse
-from app.database import supabase_client
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from app.database import db
+from app.models.gasto_mensual import GastoMensualCreate, GastoMensualResponse, GastoMensualUpdate
+from app.paginacion import Pagina, paginar, parametros_pagina, responder_pagina
+from app.services.cache_reportes import cache_reportes
 
 router = APIRouter()
 
+# Orden de las listas paginadas
+ORDEN = [("anio", True), ("mes", True)]
+
 
 @router.get("/", response_model=list[GastoMensualResponse])
-async def get_gastos_mensuales(anio: int | None = None, mes: int | None = None):
-    """Obtener gastos mensuales, opcionalmente filtrados por año y/o mes"""
-    query = supabase_client.table("gastos_mensuales").select("*").order("anio", desc=True).order("mes", desc=True)
+async def get_gastos_mensuales(
+    response: Response,
+    anio: int | None = None,
+    mes: int | None = None,
+    pagina: Pagina = Depends(parametros_pagina)
+):
+    """
+    Obtener gastos mensuales, opcionalmente filtrados por año y/o mes
+    (paginado, más recientes primero)
+    """
+    query = db.table("gastos_mensuales").select("*")
     
     if anio:
         query = query.eq("anio", anio)
     if mes:
         query = query.eq("mes", mes)
     
-    response = query.execute()
-    return response.data
+    resultado = await paginar(query, ORDEN, pagina).execute()
+    return responder_pagina(resultado.data, ORDEN, pagina, response)
 
 
 @router.get("/periodo/{anio}/{mes}", response_model=list[GastoMensualResponse])
 async def get_gastos_by_periodo(anio: int, mes: int):
     """Obtener todos los gastos de un período específico"""
-    response = supabase_client.table("gastos_mensuales")\
+    response = await db.table("gastos_mensuales")\
         .select("*")\
         .eq("anio", anio)\
         .eq("mes", mes)\
@@ -37,7 +52,8 @@ async def get_gastos_by_periodo(anio: int, mes: int):
 @router.post("/", response_model=GastoMensualResponse, status_code=status.HTTP_201_CREATED)
 async def create_gasto_mensual(gasto: GastoMensualCreate):
     """Registrar un gasto mensual"""
-    response = supabase_client.table("gastos_mensuales").insert(gasto.model_dump(mode="json")).execute()
+    response = await db.table("gastos_mensuales").insert(gasto.model_dump(mode="json")).execute()
+    cache_reportes.invalidar_meses([(gasto.anio, gasto.mes)])
     return response.data[0]
 
 
@@ -49,18 +65,23 @@ async def update_gasto_mensual(gasto_id: UUID, gasto: GastoMensualUpdate):
     if not data:
         raise HTTPException(status_code=400, detail="No hay datos para actualizar")
     
-    response = supabase_client.table("gastos_mensuales").update(data).eq("id", str(gasto_id)).execute()
+    response = await db.table("gastos_mensuales").update(data).eq("id", str(gasto_id)).execute()
     
     if not response.data:
         raise HTTPException(status_code=404, detail="Gasto no encontrado")
     
-    return response.data[0]
+    gasto_actualizado = response.data[0]
+    cache_reportes.invalidar_meses([(gasto_actualizado["anio"], gasto_actualizado["mes"])])
+    return gasto_actualizado
 
 
 @router.delete("/{gasto_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_gasto_mensual(gasto_id: UUID):
     """Eliminar un gasto mensual"""
-    response = supabase_client.table("gastos_mensuales").delete().eq("id", str(gasto_id)).execute()
+    response = await db.table("gastos_mensuales").delete().eq("id", str(gasto_id)).execute()
     
     if not response.data:
-        raise HTTPException(status_code=404, detail="Gasto no encontrado")
\ No newline at end of file
+        raise HTTPException(status_code=404, detail="Gasto no encontrado")
+    
+    gasto_eliminado = response.data[0]
+    cache_reportes.invalidar_meses([(gasto_eliminado["anio"], gasto_eliminado["mes"])])
\ No newline at end of file
@@ -1,69 +1,142 @@
 # app/routes/lotes.py
 
-from fastapi import APIRouter, HTTPException, status
+import asyncio
 from uuid import UUID
-from app.models.lote import LoteCreate, LoteUpdate, LoteResponse, LoteDetailResponse
-from app.database import supabase_client
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+
+from app.cache_http import calcular_etag, condicional, politica_lote
+from app.campos import Campos, parametros_campos
+from app.database import db
+from app.models.lote import LoteCreate, LoteDetailResponse, LoteResponse, LoteUpdate
+from app.paginacion import Pagina, columnas_cursor, paginar, parametros_pagina, responder_pagina
+from app.services.cache_reportes import cache_reportes
+from app.services.snapshot_service import SnapshotService
+from app.services.totales_lote import TotalesLoteService
 
 router = APIRouter()
 
+# Orden de las listas paginadas
+ORDEN = [("fecha_inicio", True)]
+
+# Recursos que la lista acepta en `expand`: totales acumulados del lote (migrations/004)
+EMBEBIDOS = {
+    "totales": "totales:lotes_totales("
+               "mortalidad, animales_vendidos, kg_vendidos, "
+               "alimento_kg, alimento_costo, gastos_directos)"
+}
+
+# Recursos que el detalle acepta en `expand` (se consultan aparte, en lotes_corrales)
+EMBEBIDOS_DETALLE = {"corrales_asignados": "lotes_corrales(*, corrales(*))"}
+
 
 @router.get("/", response_model=list[LoteResponse])
-async def get_lotes(estado: str | None = None):
-    """Obtener todos los lotes"""
-    query = supabase_client.table("lotes").select("*").order("fecha_inicio", desc=True)
+async def get_lotes(
+    response: Response,
+    estado: str | None = None,
+    pagina: Pagina = Depends(parametros_pagina),
+    campos: Campos = Depends(parametros_campos(LoteResponse, EMBEBIDOS))
+):
+    """
+    Obtener los lotes (paginado, más recientes primero).
+    
+    Con expand=totales cada lote trae sus totales acumulados (mortalidad,
+    vendidos, alimento, gastos directos) sin consultas adicionales.
+    """
+    query = db.table("lotes").select(campos.seleccion(columnas_cursor(ORDEN)))
     
     if estado:
         query = query.eq("estado", estado)
     
-    response = query.execute()
-    return response.data
+    resultado = await paginar(query, ORDEN, pagina).execute()
+    return campos.responder(responder_pagina(resultado.data, ORDEN, pagina, response), response)
 
 
 @router.get("/{lote_id}", response_model=LoteDetailResponse)
-async def get_lote(lote_id: UUID):
-    """Obtener un lote por ID con información detallada"""
-    # Obtener lote
-    lote_response = supabase_client.table("lotes").select("*").eq("id", str(lote_id)).execute()
+async def get_lote(
+    lote_id: UUID,
+    request: Request,
+    response: Response,
+    campos: Campos = Depends(parametros_campos(LoteDetailResponse, EMBEBIDOS_DETALLE))
+):
+    """
+    Obtener un lote por ID con información detallada.
+    
+    Con `fields` solo se consultan las tablas que hacen falta para los campos
+    pedidos (ej. sin corrales ni estadísticas para fields=numero_lote,estado).
+    Los lotes cerrados se pueden guardar en el navegador (Cache-Control).
+    """
+    pedidos = campos.pedidos()
+    con_corrales = bool(pedidos & {"area_total_m2", "corrales_asignados"})
+    con_estadisticas = bool(
+        pedidos & {
+            "animales_actuales", "total_consumo_alimento_kg", "total_mortalidad", "total_vendidos"
+        }
+    )
+    
+    columnas = [nombre for nombre in LoteResponse.model_fields if nombre in pedidos]
+    if "animales_actuales" in pedidos and "animales_iniciales" not in columnas:
+        columnas.append("animales_iniciales")
+    if "estado" not in columnas:
+        columnas.append("estado")  # define el Cache-Control
+    seleccion = "*" if campos.completos else ", ".join(columnas)
+    
+    # Consultas independientes en paralelo: lote, corrales asignados y totales acumulados
+    consultas = [db.table("lotes").select(seleccion).eq("id", str(lote_id)).execute()]
+    if con_corrales:
+        consultas.append(
+            db.table("lotes_corrales")
+                .select("*, corrales(*)")
+                .eq("lote_id", str(lote_id))
+                .is_("fecha_liberacion", "null")
+                .execute()
+        )
+    if con_estadisticas:
+        consultas.append(
+            db.table("lotes_totales")
+                .select("mortalidad, animales_vendidos, alimento_kg")
+                .eq("lote_id", str(lote_id))
+                .execute()
+        )
+    
+    respuestas = iter(await asyncio.gather(*consultas))
+    lote_response = next(respuestas)
     
     if not lote_response.data:
         raise HTTPException(status_code=404, detail="Lote no encontrado")
     
     lote = lote_response.data[0]
     
-    # Obtener corrales asignados
-    corrales_response = supabase_client.table("lotes_corrales")\
-        .select("*, corrales(*)")\
-        .eq("lote_id", str(lote_id))\
-        .is_("fecha_liberacion", "null")\
-        .execute()
-    
-    # Calcular área total
-    area_total = sum(c["corrales"]["area_m2"] for c in corrales_response.data if c.get("corrales"))
-    
-    # Obtener estadísticas
-    mortalidad_response = supabase_client.table("mortalidad")\
-        .select("cantidad")\
-        .eq("lote_id", str(lote_id))\
-        .execute()
-    
-    cosechas_response = supabase_client.table("cosechas")\
-        .select("cantidad_animales")\
-        .eq("lote_id", str(lote_id))\
-        .execute()
-    
-    total_mortalidad = sum(m["cantidad"] for m in mortalidad_response.data)
-    total_vendidos = sum(c["cantidad_animales"] for c in cosechas_response.data)
-    animales_actuales = lote["animales_iniciales"] - total_mortalidad - total_vendidos
-    
-    # Construir respuesta
-    lote["area_total_m2"] = area_total
-    lote["corrales_asignados"] = corrales_response.data
-    lote["animales_actuales"] = animales_actuales
-    lote["total_mortalidad"] = total_mortalidad
-    lote["total_vendidos"] = total_vendidos
+    if con_corrales:
+        corrales_response = next(respuestas)
+        # Calcular área total
+        lote["area_total_m2"] = sum(
+            c["corrales"]["area_m2"] for c in corrales_response.data if c.get("corrales")
+        )
+        lote["corrales_asignados"] = corrales_response.data
     
-    return lote
+    if con_estadisticas:
+        totales_response = next(respuestas)
+        totales = TotalesLoteService.con_vacios(
+            totales_response.data[0] if totales_response.data else None
+        )
+        lote["animales_actuales"] = (
+            lote["animales_iniciales"] - totales["mortalidad"] - totales["animales_vendidos"]
+        )
+        lote["total_mortalidad"] = totales["mortalidad"]
+        lote["total_vendidos"] = totales["animales_vendidos"]
+        lote["total_consumo_alimento_kg"] = totales["alimento_kg"]
+    
+    no_modificado = condicional(
+        request,
+        response,
+        calcular_etag(request.url.query, lote),
+        politica_lote(lote["estado"] == "cerrado")
+    )
+    if no_modificado:
+        return no_modificado
+    
+    return campos.responder(lote, response)
 
 
 @router.post("/", response_model=LoteResponse, status_code=status.HTTP_201_CREATED)
@@ -82,7 +155,7 @@ async def create_lote(lote: LoteCreate):
     lote_data = lote.model_dump(exclude={"corrales_ids"}, mode="json")
     
     # Crear lote
-    lote_response = supabase_client.table("lotes").insert(lote_data).execute()
+    lote_response = await db.table("lotes").insert(lote_data).execute()
     lote_creado = lote_response.data[0]
     
     # Asignar corrales
@@ -91,7 +164,10 @@ async def create_lote(lote: LoteCreate):
         for corral_id in corrales_ids
     ]
     
-    supabase_client.table("lotes_corrales").insert(asignaciones).execute()
+    await db.table("lotes_corrales").insert(asignaciones).execute()
+    
+    # Los corrales ocupados cambian el reparto de gastos de los lotes activos
+    cache_reportes.invalidar_ocupacion(lote_creado)
     
     return lote_creado
 
@@ -105,11 +181,14 @@ async def update_lote(lote_id: UUID, lote: LoteUpdate):
     if not data:
         raise HTTPException(status_code=400, detail="No hay datos para actualizar")
     
-    response = supabase_client.table("lotes").update(data).eq("id", str(lote_id)).execute()
+    response = await db.table("lotes").update(data).eq("id", str(lote_id)).execute()
     
     if not response.data:
         raise HTTPException(status_code=404, detail="Lote no encontrado")
     
+    # Las fechas del lote pueden cambiar el reparto de gastos de otros lotes
+    cache_reportes.invalidar_ocupacion(response.data[0], hasta_hoy="fecha_cierre" in data)
+    
     return response.data[0]
 
 
@@ -118,7 +197,7 @@ async def cerrar_lote(lote_id: UUID):
     """Cerrar un lote (después de la última cosecha)"""
     from datetime import date
     
-    response = supabase_client.table("lotes").update({
+    response = await db.table("lotes").update({
         "estado": "cerrado",
         "fecha_cierre": str(date.today())
     }).eq("id", str(lote_id)).execute()
@@ -126,9 +205,14 @@ async def cerrar_lote(lote_id: UUID):
     if not response.data:
         raise HTTPException(status_code=404, detail="Lote no encontrado")
     
+    # Congelar costos e indicadores del lote cerrado, antes de liberar sus corrales
+    await SnapshotService.crear_snapshot_al_cerrar(lote_id)
+    
     # Liberar corrales
-    supabase_client.table("lotes_corrales").update({
+    await db.table("lotes_corrales").update({
         "fecha_liberacion": str(date.today())
     }).eq("lote_id", str(lote_id)).is_("fecha_liberacion", "null").execute()
     
+    cache_reportes.invalidar_ocupacion(response.data[0])
+    
     return response.data[0]
\ No newline at end of file
@@ -1,32 +1,66 @@
 # app/routes/mortalidad.py
 
-from fastapi import APIRouter, HTTPException, status
+from typing import Annotated, Any
 from uuid import UUID
-from app.models.mortalidad import MortalidadCreate, MortalidadUpdate, MortalidadResponse
-from app.database import supabase_client
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Response, status
+
+from app.campos import Campos, parametros_campos
+from app.config import settings
+from app.database import db
+from app.models.carga_masiva import ResultadoCargaMasiva
+from app.models.mortalidad import MortalidadCreate, MortalidadResponse, MortalidadUpdate
+from app.paginacion import Pagina, columnas_cursor, paginar, parametros_pagina, responder_pagina
+from app.services.cache_reportes import cache_reportes
+from app.services.carga_masiva import CargaMasivaService
+from app.services.totales_lote import TotalesLoteService
 
 router = APIRouter()
 
+# Orden de las listas paginadas
+ORDEN = [("fecha", True)]
+
 
 @router.get("/lote/{lote_id}", response_model=list[MortalidadResponse])
-async def get_mortalidad_by_lote(lote_id: UUID):
-    """Obtener todos los registros de mortalidad de un lote"""
-    response = supabase_client.table("mortalidad")\
-        .select("*")\
-        .eq("lote_id", str(lote_id))\
-        .order("fecha", desc=True)\
-        .execute()
+async def get_mortalidad_by_lote(
+    lote_id: UUID,
+    response: Response,
+    pagina: Pagina = Depends(parametros_pagina),
+    campos: Campos = Depends(parametros_campos(MortalidadResponse))
+):
+    """Obtener los registros de mortalidad de un lote (paginado, más recientes primero)"""
+    query = db.table("mortalidad")\
+        .select(campos.seleccion(columnas_cursor(ORDEN)))\
+        .eq("lote_id", str(lote_id))
     
-    return response.data
+    resultado = await paginar(query, ORDEN, pagina).execute()
+    return campos.responder(responder_pagina(resultado.data, ORDEN, pagina, response), response)
 
 
 @router.post("/", response_model=MortalidadResponse, status_code=status.HTTP_201_CREATED)
 async def create_mortalidad(mortalidad: MortalidadCreate):
     """Registrar mortalidad"""
-    response = supabase_client.table("mortalidad").insert(mortalidad.model_dump(mode="json")).execute()
+    response = await db.table("mortalidad").insert(mortalidad.model_dump(mode="json")).execute()
+    await TotalesLoteService.registrar("mortalidad", nuevas=response.data)
+    cache_reportes.invalidar_lote(mortalidad.lote_id)
     return response.data[0]
 
 
+@router.post("/bulk", response_model=ResultadoCargaMasiva[MortalidadResponse])
+async def create_mortalidad_bulk(
+    registros: Annotated[list[Any], Body(max_length=settings.carga_masiva_max_registros)]
+):
+    """
+    Registrar muchos registros de mortalidad en una sola petición.
+    
+    Las filas inválidas o que apuntan a registros inexistentes se devuelven en
+    `errores` con su posición; las demás se insertan igual.
+    """
+    return await CargaMasivaService.insertar(
+        "mortalidad", MortalidadCreate, registros, referencias={"lote_id": "lotes"}
+    )
+
+
 @router.patch("/{mortalidad_id}", response_model=MortalidadResponse)
 async def update_mortalidad(mortalidad_id: UUID, mortalidad: MortalidadUpdate):
     """Actualizar un registro de mortalidad"""
@@ -35,18 +69,27 @@ async def update_mortalidad(mortalidad_id: UUID, mortalidad: MortalidadUpdate):
     if not data:
         raise HTTPException(status_code=400, detail="No hay datos para actualizar")
     
-    response = supabase_client.table("mortalidad").update(data).eq("id", str(mortalidad_id)).execute()
+    anterior = await TotalesLoteService.anterior("mortalidad", mortalidad_id, data)
+    response = await db.table("mortalidad").update(data).eq("id", str(mortalidad_id)).execute()
     
     if not response.data:
         raise HTTPException(status_code=404, detail="Registro no encontrado")
     
+    if anterior:
+        await TotalesLoteService.registrar(
+            "mortalidad", nuevas=response.data, anteriores=[anterior]
+        )
+    cache_reportes.invalidar_lote(response.data[0]["lote_id"])
     return response.data[0]
 
 
 @router.delete("/{mortalidad_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_mortalidad(mortalidad_id: UUID):
     """Eliminar un registro de mortalidad"""
-    response = supabase_client.table("mortalidad").delete().eq("id", str(mortalidad_id)).execute()
+    response = await db.table("mortalidad").delete().eq("id", str(mortalidad_id)).execute()
     
     if not response.data:
-        raise HTTPException(status_code=404, detail="Registro no encontrado")
\ No newline at end of file
+        raise HTTPException(status_code=404, detail="Registro no encontrado")
+    
+    await TotalesLoteService.registrar("mortalidad", anteriores=response.data)
+    cache_reportes.invalidar_lote(response.data[0]["lote_id"])
\ No newline at end of file
@@ -1,41 +1,213 @@
 # app/routes/reportes.py
 
-from fastapi import APIRouter, HTTPException
+from datetime import date
+from typing import Literal
 from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.cache_http import Version, politica_lote
+from app.config import settings
+from app.models.reporte import (
+    CostosLoteResponse,
+    IndicadoresLoteResponse,
+    ProrrateoMes,
+    ProrrateoMesGranjaResponse,
+    ResumenGranjaResponse,
+)
+from app.respuestas import responder_json
+from app.services.cache_reportes import cache_reportes, meses_de_lote
 from app.services.calculo_service import CalculoCostosService
+from app.services.contexto_calculo import ContextoCalculo
+from app.services.exportacion import ExportacionService
+from app.services.snapshot_service import SnapshotService
 
 router = APIRouter()
 
+# Columnas de la exportación de costos: (clave, título)
+COLUMNAS_EXPORTACION = [
+    ("numero_lote", "Lote"),
+    ("estado", "Estado"),
+    ("mes", "Mes"),
+    ("lechones", "Lechones"),
+    ("alimento_kg", "Alimento (kg)"),
+    ("alimento", "Alimento"),
+    ("gastos_directos", "Gastos directos"),
+    ("gastos_prorrateados", "Gastos prorrateados"),
+    ("total_mes", "Total mes"),
+    ("acumulado", "Acumulado lote"),
+]
+
+TIPOS_EXPORTACION = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
 
-@router.get("/lote/{lote_id}/costos")
-async def get_costos_lote(lote_id: UUID):
+
+@router.get("/lote/{lote_id}/costos", response_model=CostosLoteResponse)
+async def get_costos_lote(lote_id: UUID, request: Request, response: Response):
     """Obtener el cálculo completo de costos de un lote"""
-    try:
-        resultado = CalculoCostosService.calcular_costo_total_lote(lote_id)
-        return resultado
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error en cálculo: {str(e)}")
+    clave = ("costos", str(lote_id), None)
+    version = cache_reportes.obtener(clave)
+    
+    if version is None:
+        try:
+            # Los lotes cerrados se sirven desde su snapshot
+            ctx = ContextoCalculo()
+            snapshot = await SnapshotService.obtener_snapshot(lote_id, ctx)
+            if snapshot:
+                resultado = snapshot["costos"]
+            else:
+                resultado = await CalculoCostosService.calcular_costo_total_lote(lote_id, ctx)
+            
+            # Se guarda serializado y con su ETag: un acierto de cache no vuelve a serializar
+            lote = await ctx.lote(lote_id)
+            version = Version.de(resultado, politica_lote(lote["estado"] == "cerrado"))
+            cache_reportes.guardar(clave, version, lote_id, meses_de_lote(lote))
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error en cálculo: {str(e)}")
+    
+    return version.responder(request, response)
 
 
-@router.get("/lote/{lote_id}/indicadores")
-async def get_indicadores_lote(lote_id: UUID):
+@router.get("/lote/{lote_id}/indicadores", response_model=IndicadoresLoteResponse)
+async def get_indicadores_lote(lote_id: UUID, request: Request, response: Response):
     """Obtener indicadores de eficiencia de un lote"""
+    clave = ("indicadores", str(lote_id), None)
+    version = cache_reportes.obtener(clave)
+    
+    if version is None:
+        try:
+            # Los lotes cerrados se sirven desde su snapshot
+            ctx = ContextoCalculo()
+            snapshot = await SnapshotService.obtener_snapshot(lote_id, ctx)
+            if snapshot:
+                resultado = snapshot["indicadores"]
+            else:
+                resultado = await CalculoCostosService.calcular_indicadores_eficiencia(lote_id, ctx)
+            
+            # Se guarda serializado y con su ETag: un acierto de cache no vuelve a serializar
+            lote = await ctx.lote(lote_id)
+            version = Version.de(resultado, politica_lote(lote["estado"] == "cerrado"))
+            cache_reportes.guardar(clave, version, lote_id, meses_de_lote(lote))
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error en cálculo: {str(e)}")
+    
+    return version.responder(request, response)
+
+
+@router.post("/lote/{lote_id}/snapshot", status_code=status.HTTP_201_CREATED)
+async def crear_snapshot_lote(lote_id: UUID):
+    """Recalcular y guardar una nueva versión del snapshot de un lote cerrado"""
+    ctx = ContextoCalculo()
+    lote = await ctx.lote(lote_id)
+    
+    if not lote:
+        raise HTTPException(status_code=404, detail="Lote no encontrado")
+    
+    if lote["estado"] != "cerrado":
+        raise HTTPException(status_code=400, detail="Solo se guardan snapshots de lotes cerrados")
+    
     try:
-        resultado = CalculoCostosService.calcular_indicadores_eficiencia(lote_id)
-        return resultado
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+        snapshot = await SnapshotService.crear_snapshot(lote_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error en cálculo: {str(e)}")
+    
+    cache_reportes.invalidar_lote(lote_id)
+    
+    return {
+        "lote_id": snapshot["lote_id"],
+        "version": snapshot["version"],
+        "created_at": snapshot.get("created_at")
+    }
 
 
-@router.get("/lote/{lote_id}/prorrateo/{anio}/{mes}")
+@router.get("/lote/{lote_id}/prorrateo/{anio}/{mes}", response_model=ProrrateoMes)
 async def get_prorrateo_mes(lote_id: UUID, anio: int, mes: int):
     """Obtener el prorrateo de gastos de un lote en un mes específico"""
+    clave = ("prorrateo", str(lote_id), (anio, mes))
+    resultado = cache_reportes.obtener(clave)
+    if resultado is not None:
+        return responder_json(resultado)
+    
+    try:
+        resultado = await CalculoCostosService.prorratear_gastos_mensuales(lote_id, anio, mes)
+        cache_reportes.guardar(clave, resultado, lote_id, [(anio, mes)])
+        return responder_json(resultado)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error en cálculo: {str(e)}")
+
+
+@router.get("/prorrateo/{anio}/{mes}", response_model=ProrrateoMesGranjaResponse)
+async def get_prorrateo_mes_granja(anio: int, mes: int):
+    """Obtener el prorrateo de los gastos de un mes para todos los lotes activos"""
+    clave = ("prorrateo", None, (anio, mes))
+    resultado = cache_reportes.obtener(clave)
+    if resultado is not None:
+        return responder_json(resultado)
+    
     try:
-        resultado = CalculoCostosService.prorratear_gastos_mensuales(lote_id, anio, mes)
-        return resultado
+        resultado = await CalculoCostosService.prorratear_mes_granja(anio, mes)
+        cache_reportes.guardar(clave, resultado, meses=[(anio, mes)])
+        return responder_json(resultado)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error en cálculo: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error en cálculo: {str(e)}")
+
+
+@router.get("/resumen", response_model=ResumenGranjaResponse)
+async def get_resumen_granja(
+    estado: Literal['activo', 'cerrado'] | None = None,
+    fecha_desde: date | None = None,
+    fecha_hasta: date | None = None
+):
+    """Obtener costos e indicadores de todos los lotes, opcionalmente filtrados"""
+    # Depende de todos los lotes y meses: cualquier escritura lo invalida
+    clave = ("resumen", None, (estado, fecha_desde, fecha_hasta))
+    resultado = cache_reportes.obtener(clave)
+    if resultado is not None:
+        return responder_json(resultado)
+    
+    try:
+        if settings.motor_resumen == "vectorizado":
+            # NumPy solo se importa si se usa este motor
+            from app.services.motor_vectorizado import MotorVectorizado
+            motor = MotorVectorizado
+        else:
+            motor = CalculoCostosService
+        resultado = await motor.calcular_resumen_granja(estado, fecha_desde, fecha_hasta)
+        cache_reportes.guardar(clave, resultado)
+        return responder_json(resultado)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error en cálculo: {str(e)}")
+
+
+@router.get("/export")
+async def exportar_costos(
+    formato: Literal['csv', 'xlsx'] = 'csv',
+    estado: Literal['activo', 'cerrado'] | None = None,
+    fecha_desde: date | None = None,
+    fecha_hasta: date | None = None
+):
+    """
+    Exportar los costos de los lotes, una fila por lote y mes.
+    
+    El archivo se envía a medida que se calcula, sin armarlo en memoria;
+    los filtros son los mismos del resumen.
+    """
+    filas = CalculoCostosService.iterar_costos_mensuales(estado, fecha_desde, fecha_hasta)
+    
+    if formato == "csv":
+        contenido = ExportacionService.generar_csv(COLUMNAS_EXPORTACION, filas)
+    else:
+        contenido = ExportacionService.generar_xlsx(COLUMNAS_EXPORTACION, filas, hoja="Costos")
+    
+    return StreamingResponse(
+        contenido,
+        media_type=TIPOS_EXPORTACION[formato],
+        headers={"Content-Disposition": f'attachment; filename="costos_lotes.{formato}"'}
+    )
@@ -0,0 +1,99 @@
+# app/salud.py
+
+"""
+Sondas de salud y calentamiento al arrancar.
+- /livez: el proceso responde; no toca la base de datos.
+- /readyz y /health: la base responde. El resultado de la consulta de
+  prueba se guarda unos segundos (SALUD_CACHE_SEGUNDOS), así los pings de
+  keep-alive y del balanceador no consultan Supabase cada vez.
+Al arrancar, calentar() crea el cliente de Supabase y hace la primera
+consulta en segundo plano, mientras el servidor ya acepta peticiones.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from app.config import settings
+from app.database import db
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ResultadoSonda:
+    """Resultado de una consulta de prueba a la base de datos"""
+    ok: bool
+    detalle: str      # "connected" o el error
+    momento: float    # time.monotonic() al terminar
+    duracion_ms: float
+
+
+class SondaBaseDatos:
+    """
+    Consulta de prueba a Supabase con resultado en cache.
+    
+    Las peticiones que llegan mientras una consulta está en curso esperan
+    esa misma consulta en lugar de lanzar otra.
+    """
+    
+    def __init__(self, ttl_segundos: float, timeout_segundos: float):
+        self.ttl_segundos = ttl_segundos
+        self.timeout_segundos = timeout_segundos
+        self._ultimo: Optional[ResultadoSonda] = None
+        self._en_curso: Optional[asyncio.Task] = None
+    
+    @property
+    def ultimo(self) -> Optional[ResultadoSonda]:
+        return self._ultimo
+    
+    async def verificar(self) -> ResultadoSonda:
+        """Último resultado si sigue vigente; si no, una consulta nueva"""
+        ultimo = self._ultimo
+        if ultimo is not None and time.monotonic() - ultimo.momento < self.ttl_segundos:
+            return ultimo
+        
+        if self._en_curso is None or self._en_curso.done():
+            self._en_curso = asyncio.ensure_future(self._sondear())
+        
+        # shield: si se cancela una petición, la consulta sigue para las demás
+        return await asyncio.shield(self._en_curso)
+    
+    async def _sondear(self) -> ResultadoSonda:
+        inicio = time.perf_counter()
+        try:
+            # La primera vez crea el cliente (importa supabase) fuera del event loop
+            if not db.conectado:
+                await asyncio.to_thread(db.conectar)
+            await asyncio.wait_for(
+                db.table("corrales").select("id").limit(1).execute(),
+                timeout=self.timeout_segundos
+            )
+            ok, detalle = True, "connected"
+        except asyncio.TimeoutError:
+            ok, detalle = False, f"error: sin respuesta en {self.timeout_segundos:g} s"
+        except Exception as e:
+            ok, detalle = False, f"error: {str(e)}"
+        
+        self._ultimo = ResultadoSonda(
+            ok=ok,
+            detalle=detalle,
+            momento=time.monotonic(),
+            duracion_ms=(time.perf_counter() - inicio) * 1000
+        )
+        return self._ultimo
+
+
+# Instancia única del proceso
+sonda_bd = SondaBaseDatos(settings.salud_cache_segundos, settings.salud_timeout_segundos)
+
+
+async def calentar() -> None:
+    """Crea el cliente de Supabase y deja lista la primera sonda"""
+    resultado = await sonda_bd.verificar()
+    if resultado.ok:
+        logger.info("Base de datos lista en %.0f ms", resultado.duracion_ms)
+    else:
+        logger.warning("La base de datos no respondió al arrancar: %s", resultado.detalle)
@@ -0,0 +1,135 @@
+# app/services/cache_reportes.py
+
+"""
+Cache en memoria de los resultados de reportes.
+Guarda los resultados de los endpoints de `reportes` con LRU + TTL, y las
+rutas de escritura invalidan solo las entradas que su cambio afecta.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Hashable, Iterable, Optional
+from uuid import UUID
+
+from app.config import settings
+
+
+@dataclass
+class EntradaCache:
+    """Resultado guardado y de qué depende"""
+    valor: Any
+    expira: float
+    lote_id: Optional[str]  # None: depende de todos los lotes (ej. resumen)
+    meses: Optional[frozenset[tuple[int, int]]]  # None: depende de todos los meses
+
+
+def meses_de_lote(lote: dict, hasta_hoy: bool = False) -> frozenset[tuple[int, int]]:
+    """
+    Meses (anio, mes) en los que un lote estuvo activo; un lote abierto llega hasta hoy.
+    
+    Con hasta_hoy=True se incluyen también los meses entre el cierre y hoy.
+    """
+    fecha_inicio = datetime.strptime(str(lote["fecha_inicio"]), "%Y-%m-%d").date()
+    fecha_fin = (
+        datetime.strptime(str(lote["fecha_cierre"]), "%Y-%m-%d").date()
+        if lote.get("fecha_cierre")
+        else date.today()
+    )
+    if hasta_hoy:
+        fecha_fin = max(fecha_fin, date.today())
+    
+    meses = set()
+    anio, mes = fecha_inicio.year, fecha_inicio.month
+    while (anio, mes) <= (fecha_fin.year, fecha_fin.month):
+        meses.add((anio, mes))
+        anio, mes = (anio + 1, 1) if mes == 12 else (anio, mes + 1)
+    
+    return frozenset(meses)
+
+
+class CacheReportes:
+    """
+    Cache LRU con expiración por tiempo.
+    
+    Las claves son (tipo de reporte, lote_id, período). Cada entrada recuerda
+    el lote y los meses de los que depende para poder invalidarla con precisión.
+    """
+    
+    def __init__(self, max_entradas: int, ttl_segundos: float):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self._entradas: OrderedDict[Hashable, EntradaCache] = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+    
+    def obtener(self, clave: Hashable) -> Optional[Any]:
+        """Retorna el valor guardado, o None si no existe o expiró"""
+        entrada = self._entradas.get(clave)
+        
+        if entrada is None or entrada.expira < time.monotonic():
+            self._entradas.pop(clave, None)
+            self.fallos += 1
+            return None
+        
+        self._entradas.move_to_end(clave)
+        self.aciertos += 1
+        return entrada.valor
+    
+    def guardar(
+        self,
+        clave: Hashable,
+        valor: Any,
+        lote_id: Optional[UUID | str] = None,
+        meses: Optional[Iterable[tuple[int, int]]] = None
+    ) -> None:
+        """Guarda un resultado; si se supera el tamaño sale el menos usado"""
+        self._entradas[clave] = EntradaCache(
+            valor=valor,
+            expira=time.monotonic() + self.ttl_segundos,
+            lote_id=str(lote_id) if lote_id is not None else None,
+            meses=frozenset(meses) if meses is not None else None
+        )
+        self._entradas.move_to_end(clave)
+        
+        while len(self._entradas) > self.max_entradas:
+            self._entradas.popitem(last=False)
+    
+    def _eliminar_si(self, condicion) -> None:
+        for clave in [c for c, e in self._entradas.items() if condicion(e)]:
+            del self._entradas[clave]
+    
+    def invalidar_lote(self, lote_id: UUID | str) -> None:
+        """Cambió un registro propio del lote (consumo, gastos directos, mortalidad, cosechas)"""
+        lote_id = str(lote_id)
+        self._eliminar_si(lambda e: e.lote_id is None or e.lote_id == lote_id)
+    
+    def invalidar_meses(self, meses: Iterable[tuple[int, int]]) -> None:
+        """Cambió algo que se prorratea en esos meses: afecta a todos los lotes activos en ellos"""
+        meses = frozenset(meses)
+        self._eliminar_si(lambda e: e.meses is None or not e.meses.isdisjoint(meses))
+    
+    def invalidar_ocupacion(self, lote: dict, hasta_hoy: bool = False) -> None:
+        """
+        Cambiaron las fechas o corrales de un lote: cambia su propio reporte y
+        el reparto de gastos de los demás lotes activos en sus meses.
+        
+        Si la fecha de cierre pudo moverse hacia atrás, hasta_hoy=True cubre
+        también los meses que el lote dejó de ocupar.
+        """
+        self.invalidar_lote(lote["id"])
+        self.invalidar_meses(meses_de_lote(lote, hasta_hoy))
+    
+    def limpiar(self) -> None:
+        self._entradas.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+
+# Instancia única del proceso
+cache_reportes = CacheReportes(
+    max_entradas=settings.reportes_cache_max_entradas,
+    ttl_segundos=settings.reportes_cache_ttl_segundos
+)
@@ -5,43 +5,87 @@ Servicio de cálculo de costos y prorrateo.
 Implementa toda la lógica de negocio para calcular costos por lote.
 """
 
-from uuid import UUID
+import asyncio
+from calendar import monthrange
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional
-from app.database import supabase_client
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from app.database import db, leer_por_bloques
+from app.services.contexto_calculo import ContextoCalculo
+from app.services.indice_ocupacion import IndiceOcupacion
+from app.services.pool_calculo import pool_calculo
+
+# Escala de porcentajes, conversión alimenticia y montos exportados
+CENTESIMAS = Decimal("0.01")
+
+# Columnas que identifican cada fila de las vistas por lote de migrations/002:
+# ordenan la lectura por bloques
+LLAVES_VISTAS = {
+    "consumo_por_lote_mes": ("lote_id", "mes", "tipo"),
+    "gastos_directos_por_lote_mes": ("lote_id", "mes", "tipo"),
+    "mortalidad_por_lote": ("lote_id",),
+    "cosechas_por_lote": ("lote_id",),
+}
+
+
+@dataclass(frozen=True)
+class FilasCalculo:
+    """
+    Filas ya consultadas que necesita la etapa de cálculo, sin nada de I/O.
+    
+    Se copian tal cual a los procesos del pool de cálculo. consumo, gastos
+    directos, mortalidad y cosechas traen lote_id: pueden ser de un lote o de
+    varios.
+    """
+    lotes: list[dict]              # Todos los lotes (el prorrateo los necesita)
+    asignaciones: list[dict]       # lotes_corrales con corrales(area_m2)
+    gastos_mensuales: list[dict]
+    consumo: list[dict]            # consumo_por_lote_mes
+    gastos_directos: list[dict]    # gastos_directos_por_lote_mes
+    mortalidad: list[dict] = field(default_factory=list)  # mortalidad_por_lote
+    cosechas: list[dict] = field(default_factory=list)    # cosechas_por_lote
 
 
 class CalculoCostosService:
-    """Servicio para cálculos de costos y prorrateo"""
+    """
+    Servicio para cálculos de costos y prorrateo.
+    
+    Los métodos públicos reciben un ContextoCalculo opcional; si se comparte
+    entre varios cálculos de la misma petición, cada tabla se consulta una vez.
+    """
     
     @staticmethod
-    def obtener_area_lote(lote_id: UUID) -> Decimal:
+    async def obtener_area_lote(
+        lote_id: UUID,
+        ctx: Optional[ContextoCalculo] = None,
+        fecha: Optional[date] = None
+    ) -> Decimal:
         """
-        Obtiene el área total ocupada por un lote.
+        Obtiene el área total ocupada por un lote en una fecha.
         
         Args:
             lote_id: ID del lote
-            
+            ctx: Contexto de la petición
+            fecha: Fecha de consulta (por defecto hoy)
+        
         Returns:
             Área total en m²
         """
-        response = supabase_client.table("lotes_corrales")\
-            .select("*, corrales(area_m2)")\
-            .eq("lote_id", str(lote_id))\
-            .is_("fecha_liberacion", "null")\
-            .execute()
-        
-        area_total = sum(
-            Decimal(str(item["corrales"]["area_m2"])) 
-            for item in response.data 
-            if item.get("corrales")
-        )
+        ctx = ctx or ContextoCalculo()
+        indice = await ctx.indice_ocupacion()
         
-        return area_total
+        return indice.area_en(lote_id, fecha or date.today())
     
     @staticmethod
-    def obtener_dias_activos_en_mes(lote_id: UUID, anio: int, mes: int) -> int:
+    async def obtener_dias_activos_en_mes(
+        lote_id: UUID,
+        anio: int,
+        mes: int,
+        ctx: Optional[ContextoCalculo] = None
+    ) -> int:
         """
         Calcula cuántos días estuvo activo un lote en un mes específico.
         
@@ -49,29 +93,36 @@ class CalculoCostosService:
             lote_id: ID del lote
             anio: Año
             mes: Mes (1-12)
-            
+            ctx: Contexto de la petición
+        
         Returns:
             Número de días activos en ese mes
         """
-        # Obtener información del lote
-        lote_response = supabase_client.table("lotes")\
-            .select("fecha_inicio, fecha_cierre")\
-            .eq("id", str(lote_id))\
-            .execute()
+        ctx = ctx or ContextoCalculo()
+        lote = await ctx.lote(lote_id)
         
-        if not lote_response.data:
+        if not lote:
             return 0
         
-        lote = lote_response.data[0]
+        return CalculoCostosService._dias_activos(lote, anio, mes)
+    
+    @staticmethod
+    def _parsear_fechas_lote(lote: dict) -> tuple[date, date]:
+        """Retorna (fecha_inicio, fecha_cierre) del lote; un lote abierto cierra hoy"""
         fecha_inicio = datetime.strptime(lote["fecha_inicio"], "%Y-%m-%d").date()
         fecha_cierre = (
             datetime.strptime(lote["fecha_cierre"], "%Y-%m-%d").date()
             if lote["fecha_cierre"]
             else date.today()
         )
+        return fecha_inicio, fecha_cierre
+    
+    @staticmethod
+    def _periodo_activo_en_mes(lote: dict, anio: int, mes: int) -> Optional[tuple[date, date]]:
+        """Primer y último día de un mes en los que el lote estuvo activo, o None"""
+        fecha_inicio, fecha_cierre = CalculoCostosService._parsear_fechas_lote(lote)
         
         # Calcular primer y último día del mes
-        from calendar import monthrange
         primer_dia_mes = date(anio, mes, 1)
         ultimo_dia_mes = date(anio, mes, monthrange(anio, mes)[1])
         
@@ -80,61 +131,90 @@ class CalculoCostosService:
         fin_periodo = min(fecha_cierre, ultimo_dia_mes)
         
         if inicio_periodo > fin_periodo:
+            return None
+        
+        return inicio_periodo, fin_periodo
+    
+    @staticmethod
+    def _dias_activos(lote: dict, anio: int, mes: int) -> int:
+        """Días de un mes en los que el lote (fila de `lotes`) estuvo activo"""
+        periodo = CalculoCostosService._periodo_activo_en_mes(lote, anio, mes)
+        
+        if periodo is None:
             return 0
         
-        dias_activos = (fin_periodo - inicio_periodo).days + 1
-        return dias_activos
+        return (periodo[1] - periodo[0]).days + 1
+    
+    @staticmethod
+    def _meses_periodo(fecha_inicio: date, fecha_fin: date) -> list[tuple[int, int]]:
+        """Lista de (anio, mes) entre dos fechas, ambos meses incluidos"""
+        meses = []
+        fecha_actual = date(fecha_inicio.year, fecha_inicio.month, 1)
+        fecha_limite = date(fecha_fin.year, fecha_fin.month, 1)
+        
+        while fecha_actual <= fecha_limite:
+            meses.append((fecha_actual.year, fecha_actual.month))
+            
+            # Avanzar al siguiente mes
+            if fecha_actual.month == 12:
+                fecha_actual = date(fecha_actual.year + 1, 1, 1)
+            else:
+                fecha_actual = date(fecha_actual.year, fecha_actual.month + 1, 1)
+        
+        return meses
     
     @staticmethod
-    def calcular_costo_lechones(lote_id: UUID) -> Decimal:
+    async def calcular_costo_lechones(
+        lote_id: UUID, ctx: Optional[ContextoCalculo] = None
+    ) -> Decimal:
         """Obtiene el costo de compra de lechones"""
-        response = supabase_client.table("lotes")\
-            .select("costo_lechones")\
-            .eq("id", str(lote_id))\
-            .execute()
+        ctx = ctx or ContextoCalculo()
+        lote = await ctx.lote(lote_id)
         
-        if not response.data:
+        if not lote:
             return Decimal(0)
         
-        return Decimal(str(response.data[0]["costo_lechones"]))
+        return Decimal(str(lote["costo_lechones"]))
     
     @staticmethod
-    def calcular_costo_alimento(lote_id: UUID) -> dict:
+    async def calcular_costo_alimento(
+        lote_id: UUID, ctx: Optional[ContextoCalculo] = None
+    ) -> dict:
         """
         Calcula el costo total de alimento consumido por un lote.
         
         Returns:
             Dict con costo_total, kg_total, detalle por tipo
         """
-        # Obtener consumo con información del alimento
-        response = supabase_client.table("consumo_alimento")\
-            .select("*, alimentos(nombre, tipo, costo_por_bulto, peso_bulto_kg)")\
-            .eq("lote_id", str(lote_id))\
-            .execute()
+        ctx = ctx or ContextoCalculo()
+        
+        # Consumo con información del alimento
+        consumos = await ctx.consumo(lote_id)
         
+        return CalculoCostosService._resumir_consumo(consumos)
+    
+    @staticmethod
+    def _resumir_consumo(consumos: list[dict]) -> dict:
+        """Suma costo, kg y bultos de filas de la vista consumo_por_lote_mes"""
         costo_total = Decimal(0)
         kg_total = Decimal(0)
         detalle = {}
         
-        for consumo in response.data:
-            alimento = consumo["alimentos"]
-            cantidad_bultos = Decimal(str(consumo["cantidad_bultos"]))
-            costo_bulto = Decimal(str(alimento["costo_por_bulto"]))
-            peso_bulto = Decimal(str(alimento["peso_bulto_kg"]))
-            
-            costo = cantidad_bultos * costo_bulto
-            kg = cantidad_bultos * peso_bulto
+        for consumo in consumos:
+            costo = Decimal(str(consumo["costo"]))
+            kg = Decimal(str(consumo["kg"]))
+            bultos = Decimal(str(consumo["bultos"]))
             
             costo_total += costo
             kg_total += kg
             
-            tipo = alimento["tipo"]
+            tipo = consumo["tipo"]
             if tipo not in detalle:
                 detalle[tipo] = {"costo": Decimal(0), "kg": Decimal(0), "bultos": Decimal(0)}
             
             detalle[tipo]["costo"] += costo
             detalle[tipo]["kg"] += kg
-            detalle[tipo]["bultos"] += cantidad_bultos
+            detalle[tipo]["bultos"] += bultos
         
         return {
             "costo_total": costo_total,
@@ -143,22 +223,27 @@ class CalculoCostosService:
         }
     
     @staticmethod
-    def calcular_gastos_directos(lote_id: UUID) -> dict:
+    async def calcular_gastos_directos(
+        lote_id: UUID, ctx: Optional[ContextoCalculo] = None
+    ) -> dict:
         """
         Calcula todos los gastos directos de un lote.
         
         Returns:
             Dict con total y detalle por tipo
         """
-        response = supabase_client.table("gastos_directos")\
-            .select("*")\
-            .eq("lote_id", str(lote_id))\
-            .execute()
+        ctx = ctx or ContextoCalculo()
+        gastos = await ctx.gastos_directos(lote_id)
         
+        return CalculoCostosService._resumir_gastos_directos(gastos)
+    
+    @staticmethod
+    def _resumir_gastos_directos(gastos: list[dict]) -> dict:
+        """Suma filas de gastos_directos_por_lote_mes, en total y por tipo"""
         total = Decimal(0)
         detalle = {}
         
-        for gasto in response.data:
+        for gasto in gastos:
             tipo = gasto["tipo"]
             monto = Decimal(str(gasto["monto"]))
             
@@ -174,62 +259,24 @@ class CalculoCostosService:
         }
     
     @staticmethod
-    def prorratear_gastos_mensuales(lote_id: UUID, anio: int, mes: int) -> dict:
+    def _distribuir_gastos_mes(
+        area_lote: Decimal,
+        dias_lote: int,
+        dias_mes: int,
+        suma_areas_activas: Decimal,
+        gastos: list[dict]
+    ) -> dict:
         """
-        Calcula el prorrateo de gastos mensuales para un lote específico.
+        Reparte los gastos de un mes entre el lote según su área y días activos.
         
         Aplica las fórmulas:
         - Arriendo: (Área Lote / Área Total) × (Días Lote / Días Mes) × Monto
         - Otros: (Área Lote / Suma Áreas Activas) × Monto
-        
-        Args:
-            lote_id: ID del lote
-            anio: Año
-            mes: Mes (1-12)
-            
-        Returns:
-            Dict con total prorrateado y detalle por concepto
         """
-        # Obtener área del lote
-        area_lote = CalculoCostosService.obtener_area_lote(lote_id)
-        
-        if area_lote == 0:
-            return {"total": Decimal(0), "detalle": {}}
-        
-        # Obtener días activos del lote en el mes
-        dias_lote = CalculoCostosService.obtener_dias_activos_en_mes(lote_id, anio, mes)
-        
-        if dias_lote == 0:
-            return {"total": Decimal(0), "detalle": {}}
-        
-        # Obtener días del mes
-        from calendar import monthrange
-        dias_mes = monthrange(anio, mes)[1]
-        
-        # Obtener todos los lotes activos en ese mes
-        lotes_activos = supabase_client.table("lotes")\
-            .select("id, fecha_inicio, fecha_cierre")\
-            .or_(f"fecha_cierre.is.null,fecha_cierre.gte.{anio}-{mes:02d}-01")\
-            .lte("fecha_inicio", f"{anio}-{mes:02d}-{dias_mes}")\
-            .execute()
-        
-        # Calcular suma de áreas de lotes activos
-        suma_areas_activas = Decimal(0)
-        for lote in lotes_activos.data:
-            area = CalculoCostosService.obtener_area_lote(UUID(lote["id"]))
-            suma_areas_activas += area
-        
-        # Obtener gastos del mes
-        gastos_response = supabase_client.table("gastos_mensuales")\
-            .select("*")\
-            .eq("anio", anio)\
-            .eq("mes", mes)\
-            .execute()
-        
         total_prorrateado = Decimal(0)
         detalle = {}
         
-        for gasto in gastos_response.data:
+        for gasto in gastos:
             tipo = gasto["tipo"]
             monto = Decimal(str(gasto["monto"]))
             
@@ -263,65 +310,318 @@ class CalculoCostosService:
         }
     
     @staticmethod
-    def calcular_costo_total_lote(lote_id: UUID) -> dict:
+    async def prorratear_gastos_mensuales(
+        lote_id: UUID,
+        anio: int,
+        mes: int,
+        ctx: Optional[ContextoCalculo] = None
+    ) -> dict:
+        """
+        Calcula el prorrateo de gastos mensuales para un lote específico.
+        
+        Aplica las fórmulas:
+        - Arriendo: (Área Lote / Área Total) × (Días Lote / Días Mes) × Monto
+        - Otros: (Área Lote / Suma Áreas Activas) × Monto
+        
+        Args:
+            lote_id: ID del lote
+            anio: Año
+            mes: Mes (1-12)
+            ctx: Contexto de la petición
+        
+        Returns:
+            Dict con total prorrateado y detalle por concepto
+        """
+        mes_inicial = date(anio, mes, 1)
+        prorrateo = await CalculoCostosService.prorratear_gastos_periodo(
+            lote_id, mes_inicial, mes_inicial, ctx
+        )
+        
+        return prorrateo[f"{anio}-{mes:02d}"]
+    
+    @staticmethod
+    async def prorratear_gastos_periodo(
+        lote_id: UUID,
+        fecha_inicio: date,
+        fecha_fin: date,
+        ctx: Optional[ContextoCalculo] = None
+    ) -> dict:
+        """
+        Calcula el prorrateo de gastos mensuales de un lote para todos los meses
+        entre fecha_inicio y fecha_fin.
+        
+        Carga `lotes`, `lotes_corrales` + `corrales` y `gastos_mensuales` una sola
+        vez para todo el período y reparte cada mes en memoria, de modo que el
+        número de consultas no depende de la cantidad de meses ni de lotes.
+        
+        El área de cada lote en cada mes sale del índice histórico de ocupación,
+        así un lote cerrado conserva el área que tuvo mientras estuvo activo.
+        
+        Args:
+            lote_id: ID del lote
+            fecha_inicio: Fecha inicial del período
+            fecha_fin: Fecha final del período
+            ctx: Contexto de la petición
+        
+        Returns:
+            Dict {"AAAA-MM": prorrateo} con el mismo formato de prorratear_gastos_mensuales
+        """
+        ctx = ctx or ContextoCalculo()
+        meses = CalculoCostosService._meses_periodo(fecha_inicio, fecha_fin)
+        
+        if not meses:
+            return {}
+        
+        lotes, indice, gastos_por_mes = await CalculoCostosService._cargar_datos_prorrateo(
+            ctx, meses[0][0], meses[-1][0]
+        )
+        lote = next((otro for otro in lotes if otro["id"] == str(lote_id)), None)
+        
+        return CalculoCostosService._prorratear_meses(
+            lote, meses, lotes, indice, gastos_por_mes
+        )
+    
+    @staticmethod
+    async def _cargar_datos_prorrateo(
+        ctx: ContextoCalculo,
+        anio_inicial: int,
+        anio_final: int
+    ) -> tuple[list[dict], IndiceOcupacion, dict[tuple[int, int], list[dict]]]:
+        """
+        Carga de una vez todo lo que necesita el prorrateo entre dos años.
+        
+        Returns:
+            (lotes, índice de ocupación, gastos por (anio, mes))
+        """
+        lotes, indice, gastos = await asyncio.gather(
+            ctx.lotes(),
+            ctx.indice_ocupacion(),
+            ctx.gastos_mensuales(anio_inicial, anio_final),
+        )
+        
+        return lotes, indice, CalculoCostosService._agrupar_gastos_mensuales(gastos)
+    
+    @staticmethod
+    def _agrupar_gastos_mensuales(gastos: list[dict]) -> dict[tuple[int, int], list[dict]]:
+        """Filas de gastos_mensuales agrupadas por (anio, mes)"""
+        gastos_por_mes: dict[tuple[int, int], list[dict]] = {}
+        for gasto in gastos:
+            gastos_por_mes.setdefault((gasto["anio"], gasto["mes"]), []).append(gasto)
+        return gastos_por_mes
+    
+    @staticmethod
+    def _prorratear_meses(
+        lote: Optional[dict],
+        meses: list[tuple[int, int]],
+        lotes: list[dict],
+        indice: IndiceOcupacion,
+        gastos_por_mes: dict[tuple[int, int], list[dict]]
+    ) -> dict:
+        """
+        Prorrateo de cada mes de `meses` para un lote, en memoria.
+        
+        El área de un lote en un mes es el promedio de lo que ocupó en sus días
+        activos de ese mes; si no cambió de corrales coincide con su área fija.
+        """
+        resultado = {}
+        for anio, mes in meses:
+            mes_key = f"{anio}-{mes:02d}"
+            periodo = CalculoCostosService._periodo_activo_en_mes(lote, anio, mes) if lote else None
+            area_lote = indice.area_promedio(lote["id"], *periodo) if periodo else Decimal(0)
+            
+            if area_lote == 0:
+                resultado[mes_key] = {"total": Decimal(0), "detalle": {}}
+                continue
+            
+            dias_lote = (periodo[1] - periodo[0]).days + 1
+            dias_mes = monthrange(anio, mes)[1]
+            
+            # Área de todos los lotes activos en el mes, cada uno con su ocupación de ese mes
+            suma_areas_activas = Decimal(0)
+            for otro in lotes:
+                periodo_otro = CalculoCostosService._periodo_activo_en_mes(otro, anio, mes)
+                if periodo_otro:
+                    suma_areas_activas += indice.area_promedio(otro["id"], *periodo_otro)
+            
+            resultado[mes_key] = CalculoCostosService._distribuir_gastos_mes(
+                area_lote,
+                dias_lote,
+                dias_mes,
+                suma_areas_activas,
+                gastos_por_mes.get((anio, mes), [])
+            )
+        
+        return resultado
+    
+    @staticmethod
+    async def prorratear_mes_granja(
+        anio: int,
+        mes: int,
+        ctx: Optional[ContextoCalculo] = None
+    ) -> dict:
+        """
+        Reparte los gastos mensuales de un mes entre todos los lotes activos.
+        
+        Las área-días de todos los lotes salen de un solo barrido sobre las
+        asignaciones, en lugar de repetir el prorrateo lote por lote. Cada lote
+        queda con el mismo formato y valores de prorratear_gastos_mensuales.
+        
+        Args:
+            anio: Año
+            mes: Mes (1-12)
+            ctx: Contexto de la petición
+        
+        Returns:
+            Dict con el total de gastos del mes, el total repartido y el prorrateo por lote_id
+        """
+        ctx = ctx or ContextoCalculo()
+        lotes, indice, gastos_por_mes = await CalculoCostosService._cargar_datos_prorrateo(
+            ctx, anio, anio
+        )
+        gastos = gastos_por_mes.get((anio, mes), [])
+        dias_mes = monthrange(anio, mes)[1]
+        
+        periodos = {}
+        for lote in lotes:
+            periodo = CalculoCostosService._periodo_activo_en_mes(lote, anio, mes)
+            if periodo:
+                periodos[lote["id"]] = periodo
+        
+        area_dias = indice.area_dias_por_lote(periodos)
+        
+        # Área promedio de cada lote en sus días activos del mes
+        areas = {
+            lote_id: area_dias[lote_id] / ((fin - inicio).days + 1)
+            for lote_id, (inicio, fin) in periodos.items()
+        }
+        suma_areas_activas = sum(areas.values(), Decimal(0))
+        
+        prorrateo_lotes = {}
+        for lote_id, (inicio, fin) in periodos.items():
+            if areas[lote_id] == 0:
+                prorrateo_lotes[lote_id] = {"total": Decimal(0), "detalle": {}}
+                continue
+            
+            prorrateo_lotes[lote_id] = CalculoCostosService._distribuir_gastos_mes(
+                areas[lote_id],
+                (fin - inicio).days + 1,
+                dias_mes,
+                suma_areas_activas,
+                gastos
+            )
+        
+        return {
+            "anio": anio,
+            "mes": mes,
+            "total_gastos": sum((Decimal(str(g["monto"])) for g in gastos), Decimal(0)),
+            "total_prorrateado": sum((p["total"] for p in prorrateo_lotes.values()), Decimal(0)),
+            "lotes": prorrateo_lotes
+        }
+    
+    @staticmethod
+    async def calcular_costo_total_lote(
+        lote_id: UUID, ctx: Optional[ContextoCalculo] = None
+    ) -> dict:
         """
         Calcula el costo total de un lote sumando todos los conceptos.
         
         Returns:
             Dict completo con todos los costos y subtotales
         """
+        ctx = ctx or ContextoCalculo()
+        
         # Obtener información del lote
-        lote_response = supabase_client.table("lotes")\
-            .select("*, fecha_inicio, fecha_cierre")\
-            .eq("id", str(lote_id))\
-            .execute()
+        lote = await ctx.lote(lote_id)
         
-        if not lote_response.data:
+        if not lote:
             raise ValueError(f"Lote {lote_id} no encontrado")
         
-        lote = lote_response.data[0]
-        fecha_inicio = datetime.strptime(lote["fecha_inicio"], "%Y-%m-%d").date()
-        fecha_cierre = (
-            datetime.strptime(lote["fecha_cierre"], "%Y-%m-%d").date()
-            if lote["fecha_cierre"]
-            else date.today()
-        )
-        
-        # Costo de lechones
-        costo_lechones = CalculoCostosService.calcular_costo_lechones(lote_id)
+        filas = await CalculoCostosService._cargar_filas_lote(lote, ctx)
         
-        # Costo de alimento
-        alimento_info = CalculoCostosService.calcular_costo_alimento(lote_id)
-        costo_alimento = alimento_info["costo_total"]
+        return await pool_calculo.ejecutar(
+            CalculoCostosService._trabajo([lote], filas),
+            CalculoCostosService.costo_total_de_filas,
+            lote,
+            filas
+        )
+    
+    @staticmethod
+    async def _cargar_filas_lote(
+        lote: dict,
+        ctx: ContextoCalculo,
+        con_indicadores: bool = False
+    ) -> FilasCalculo:
+        """
+        Carga en paralelo las filas de un lote para su costo total y, con
+        `con_indicadores`, también mortalidad y cosechas.
+        """
+        fecha_inicio, fecha_cierre = CalculoCostosService._parsear_fechas_lote(lote)
+        lote_id = lote["id"]
         
-        # Gastos directos
-        gastos_directos_info = CalculoCostosService.calcular_gastos_directos(lote_id)
-        costo_gastos_directos = gastos_directos_info["total"]
+        cargas = [
+            ctx.lotes(),
+            ctx.asignaciones(),
+            ctx.gastos_mensuales(fecha_inicio.year, fecha_cierre.year),
+            ctx.consumo(lote_id),
+            ctx.gastos_directos(lote_id),
+        ]
+        if con_indicadores:
+            cargas += [ctx.mortalidad(lote_id), ctx.cosechas(lote_id)]
         
-        # Prorrateo de gastos mensuales
-        # Iterar por cada mes entre fecha_inicio y fecha_cierre
-        gastos_prorrateados_total = Decimal(0)
-        gastos_prorrateados_detalle = {}
+        return FilasCalculo(*await asyncio.gather(*cargas))
+    
+    @staticmethod
+    def _trabajo(lotes: list[dict], filas: FilasCalculo) -> int:
+        """
+        Estimación del costo de calcular `lotes`, para decidir si va al pool.
         
-        fecha_actual = date(fecha_inicio.year, fecha_inicio.month, 1)
-        fecha_fin = date(fecha_cierre.year, fecha_cierre.month, 1)
+        El prorrateo recorre, por cada mes de cada lote, todos los lotes de la
+        granja; el resto es una pasada por las filas.
+        """
+        meses = 0
+        for lote in lotes:
+            inicio, cierre = CalculoCostosService._parsear_fechas_lote(lote)
+            meses += (cierre.year - inicio.year) * 12 + cierre.month - inicio.month + 1
         
-        while fecha_actual <= fecha_fin:
-            prorrateo = CalculoCostosService.prorratear_gastos_mensuales(
-                lote_id, 
-                fecha_actual.year, 
-                fecha_actual.month
+        return meses * len(filas.lotes) + sum(
+            len(f) for f in (filas.consumo, filas.gastos_directos, filas.mortalidad, filas.cosechas)
+        )
+    
+    @staticmethod
+    def costo_total_de_filas(lote: dict, filas: FilasCalculo) -> dict:
+        """
+        Etapa de cálculo de calcular_costo_total_lote: solo las filas del lote,
+        sin consultas. Corre en el event loop o en el pool de cálculo.
+        """
+        return CalculoCostosService._armar_costo_total(
+            lote,
+            Decimal(str(lote["costo_lechones"])),
+            CalculoCostosService._resumir_consumo(filas.consumo),
+            CalculoCostosService._resumir_gastos_directos(filas.gastos_directos),
+            CalculoCostosService._prorratear_meses(
+                lote,
+                CalculoCostosService._meses_periodo(*CalculoCostosService._parsear_fechas_lote(lote)),
+                filas.lotes,
+                IndiceOcupacion(filas.asignaciones),
+                CalculoCostosService._agrupar_gastos_mensuales(filas.gastos_mensuales)
             )
-            gastos_prorrateados_total += prorrateo["total"]
-            
-            mes_key = f"{fecha_actual.year}-{fecha_actual.month:02d}"
-            gastos_prorrateados_detalle[mes_key] = prorrateo
-            
-            # Avanzar al siguiente mes
-            if fecha_actual.month == 12:
-                fecha_actual = date(fecha_actual.year + 1, 1, 1)
-            else:
-                fecha_actual = date(fecha_actual.year, fecha_actual.month + 1, 1)
+        )
+    
+    @staticmethod
+    def _armar_costo_total(
+        lote: dict,
+        costo_lechones: Decimal,
+        alimento_info: dict,
+        gastos_directos_info: dict,
+        gastos_prorrateados_detalle: dict
+    ) -> dict:
+        """Suma los conceptos de costo ya calculados de un lote"""
+        costo_alimento = alimento_info["costo_total"]
+        costo_gastos_directos = gastos_directos_info["total"]
+        gastos_prorrateados_total = sum(
+            (prorrateo["total"] for prorrateo in gastos_prorrateados_detalle.values()),
+            Decimal(0)
+        )
         
         # Costo total
         costo_total = (
@@ -332,7 +632,7 @@ class CalculoCostosService:
         )
         
         return {
-            "lote_id": str(lote_id),
+            "lote_id": str(lote["id"]),
             "numero_lote": lote["numero_lote"],
             "fecha_inicio": lote["fecha_inicio"],
             "fecha_cierre": lote["fecha_cierre"],
@@ -349,84 +649,425 @@ class CalculoCostosService:
         }
     
     @staticmethod
-    def calcular_indicadores_eficiencia(lote_id: UUID) -> dict:
+    async def calcular_indicadores_eficiencia(
+        lote_id: UUID,
+        ctx: Optional[ContextoCalculo] = None
+    ) -> dict:
         """
         Calcula indicadores de eficiencia del lote.
         
         Returns:
             Dict con todos los indicadores
         """
+        ctx = ctx or ContextoCalculo()
+        
         # Obtener información del lote
-        lote_response = supabase_client.table("lotes")\
-            .select("*")\
-            .eq("id", str(lote_id))\
-            .execute()
+        lote = await ctx.lote(lote_id)
         
-        if not lote_response.data:
+        if not lote:
             raise ValueError(f"Lote {lote_id} no encontrado")
         
-        lote = lote_response.data[0]
+        filas = await CalculoCostosService._cargar_filas_lote(lote, ctx, con_indicadores=True)
+        
+        return await pool_calculo.ejecutar(
+            CalculoCostosService._trabajo([lote], filas),
+            CalculoCostosService.indicadores_de_filas,
+            lote,
+            filas
+        )
+    
+    @staticmethod
+    def indicadores_de_filas(lote: dict, filas: FilasCalculo) -> dict:
+        """Etapa de cálculo de calcular_indicadores_eficiencia, sin consultas"""
+        costo_info = CalculoCostosService.costo_total_de_filas(lote, filas)
+        
+        return CalculoCostosService._armar_indicadores(
+            lote,
+            filas.mortalidad,
+            filas.cosechas,
+            costo_info["detalle_alimento"],
+            costo_info["costo_total"]
+        )
+    
+    @staticmethod
+    def _armar_indicadores(
+        lote: dict,
+        mortalidades: list[dict],
+        cosechas: list[dict],
+        alimento_info: dict,
+        costo_total: Decimal
+    ) -> dict:
+        """Indicadores de eficiencia a partir de las filas ya cargadas del lote"""
         animales_iniciales = lote["animales_iniciales"]
         peso_inicial_promedio = Decimal(str(lote["peso_promedio_inicial"]))
         
         # Mortalidad
-        mortalidad_response = supabase_client.table("mortalidad")\
-            .select("cantidad")\
-            .eq("lote_id", str(lote_id))\
-            .execute()
-        
-        total_mortalidad = sum(m["cantidad"] for m in mortalidad_response.data)
-        porcentaje_mortalidad = (total_mortalidad / animales_iniciales * 100) if animales_iniciales > 0 else 0
+        total_mortalidad = sum(m["cantidad"] for m in mortalidades)
+        porcentaje_mortalidad = (
+            Decimal(total_mortalidad) * 100 / animales_iniciales
+            if animales_iniciales > 0 else Decimal(0)
+        )
         
         # Cosechas
-        cosechas_response = supabase_client.table("cosechas")\
-            .select("cantidad_animales, peso_total_kg")\
-            .eq("lote_id", str(lote_id))\
-            .execute()
-        
-        total_vendidos = sum(c["cantidad_animales"] for c in cosechas_response.data)
-        peso_total_vendido = sum(Decimal(str(c["peso_total_kg"])) for c in cosechas_response.data)
+        total_vendidos = sum(c["cantidad_animales"] for c in cosechas)
+        peso_total_vendido = sum((Decimal(str(c["peso_total_kg"])) for c in cosechas), Decimal(0))
         
-        peso_promedio_venta = (peso_total_vendido / total_vendidos) if total_vendidos > 0 else 0
+        peso_promedio_venta = (
+            peso_total_vendido / total_vendidos if total_vendidos > 0 else Decimal(0)
+        )
         ganancia_peso_promedio = peso_promedio_venta - peso_inicial_promedio
         
         # Alimento
-        alimento_info = CalculoCostosService.calcular_costo_alimento(lote_id)
         kg_alimento_total = alimento_info["kg_total"]
         
         # Conversión alimenticia = kg alimento / kg ganancia de peso
         kg_ganancia_total = total_vendidos * ganancia_peso_promedio
-        conversion_alimenticia = (kg_alimento_total / kg_ganancia_total) if kg_ganancia_total > 0 else 0
+        conversion_alimenticia = (
+            kg_alimento_total / kg_ganancia_total if kg_ganancia_total > 0 else Decimal(0)
+        )
         
         # Costos
-        costo_info = CalculoCostosService.calcular_costo_total_lote(lote_id)
-        costo_total = costo_info["costo_total"]
-        
-        costo_por_animal = (costo_total / total_vendidos) if total_vendidos > 0 else 0
-        costo_por_kg = (costo_total / peso_total_vendido) if peso_total_vendido > 0 else 0
+        costo_por_animal = (costo_total / total_vendidos) if total_vendidos > 0 else Decimal(0)
+        costo_por_kg = (costo_total / peso_total_vendido) if peso_total_vendido > 0 else Decimal(0)
         
+        # Decimal de punta a punta: la serialización decide la escala, no float()
         return {
-            "lote_id": str(lote_id),
+            "lote_id": str(lote["id"]),
             "numero_lote": lote["numero_lote"],
             "animales": {
                 "iniciales": animales_iniciales,
                 "mortalidad": total_mortalidad,
                 "vendidos": total_vendidos,
-                "porcentaje_mortalidad": round(float(porcentaje_mortalidad), 2)
+                "porcentaje_mortalidad": porcentaje_mortalidad.quantize(CENTESIMAS)
             },
             "pesos": {
-                "inicial_promedio_kg": float(peso_inicial_promedio),
-                "final_promedio_kg": float(peso_promedio_venta),
-                "ganancia_promedio_kg": float(ganancia_peso_promedio),
-                "total_vendido_kg": float(peso_total_vendido)
+                "inicial_promedio_kg": peso_inicial_promedio,
+                "final_promedio_kg": peso_promedio_venta,
+                "ganancia_promedio_kg": ganancia_peso_promedio,
+                "total_vendido_kg": peso_total_vendido
             },
             "alimento": {
-                "total_consumido_kg": float(kg_alimento_total),
-                "conversion_alimenticia": round(float(conversion_alimenticia), 2)
+                "total_consumido_kg": kg_alimento_total,
+                "conversion_alimenticia": conversion_alimenticia.quantize(CENTESIMAS)
             },
             "costos": {
-                "costo_total": float(costo_total),
-                "costo_por_animal": float(costo_por_animal),
-                "costo_por_kg_producido": float(costo_por_kg)
+                "costo_total": costo_total,
+                "costo_por_animal": costo_por_animal,
+                "costo_por_kg_producido": costo_por_kg
             }
-        }
\ No newline at end of file
+        }
+    
+    @staticmethod
+    async def calcular_resumen_granja(
+        estado: Optional[str] = None,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None,
+        ctx: Optional[ContextoCalculo] = None
+    ) -> dict:
+        """
+        Calcula costos e indicadores de todos los lotes en una sola pasada.
+        
+        En lugar de repetir por cada lote las consultas de calcular_costo_total_lote
+        y calcular_indicadores_eficiencia, carga cada tabla una vez para todos
+        los lotes y agrupa las filas por lote_id en memoria (resumen_de_filas,
+        en el pool de cálculo si la granja es grande).
+        
+        Args:
+            estado: Filtrar por estado del lote ('activo' / 'cerrado')
+            fecha_desde: Solo lotes activos en o después de esta fecha
+            fecha_hasta: Solo lotes iniciados en o antes de esta fecha
+            ctx: Contexto de la petición
+        
+        Returns:
+            Dict con el resumen de cada lote y los totales de la granja
+        """
+        ctx = ctx or ContextoCalculo()
+        todos_los_lotes = await ctx.lotes()
+        
+        # Filtrar en memoria; el prorrateo necesita igual todos los lotes
+        lotes = CalculoCostosService._filtrar_lotes(
+            todos_los_lotes, estado, fecha_desde, fecha_hasta
+        )
+        
+        if not lotes:
+            return {"lotes": [], "totales": CalculoCostosService._totalizar_resumen([])}
+        
+        filas = await CalculoCostosService._cargar_datos_resumen(ctx, lotes, todos_los_lotes)
+        
+        return await pool_calculo.ejecutar(
+            CalculoCostosService._trabajo(lotes, filas),
+            CalculoCostosService.resumen_de_filas,
+            lotes,
+            filas
+        )
+    
+    @staticmethod
+    def resumen_de_filas(lotes: list[dict], filas: FilasCalculo) -> dict:
+        """
+        Etapa de cálculo de calcular_resumen_granja: costos e indicadores de
+        `lotes` a partir de las filas de todos ellos, sin consultas.
+        """
+        indice = IndiceOcupacion(filas.asignaciones)
+        gastos_por_mes = CalculoCostosService._agrupar_gastos_mensuales(filas.gastos_mensuales)
+        
+        def agrupar(registros: list[dict]) -> dict[str, list[dict]]:
+            grupos: dict[str, list[dict]] = {}
+            for fila in registros:
+                grupos.setdefault(fila["lote_id"], []).append(fila)
+            return grupos
+        
+        consumo_por_lote = agrupar(filas.consumo)
+        gastos_directos_por_lote = agrupar(filas.gastos_directos)
+        mortalidad_por_lote = agrupar(filas.mortalidad)
+        cosechas_por_lote = agrupar(filas.cosechas)
+        
+        resumen_lotes = []
+        for lote in lotes:
+            alimento_info = CalculoCostosService._resumir_consumo(
+                consumo_por_lote.get(lote["id"], [])
+            )
+            costo_info = CalculoCostosService._armar_costo_total(
+                lote,
+                Decimal(str(lote["costo_lechones"])),
+                alimento_info,
+                CalculoCostosService._resumir_gastos_directos(
+                    gastos_directos_por_lote.get(lote["id"], [])
+                ),
+                CalculoCostosService._prorratear_meses(
+                    lote,
+                    CalculoCostosService._meses_periodo(*CalculoCostosService._parsear_fechas_lote(lote)),
+                    filas.lotes,
+                    indice,
+                    gastos_por_mes
+                )
+            )
+            indicadores = CalculoCostosService._armar_indicadores(
+                lote,
+                mortalidad_por_lote.get(lote["id"], []),
+                cosechas_por_lote.get(lote["id"], []),
+                alimento_info,
+                costo_info["costo_total"]
+            )
+            
+            resumen_lotes.append({
+                "lote_id": lote["id"],
+                "numero_lote": lote["numero_lote"],
+                "estado": lote["estado"],
+                "fecha_inicio": lote["fecha_inicio"],
+                "fecha_cierre": lote["fecha_cierre"],
+                "costo_total": costo_info["costo_total"],
+                "detalle_costos": costo_info["detalle_costos"],
+                "kg_alimento": alimento_info["kg_total"],
+                "animales": indicadores["animales"],
+                "total_vendido_kg": indicadores["pesos"]["total_vendido_kg"],
+                "conversion_alimenticia": indicadores["alimento"]["conversion_alimenticia"],
+                "costo_por_animal": indicadores["costos"]["costo_por_animal"],
+                "costo_por_kg_producido": indicadores["costos"]["costo_por_kg_producido"]
+            })
+        
+        return {
+            "lotes": resumen_lotes,
+            "totales": CalculoCostosService._totalizar_resumen(resumen_lotes)
+        }
+    
+    @staticmethod
+    async def _cargar_datos_resumen(
+        ctx: ContextoCalculo,
+        lotes: list[dict],
+        todos_los_lotes: list[dict]
+    ) -> FilasCalculo:
+        """Carga en paralelo todas las filas que necesita el resumen de `lotes`"""
+        periodos = [CalculoCostosService._parsear_fechas_lote(lote) for lote in lotes]
+        anio_inicial = min(inicio.year for inicio, _ in periodos)
+        anio_final = max(cierre.year for _, cierre in periodos)
+        
+        # Con filtros se piden solo las filas de los lotes seleccionados
+        ids = None if len(lotes) == len(todos_los_lotes) else [lote["id"] for lote in lotes]
+        
+        (
+            asignaciones,
+            gastos_mensuales,
+            consumo,
+            gastos_directos,
+            mortalidad,
+            cosechas
+        ) = await asyncio.gather(
+            ctx.asignaciones(),
+            ctx.gastos_mensuales(anio_inicial, anio_final),
+            CalculoCostosService._leer_vista("consumo_por_lote_mes", ids),
+            CalculoCostosService._leer_vista("gastos_directos_por_lote_mes", ids),
+            CalculoCostosService._leer_vista("mortalidad_por_lote", ids),
+            CalculoCostosService._leer_vista("cosechas_por_lote", ids),
+        )
+        
+        return FilasCalculo(
+            lotes=todos_los_lotes,
+            asignaciones=asignaciones,
+            gastos_mensuales=gastos_mensuales,
+            consumo=consumo,
+            gastos_directos=gastos_directos,
+            mortalidad=mortalidad,
+            cosechas=cosechas
+        )
+    
+    @staticmethod
+    async def _leer_vista(vista: str, ids: Optional[list[str]] = None) -> list[dict]:
+        """Filas de una vista de LLAVES_VISTAS, de los lotes `ids` o de todos"""
+        def consulta():
+            query = db.table(vista).select("*")
+            return query if ids is None else query.in_("lote_id", ids)
+        
+        return await leer_por_bloques(consulta, *LLAVES_VISTAS[vista])
+    
+    @staticmethod
+    def _filtrar_lotes(
+        lotes: list[dict],
+        estado: Optional[str],
+        fecha_desde: Optional[date],
+        fecha_hasta: Optional[date]
+    ) -> list[dict]:
+        """Lotes que cumplen los filtros de los reportes de granja, del más reciente al más viejo"""
+        return [
+            lote for lote in sorted(lotes, key=lambda otro: otro["fecha_inicio"], reverse=True)
+            if (estado is None or lote["estado"] == estado)
+            and (fecha_hasta is None or lote["fecha_inicio"] <= str(fecha_hasta))
+            and (
+                fecha_desde is None
+                or lote["fecha_cierre"] is None
+                or lote["fecha_cierre"] >= str(fecha_desde)
+            )
+        ]
+    
+    @staticmethod
+    async def iterar_costos_mensuales(
+        estado: Optional[str] = None,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None,
+        ctx: Optional[ContextoCalculo] = None,
+        tamano_bloque: int = 50
+    ) -> AsyncIterator[dict]:
+        """
+        Costos de cada lote desglosados por mes, fila a fila.
+        
+        Los datos del prorrateo se cargan una vez; el consumo y los gastos
+        directos se piden por bloques de `tamano_bloque` lotes, así la primera
+        fila sale sin esperar a toda la granja y en memoria solo hay un bloque.
+        El acumulado de la última fila de un lote coincide con su costo total
+        (redondeado a centavos).
+        
+        Yields:
+            Dict por lote y mes con lechones, alimento, gastos directos,
+            gastos prorrateados, total del mes y acumulado del lote
+        """
+        ctx = ctx or ContextoCalculo()
+        todos_los_lotes = await ctx.lotes()
+        lotes = CalculoCostosService._filtrar_lotes(
+            todos_los_lotes, estado, fecha_desde, fecha_hasta
+        )
+        
+        if not lotes:
+            return
+        
+        periodos = {
+            lote["id"]: CalculoCostosService._parsear_fechas_lote(lote) for lote in lotes
+        }
+        _, indice, gastos_por_mes = await CalculoCostosService._cargar_datos_prorrateo(
+            ctx,
+            min(inicio.year for inicio, _ in periodos.values()),
+            max(cierre.year for _, cierre in periodos.values())
+        )
+        
+        for i in range(0, len(lotes), tamano_bloque):
+            bloque = lotes[i:i + tamano_bloque]
+            ids = [lote["id"] for lote in bloque]
+            
+            consumo, gastos_directos = await asyncio.gather(
+                CalculoCostosService._leer_vista("consumo_por_lote_mes", ids),
+                CalculoCostosService._leer_vista("gastos_directos_por_lote_mes", ids),
+            )
+            
+            # (lote_id, "AAAA-MM") -> filas de ese mes
+            def agrupar(filas: list[dict]) -> dict[tuple[str, str], list[dict]]:
+                grupos: dict[tuple[str, str], list[dict]] = {}
+                for fila in filas:
+                    grupos.setdefault((fila["lote_id"], fila["mes"]), []).append(fila)
+                return grupos
+            
+            consumo_por_mes = agrupar(consumo)
+            gastos_directos_por_mes = agrupar(gastos_directos)
+            
+            for lote in bloque:
+                inicio, _ = periodos[lote["id"]]
+                prorrateo = CalculoCostosService._prorratear_meses(
+                    lote,
+                    CalculoCostosService._meses_periodo(*periodos[lote["id"]]),
+                    todos_los_lotes,
+                    indice,
+                    gastos_por_mes
+                )
+                
+                # Registros fechados fuera del periodo del lote también cuentan en su costo
+                meses = sorted(
+                    set(prorrateo)
+                    | {mes for lote_id, mes in consumo_por_mes if lote_id == lote["id"]}
+                    | {mes for lote_id, mes in gastos_directos_por_mes if lote_id == lote["id"]}
+                )
+                mes_inicio = f"{inicio.year}-{inicio.month:02d}"
+                
+                acumulado = Decimal(0)
+                for mes in meses:
+                    alimento_info = CalculoCostosService._resumir_consumo(
+                        consumo_por_mes.get((lote["id"], mes), [])
+                    )
+                    gastos_directos_info = CalculoCostosService._resumir_gastos_directos(
+                        gastos_directos_por_mes.get((lote["id"], mes), [])
+                    )
+                    lechones = (
+                        Decimal(str(lote["costo_lechones"])) if mes == mes_inicio else Decimal(0)
+                    )
+                    prorrateado = prorrateo.get(mes, {"total": Decimal(0)})["total"]
+                    
+                    total = (
+                        lechones +
+                        alimento_info["costo_total"] +
+                        gastos_directos_info["total"] +
+                        prorrateado
+                    )
+                    acumulado += total
+                    
+                    # Se redondea solo al emitir; el acumulado conserva la precisión
+                    yield {
+                        "lote_id": lote["id"],
+                        "numero_lote": lote["numero_lote"],
+                        "estado": lote["estado"],
+                        "mes": mes,
+                        "lechones": lechones.quantize(CENTESIMAS),
+                        "alimento_kg": alimento_info["kg_total"].quantize(CENTESIMAS),
+                        "alimento": alimento_info["costo_total"].quantize(CENTESIMAS),
+                        "gastos_directos": gastos_directos_info["total"].quantize(CENTESIMAS),
+                        "gastos_prorrateados": prorrateado.quantize(CENTESIMAS),
+                        "total_mes": total.quantize(CENTESIMAS),
+                        "acumulado": acumulado.quantize(CENTESIMAS)
+                    }
+    
+    @staticmethod
+    def _totalizar_resumen(resumen_lotes: list[dict]) -> dict:
+        """Totales de la granja a partir del resumen por lote"""
+        costo_total = sum((r["costo_total"] for r in resumen_lotes), Decimal(0))
+        animales_iniciales = sum(r["animales"]["iniciales"] for r in resumen_lotes)
+        mortalidad = sum(r["animales"]["mortalidad"] for r in resumen_lotes)
+        kg_vendidos = sum((r["total_vendido_kg"] for r in resumen_lotes), Decimal(0))
+        
+        return {
+            "lotes": len(resumen_lotes),
+            "costo_total": costo_total,
+            "animales_iniciales": animales_iniciales,
+            "mortalidad": mortalidad,
+            "vendidos": sum(r["animales"]["vendidos"] for r in resumen_lotes),
+            "porcentaje_mortalidad": (
+                (Decimal(mortalidad) * 100 / animales_iniciales).quantize(CENTESIMAS)
+                if animales_iniciales > 0 else Decimal(0)
+            ),
+            "total_vendido_kg": kg_vendidos,
+            "costo_por_kg_producido": costo_total / kg_vendidos if kg_vendidos > 0 else Decimal(0)
+        }
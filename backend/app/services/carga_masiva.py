@@ -0,0 +1,146 @@
+# app/services/carga_masiva.py
+
+"""
+Servicio de carga masiva de registros.
+Valida una lista completa de filas en una sola pasada, descarta las que
+tienen errores (informándolos por fila) e inserta las demás en una sola
+petición a Supabase.
+"""
+
+import asyncio
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from app.database import db
+from app.services.cache_reportes import cache_reportes
+from app.services.totales_lote import COLUMNAS_TOTALES, TotalesLoteService
+
+
+@lru_cache(maxsize=None)
+def _adaptador(modelo: type[BaseModel]) -> TypeAdapter:
+    """TypeAdapter de list[modelo]; construirlo es costoso, se hace una vez por modelo"""
+    return TypeAdapter(list[modelo])
+
+
+class CargaMasivaService:
+    """Servicio para insertar muchos registros de una tabla en una sola operación"""
+    
+    @staticmethod
+    def validar(
+        modelo: type[BaseModel], filas: list[Any]
+    ) -> tuple[dict[int, BaseModel], dict[int, list[dict]]]:
+        """
+        Valida todas las filas contra el modelo.
+        
+        Returns:
+            (filas válidas por posición, errores por posición)
+        """
+        adaptador = _adaptador(modelo)
+        
+        try:
+            return dict(enumerate(adaptador.validate_python(filas))), {}
+        except ValidationError as e:
+            errores: dict[int, list[dict]] = {}
+            for error in e.errors():
+                fila, *campo = error["loc"]
+                errores.setdefault(fila, []).append({
+                    "campo": ".".join(str(parte) for parte in campo),
+                    "mensaje": error["msg"]
+                })
+        
+        # Las filas sin errores se validan de nuevo, ya sin las rechazadas
+        posiciones = [i for i in range(len(filas)) if i not in errores]
+        validas = adaptador.validate_python([filas[i] for i in posiciones])
+        
+        return dict(zip(posiciones, validas)), errores
+    
+    @staticmethod
+    async def verificar_referencias(
+        validas: dict[int, BaseModel],
+        referencias: dict[str, str],
+        errores: dict[int, list[dict]]
+    ) -> None:
+        """
+        Descarta las filas que apuntan a registros inexistentes.
+        
+        Una consulta por tabla referenciada en lugar de dejar que la llave
+        foránea haga fallar la inserción de todo el lote.
+        
+        Args:
+            validas: Filas válidas por posición (se modifican)
+            referencias: Campo -> tabla referenciada, ej. {"lote_id": "lotes"}
+            errores: Errores por posición (se agregan los de referencia)
+        """
+        ids_por_campo = {
+            campo: sorted({str(getattr(fila, campo)) for fila in validas.values()})
+            for campo in referencias
+        }
+        consultas = {campo: ids for campo, ids in ids_por_campo.items() if ids}
+        
+        respuestas = await asyncio.gather(*(
+            db.table(referencias[campo]).select("id").in_("id", ids).execute()
+            for campo, ids in consultas.items()
+        ))
+        existentes = {
+            campo: {fila["id"] for fila in respuesta.data}
+            for campo, respuesta in zip(consultas, respuestas)
+        }
+        
+        for posicion, fila in list(validas.items()):
+            for campo in referencias:
+                if str(getattr(fila, campo)) not in existentes.get(campo, set()):
+                    errores.setdefault(posicion, []).append({
+                        "campo": campo,
+                        "mensaje": f"No existe en {referencias[campo]}"
+                    })
+            
+            if posicion in errores:
+                del validas[posicion]
+    
+    @staticmethod
+    async def insertar(
+        tabla: str,
+        modelo: type[BaseModel],
+        filas: list[Any],
+        referencias: dict[str, str]
+    ) -> dict:
+        """
+        Valida e inserta una lista de registros.
+        
+        Las filas con errores de validación o de referencia se informan y se
+        omiten; el resto se inserta en una sola petición.
+        
+        Args:
+            tabla: Tabla destino
+            modelo: Modelo de creación de la tabla
+            filas: Filas recibidas en el body
+            referencias: Campos que son llave foránea y su tabla
+        
+        Returns:
+            Dict con insertados, registros creados y errores por fila
+        """
+        validas, errores = CargaMasivaService.validar(modelo, filas)
+        await CargaMasivaService.verificar_referencias(validas, referencias, errores)
+        
+        registros = []
+        if validas:
+            response = await db.table(tabla).insert([
+                fila.model_dump(mode="json") for fila in validas.values()
+            ]).execute()
+            registros = response.data
+            
+            if tabla in COLUMNAS_TOTALES:
+                await TotalesLoteService.registrar(tabla, nuevas=registros)
+            
+            for lote_id in {fila.lote_id for fila in validas.values()}:
+                cache_reportes.invalidar_lote(lote_id)
+        
+        return {
+            "insertados": len(registros),
+            "registros": registros,
+            "errores": [
+                {"fila": posicion, "errores": errores[posicion]} for posicion in sorted(errores)
+            ]
+        }
@@ -0,0 +1,143 @@
+# app/services/contexto_calculo.py
+
+"""
+Contexto de cálculo por petición.
+Carga cada entidad o porción de tabla la primera vez que se necesita y la
+reutiliza en el resto de la petición, así un reporte consulta cada tabla
+una sola vez aunque varios cálculos necesiten los mismos datos. Las tablas
+de toda la granja se leen por bloques (ver leer_por_bloques).
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+from uuid import UUID
+
+from app.database import AsyncQuery, db, leer_por_bloques
+from app.services.indice_ocupacion import IndiceOcupacion
+
+
+class ContextoCalculo:
+    """
+    Unidad de trabajo de una petición de reportes.
+    
+    Las cargas se memorizan como tareas, de modo que dos cálculos que corren
+    en paralelo (asyncio.gather) y piden la misma tabla comparten una sola
+    consulta.
+    
+    Ejemplo de uso:
+        ctx = ContextoCalculo()
+        costos = await CalculoCostosService.calcular_costo_total_lote(lote_id, ctx)
+        indicadores = await CalculoCostosService.calcular_indicadores_eficiencia(lote_id, ctx)
+    """
+    
+    def __init__(self):
+        self._cargas: dict[tuple, asyncio.Future] = {}
+        # Tablas consultadas, en orden, para medir y vigilar regresiones
+        self.consultas: list[str] = []
+        self._indice_ocupacion: Optional[IndiceOcupacion] = None
+    
+    async def _cargar(
+        self, clave: tuple, tabla: str, consulta: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Ejecuta la consulta solo la primera vez que se pide `clave`"""
+        if clave not in self._cargas:
+            self.consultas.append(tabla)
+            self._cargas[clave] = asyncio.ensure_future(consulta())
+        
+        return await self._cargas[clave]
+    
+    @staticmethod
+    async def _filas(query: AsyncQuery) -> list[dict]:
+        """Filas de una consulta que no crece con la granja (las de un lote)"""
+        response = await query.execute()
+        return response.data
+    
+    async def lotes(self) -> list[dict]:
+        """Todos los lotes (la tabla es pequeña: una fila por lote)"""
+        return await self._cargar(
+            ("lotes",),
+            "lotes",
+            lambda: leer_por_bloques(lambda: db.table("lotes").select("*"), "id")
+        )
+    
+    async def lote(self, lote_id: UUID) -> Optional[dict]:
+        """Fila de un lote, o None si no existe"""
+        lotes = await self.lotes()
+        return next((lote for lote in lotes if lote["id"] == str(lote_id)), None)
+    
+    async def asignaciones(self) -> list[dict]:
+        """Todas las asignaciones de corrales, incluidas las liberadas, con su área"""
+        return await self._cargar(
+            ("lotes_corrales",),
+            "lotes_corrales",
+            lambda: leer_por_bloques(
+                lambda: db.table("lotes_corrales")
+                    .select(
+                        "lote_id, corral_id, fecha_asignacion, fecha_liberacion, corrales(area_m2)"
+                    ),
+                "id"
+            )
+        )
+    
+    async def indice_ocupacion(self) -> IndiceOcupacion:
+        """Índice histórico de ocupación, construido una vez por petición"""
+        asignaciones = await self.asignaciones()
+        
+        if self._indice_ocupacion is None:
+            self._indice_ocupacion = IndiceOcupacion(asignaciones)
+        
+        return self._indice_ocupacion
+    
+    async def gastos_mensuales(self, anio_inicial: int, anio_final: int) -> list[dict]:
+        """Gastos mensuales de todos los meses entre dos años, ambos incluidos"""
+        return await self._cargar(
+            ("gastos_mensuales", anio_inicial, anio_final),
+            "gastos_mensuales",
+            lambda: leer_por_bloques(
+                lambda: db.table("gastos_mensuales")
+                    .select("*")
+                    .gte("anio", anio_inicial)
+                    .lte("anio", anio_final),
+                "id"
+            )
+        )
+    
+    async def consumo(self, lote_id: UUID) -> list[dict]:
+        """Consumo de alimento del lote sumado por mes y tipo (bultos, kg, costo)"""
+        return await self._cargar(
+            ("consumo_por_lote_mes", str(lote_id)),
+            "consumo_por_lote_mes",
+            lambda: self._filas(
+                db.table("consumo_por_lote_mes").select("*").eq("lote_id", str(lote_id))
+            )
+        )
+    
+    async def gastos_directos(self, lote_id: UUID) -> list[dict]:
+        """Gastos directos del lote sumados por mes y tipo"""
+        return await self._cargar(
+            ("gastos_directos_por_lote_mes", str(lote_id)),
+            "gastos_directos_por_lote_mes",
+            lambda: self._filas(
+                db.table("gastos_directos_por_lote_mes").select("*").eq("lote_id", str(lote_id))
+            )
+        )
+    
+    async def mortalidad(self, lote_id: UUID) -> list[dict]:
+        """Total de mortalidad del lote (una fila, o ninguna si no hay registros)"""
+        return await self._cargar(
+            ("mortalidad_por_lote", str(lote_id)),
+            "mortalidad_por_lote",
+            lambda: self._filas(
+                db.table("mortalidad_por_lote").select("*").eq("lote_id", str(lote_id))
+            )
+        )
+    
+    async def cosechas(self, lote_id: UUID) -> list[dict]:
+        """Animales y kilos vendidos del lote (una fila, o ninguna si no hay cosechas)"""
+        return await self._cargar(
+            ("cosechas_por_lote", str(lote_id)),
+            "cosechas_por_lote",
+            lambda: self._filas(
+                db.table("cosechas_por_lote").select("*").eq("lote_id", str(lote_id))
+            )
+        )
@@ -0,0 +1,170 @@
+# app/services/exportacion.py
+
+"""
+Servicio de exportación de reportes a CSV y XLSX.
+Ambos formatos se generan fila a fila a partir de un iterador asíncrono,
+entregando bytes a medida que se escriben, para servirlos con un
+StreamingResponse sin armar el archivo completo en memoria.
+"""
+
+import csv
+import io
+import zipfile
+from decimal import Decimal
+from typing import AsyncIterator
+from xml.sax.saxutils import escape
+
+_NS_HOJA = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_RELACIONES = "http://schemas.openxmlformats.org/package/2006/relationships"
+_NS_DOCUMENTO = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    f'<Relationships xmlns="{_NS_RELACIONES}">'
+    f'<Relationship Id="rId1" Type="{_NS_DOCUMENTO}/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    f'<Relationships xmlns="{_NS_RELACIONES}">'
+    f'<Relationship Id="rId1" Type="{_NS_DOCUMENTO}/worksheet" Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+
+def _workbook(hoja: str) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<workbook xmlns="{_NS_HOJA}" xmlns:r="{_NS_DOCUMENTO}">'
+        f'<sheets><sheet name="{escape(hoja)}" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    )
+
+
+def _celda(valor) -> str:
+    """Celda XLSX: los números van como número y lo demás como texto en línea"""
+    if valor is None:
+        return "<c/>"
+    if isinstance(valor, (int, float, Decimal)) and not isinstance(valor, bool):
+        return f"<c><v>{valor}</v></c>"
+    return f'<c t="inlineStr"><is><t>{escape(str(valor))}</t></is></c>'
+
+
+def _fila(valores) -> bytes:
+    """Fila XLSX ya codificada, lista para el zip"""
+    return ("<row>" + "".join(_celda(valor) for valor in valores) + "</row>").encode("utf-8")
+
+
+class _Salida:
+    """Destino de escritura sin seek: acumula lo escrito hasta que se retira"""
+    
+    def __init__(self):
+        self._buffer = bytearray()
+    
+    def write(self, datos: bytes) -> int:
+        self._buffer += datos
+        return len(datos)
+    
+    def flush(self) -> None:
+        pass
+    
+    def retirar(self) -> bytes:
+        datos = bytes(self._buffer)
+        self._buffer.clear()
+        return datos
+
+
+class ExportacionService:
+    """Servicio para serializar filas de reportes en formatos de hoja de cálculo"""
+    
+    @staticmethod
+    async def generar_csv(
+        columnas: list[tuple[str, str]],
+        filas: AsyncIterator[dict]
+    ) -> AsyncIterator[bytes]:
+        """
+        CSV en UTF-8 con BOM (para que Excel respete las tildes).
+        
+        Args:
+            columnas: (clave en la fila, título de la columna)
+            filas: Iterador asíncrono de dicts
+        
+        Yields:
+            Bytes del encabezado y luego de cada fila
+        """
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        
+        def linea(valores: list) -> bytes:
+            escritor.writerow(valores)
+            texto = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return texto.encode("utf-8")
+        
+        # El encabezado sale antes de calcular nada
+        yield "\ufeff".encode("utf-8") + linea([titulo for _, titulo in columnas])
+        
+        async for fila in filas:
+            yield linea([fila[clave] for clave, _ in columnas])
+    
+    @staticmethod
+    async def generar_xlsx(
+        columnas: list[tuple[str, str]],
+        filas: AsyncIterator[dict],
+        hoja: str = "Hoja1"
+    ) -> AsyncIterator[bytes]:
+        """
+        Libro XLSX de una hoja escrito directamente como zip en streaming.
+        
+        openpyxl necesita el archivo completo para guardarlo, así que las partes
+        del libro se escriben a mano: las fijas al inicio y la hoja fila a fila
+        con cadenas en línea (sin tabla de cadenas compartidas).
+        
+        Args:
+            columnas: (clave en la fila, título de la columna)
+            filas: Iterador asíncrono de dicts
+            hoja: Nombre de la hoja
+        
+        Yields:
+            Bytes del zip a medida que se comprimen
+        """
+        salida = _Salida()
+        
+        with zipfile.ZipFile(salida, "w", compression=zipfile.ZIP_DEFLATED) as libro:
+            libro.writestr("[Content_Types].xml", _CONTENT_TYPES)
+            libro.writestr("_rels/.rels", _RELS)
+            libro.writestr("xl/workbook.xml", _workbook(hoja))
+            libro.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+            
+            with libro.open("xl/worksheets/sheet1.xml", "w") as hoja_xml:
+                hoja_xml.write(
+                    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                    f'<worksheet xmlns="{_NS_HOJA}"><sheetData>'.encode("utf-8")
+                )
+                hoja_xml.write(_fila(titulo for _, titulo in columnas))
+                yield salida.retirar()
+                
+                async for fila in filas:
+                    hoja_xml.write(_fila(fila[clave] for clave, _ in columnas))
+                    datos = salida.retirar()
+                    if datos:
+                        yield datos
+                
+                hoja_xml.write(b"</sheetData></worksheet>")
+        
+        yield salida.retirar()
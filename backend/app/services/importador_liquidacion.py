@@ -0,0 +1,438 @@
+# app/services/importador_liquidacion.py
+
+"""
+Importador del libro histórico "Liquidación Lotes - Ceba El Sendero.xlsx".
+Recorre el libro en modo de solo lectura, fila por fila, convierte cada
+hoja "Lote N" en filas de `lotes`, `lotes_corrales`, `consumo_alimento`,
+`gastos_directos` y `cosechas`, las valida con los modelos *Create y las
+inserta en bloques, de modo que la memoria no crece con el tamaño del libro.
+"""
+
+import asyncio
+import time
+import unicodedata
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Iterator, Optional
+
+from openpyxl import load_workbook
+from pydantic import ValidationError
+
+from app.database import db
+from app.models.consumo_alimento import ConsumoAlimentoCreate
+from app.models.cosecha import CosechaCreate
+from app.models.gasto_directo import GastoDirectoCreate
+from app.models.lote import LoteCreate
+from app.services.carga_masiva import CargaMasivaService
+
+# Modelo con que se valida cada tabla hija; las tablas se vacían en este orden
+MODELOS = {
+    "consumo_alimento": ConsumoAlimentoCreate,
+    "gastos_directos": GastoDirectoCreate,
+    "cosechas": CosechaCreate,
+}
+
+# Tipo de gasto directo según el encabezado de la sección VARIOS
+TIPOS_GASTO = {
+    "fletes": "flete",
+    "innosure": "inmunocastracion",
+}
+
+# Cantidad máxima de errores que se guardan en el resumen
+MAX_ERRORES = 1000
+
+
+def _normalizar(texto: Any) -> str:
+    """Texto en minúsculas, sin tildes ni espacios de sobra"""
+    texto = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode()
+    return " ".join(texto.lower().split())
+
+
+def _numero(valor: Any) -> Optional[Decimal]:
+    """Número de una celda; '-', vacíos, errores de fórmula y ceros cuentan como sin dato"""
+    if valor is None or isinstance(valor, bool):
+        return None
+    try:
+        numero = Decimal(str(valor))
+    except InvalidOperation:
+        return None
+    return numero if numero.is_finite() and numero != 0 else None
+
+
+def _fecha(valor: Any) -> Optional[date]:
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return None
+
+
+@dataclass
+class Seccion:
+    """Bloque de una hoja (LECHONES, ALIMENTO, VARIOS o DESPACHOS) y sus columnas"""
+    nombre: str
+    columna: int
+    encabezado: list = field(default_factory=list)
+    subencabezado: list = field(default_factory=list)
+    
+    def columnas(self) -> list[tuple[int, str, str]]:
+        """
+        (índice, encabezado, subencabezado) de cada columna, tal como están en
+        la hoja; una celda combinada hereda el encabezado de su izquierda.
+        """
+        resultado = []
+        actual = ""
+        for relativo, titulo in enumerate(self.encabezado):
+            sub = self.subencabezado[relativo] if relativo < len(self.subencabezado) else None
+            if titulo is not None:
+                actual = str(titulo).strip()
+            elif sub is None:
+                actual = ""
+            subtitulo = str(sub).strip() if sub is not None else ""
+            resultado.append((self.columna + relativo, actual, subtitulo))
+        return resultado
+
+
+def _encabezado(fila: tuple, columna: int) -> list:
+    """Celdas del encabezado de una sección: terminan en tres celdas vacías seguidas"""
+    celdas = list(fila[columna:])
+    for i in range(len(celdas)):
+        if celdas[i:i + 3] == [None, None, None]:
+            return celdas[:i]
+    return celdas
+
+
+def leer_hoja(filas: Iterator[tuple]) -> Iterator[tuple[str, int, dict]]:
+    """
+    Convierte las filas de una hoja de liquidación en registros.
+    
+    Produce (tipo, número de fila en Excel, datos) con tipo en "titulo",
+    "lechones", "consumo", "gasto" y "despacho". Solo guarda el estado de
+    las secciones abiertas, nunca la hoja completa.
+    """
+    marcas = {"lechones", "alimento", "varios", "despachos"}
+    secciones: dict[int, Seccion] = {}
+    
+    for numero_fila, fila in enumerate(filas, start=1):
+        for columna, valor in enumerate(fila):
+            if isinstance(valor, str):
+                texto = _normalizar(valor)
+                if texto in marcas:
+                    secciones[columna] = Seccion(texto, columna)
+                elif numero_fila <= 3 and texto.startswith("lote "):
+                    yield "titulo", numero_fila, {"titulo": valor}
+        
+        for columna, seccion in list(secciones.items()):
+            if columna >= len(fila):
+                continue
+            inicio = fila[columna]
+            
+            if isinstance(inicio, str) and _normalizar(inicio) == "fecha":
+                seccion.encabezado = _encabezado(fila, columna)
+            elif isinstance(inicio, str) and _normalizar(inicio) == "totales":
+                del secciones[columna]
+            elif inicio is None and seccion.encabezado and not seccion.subencabezado:
+                # Fila de subtítulos bajo encabezados combinados (ej. Cantidad / V. Unitario)
+                if any(isinstance(v, str) for v in fila[columna:columna + len(seccion.encabezado)]):
+                    seccion.subencabezado = list(fila[columna:columna + len(seccion.encabezado)])
+            elif _fecha(inicio) and seccion.encabezado:
+                yield from _registros_de_fila(seccion, fila, numero_fila)
+
+
+def _registros_de_fila(
+    seccion: Seccion, fila: tuple, numero_fila: int
+) -> Iterator[tuple[str, int, dict]]:
+    """Registros de una fila de datos de una sección"""
+    fecha = _fecha(fila[seccion.columna])
+    columnas = [(i, titulo, sub) for i, titulo, sub in seccion.columnas() if i < len(fila)]
+    valores = {(_normalizar(titulo), _normalizar(sub)): fila[i] for i, titulo, sub in columnas}
+    
+    if seccion.nombre == "lechones":
+        yield "lechones", numero_fila, {
+            "fecha": fecha,
+            "cantidad": _numero(valores.get(("cantidad", ""))),
+            "peso_total": _numero(valores.get(("peso t. (kg)", ""))),
+            "total": _numero(valores.get(("total ($)", ""))),
+        }
+    
+    elif seccion.nombre == "alimento":
+        # Cada alimento ocupa tres columnas: Cantidad, V. Unitario y Total
+        for (titulo, sub), valor in valores.items():
+            if titulo not in ("fecha", "semana") and sub == "cantidad" and _numero(valor):
+                yield "consumo", numero_fila, {
+                    "alimento": titulo,
+                    "fecha": fecha,
+                    "cantidad_bultos": _numero(valor),
+                }
+    
+    elif seccion.nombre == "varios":
+        for i, titulo, sub in columnas:
+            clave = _normalizar(titulo)
+            if clave in ("fecha", "semana") or not clave or not _numero(fila[i]):
+                continue
+            # "FLETES" / "Animales" -> "Fletes animales"
+            yield "gasto", numero_fila, {
+                "fecha": fecha,
+                "concepto": f"{titulo} {sub}".strip().capitalize(),
+                "tipo": TIPOS_GASTO.get(clave, "otro"),
+                "monto": _numero(fila[i]),
+            }
+    
+    elif seccion.nombre == "despachos":
+        cerdos = _numero(valores.get(("cerdos", "")))
+        if cerdos:
+            yield "despacho", numero_fila, {
+                "fecha": fecha,
+                "cantidad_animales": cerdos,
+                "peso_total_kg": _numero(valores.get(("peso (kg)", ""))),
+            }
+
+
+class ImportadorLiquidacion:
+    """
+    Importa el libro de liquidación hoja por hoja.
+    
+    Ejemplo de uso:
+        importador = ImportadorLiquidacion(corrales_por_hoja={"Lote 1": ["Corral 1"]}, dry_run=True)
+        resumen = await importador.importar("Liquidación Lotes - Ceba El Sendero.xlsx")
+    """
+    
+    def __init__(
+        self,
+        corrales_por_hoja: Optional[dict[str, list[str]]] = None,
+        tamano_bloque: int = 500,
+        dry_run: bool = False
+    ):
+        self.corrales_por_hoja = corrales_por_hoja or {}
+        self.tamano_bloque = tamano_bloque
+        self.dry_run = dry_run
+        
+        # Filas pendientes de insertar por tabla, con (hoja, fila) para reportar errores
+        self._pendientes: dict[str, list[tuple[str, int, dict]]] = {
+            "lotes": [], "lotes_corrales": [], **{tabla: [] for tabla in MODELOS}
+        }
+        self.registros = {tabla: 0 for tabla in self._pendientes}
+        self.insertados = {tabla: 0 for tabla in self._pendientes}
+        self.errores: list[dict] = []
+        self.total_errores = 0
+        self.filas_leidas = 0
+        self.hojas = 0
+    
+    def _error(self, hoja: str, fila: Optional[int], tabla: str, errores: list[dict]) -> None:
+        self.total_errores += 1
+        if len(self.errores) < MAX_ERRORES:
+            self.errores.append({"hoja": hoja, "fila": fila, "tabla": tabla, "errores": errores})
+    
+    async def _cargar_catalogos(self) -> None:
+        """Alimentos y corrales por nombre, y los lotes que ya existen"""
+        alimentos, corrales, lotes = await asyncio.gather(
+            db.table("alimentos").select("id, nombre").execute(),
+            db.table("corrales").select("id, nombre").execute(),
+            db.table("lotes").select("numero_lote").execute(),
+        )
+        self._alimentos = {_normalizar(a["nombre"]): a["id"] for a in alimentos.data}
+        self._corrales = {_normalizar(c["nombre"]): c["id"] for c in corrales.data}
+        self._lotes_existentes = {lote["numero_lote"] for lote in lotes.data}
+    
+    async def importar(self, ruta: str) -> dict:
+        """
+        Importa (o solo valida, con dry_run) todas las hojas "Lote N" del libro.
+        
+        Returns:
+            Resumen con registros válidos e insertados por tabla, errores y velocidad
+        """
+        inicio = time.perf_counter()
+        await self._cargar_catalogos()
+        
+        libro = load_workbook(ruta, read_only=True, data_only=True)
+        try:
+            for hoja in libro.worksheets:
+                if not _normalizar(hoja.title).startswith("lote"):
+                    continue
+                self.hojas += 1
+                await self._importar_hoja(hoja.title, hoja.iter_rows(values_only=True))
+        finally:
+            libro.close()
+        
+        for tabla in self._pendientes:
+            await self._vaciar(tabla)
+        
+        segundos = time.perf_counter() - inicio
+        return {
+            "dry_run": self.dry_run,
+            "hojas": self.hojas,
+            "filas_leidas": self.filas_leidas,
+            "registros": self.registros,
+            "insertados": self.insertados,
+            "total_errores": self.total_errores,
+            "errores": self.errores,
+            "segundos": round(segundos, 3),
+            "filas_por_segundo": round(self.filas_leidas / segundos, 1) if segundos > 0 else None,
+        }
+    
+    def _contar_filas(self, filas: Iterator[tuple]) -> Iterator[tuple]:
+        for fila in filas:
+            self.filas_leidas += 1
+            yield fila
+    
+    async def _importar_hoja(self, hoja: str, filas: Iterator[tuple]) -> None:
+        """Lee una hoja; los registros hijos esperan a que se conozca el lote"""
+        titulo = hoja
+        lechones = []
+        lote_id: Optional[str] = None
+        hijos_en_espera = []
+        
+        for tipo, fila, datos in leer_hoja(self._contar_filas(filas)):
+            if tipo == "titulo":
+                titulo = datos["titulo"]
+            elif tipo == "lechones":
+                lechones.append((fila, datos))
+            elif lote_id is None and lechones and tipo != "despacho":
+                # Terminó la sección de lechones: ya se puede armar el lote
+                lote_id = await self._agregar_lote(hoja, titulo, lechones)
+                if lote_id is None:
+                    return
+                for pendiente in hijos_en_espera:
+                    await self._agregar_hijo(hoja, lote_id, *pendiente)
+                hijos_en_espera = []
+                await self._agregar_hijo(hoja, lote_id, tipo, fila, datos)
+            elif lote_id is None:
+                hijos_en_espera.append((tipo, fila, datos))
+            else:
+                await self._agregar_hijo(hoja, lote_id, tipo, fila, datos)
+        
+        if lote_id is None:
+            if not lechones:
+                self._error(hoja, None, "lotes", [
+                    {"campo": "", "mensaje": "La hoja no tiene sección LECHONES con datos"}
+                ])
+                return
+            lote_id = await self._agregar_lote(hoja, titulo, lechones)
+            if lote_id is None:
+                return
+            for pendiente in hijos_en_espera:
+                await self._agregar_hijo(hoja, lote_id, *pendiente)
+    
+    async def _agregar_lote(
+        self, hoja: str, titulo: str, lechones: list[tuple[int, dict]]
+    ) -> Optional[str]:
+        """Valida el lote de la hoja y lo deja pendiente de insertar; retorna su id"""
+        fila = lechones[0][0]
+        animales = sum((d["cantidad"] or Decimal(0) for _, d in lechones), Decimal(0))
+        peso_total = sum((d["peso_total"] or Decimal(0) for _, d in lechones), Decimal(0))
+        # "LOTE 001 - COSTOS" -> "001"
+        numero_lote = titulo.split("-")[0].strip().split(" ", 1)[-1].strip()
+        
+        if numero_lote in self._lotes_existentes:
+            self._error(hoja, fila, "lotes", [
+                {"campo": "numero_lote", "mensaje": f"El lote {numero_lote} ya existe"}
+            ])
+            return None
+        
+        corrales_ids = []
+        for nombre in self.corrales_por_hoja.get(hoja, []):
+            corral_id = self._corrales.get(_normalizar(nombre))
+            if corral_id is None:
+                self._error(hoja, fila, "lotes_corrales", [
+                    {"campo": "corral", "mensaje": f"No existe el corral '{nombre}'"}
+                ])
+                return None
+            corrales_ids.append(corral_id)
+        
+        try:
+            lote = LoteCreate(
+                numero_lote=numero_lote,
+                fecha_inicio=min(d["fecha"] for _, d in lechones),
+                animales_iniciales=int(animales),
+                peso_promedio_inicial=(
+                    (peso_total / animales).quantize(Decimal("0.01")) if animales else 0
+                ),
+                # El libro no discrimina machos y hembras
+                cantidad_machos=int(animales),
+                cantidad_hembras=0,
+                costo_lechones=sum((d["total"] or Decimal(0) for _, d in lechones), Decimal(0)),
+                observaciones=(
+                    f"Importado de la hoja '{hoja}' del libro de liquidación; sin discriminar sexo"
+                ),
+                corrales_ids=corrales_ids,
+            )
+        except ValidationError as e:
+            self._error(hoja, fila, "lotes", [
+                {"campo": ".".join(str(p) for p in error["loc"]), "mensaje": error["msg"]}
+                for error in e.errors()
+            ])
+            return None
+        
+        lote_id = str(uuid.uuid4())
+        self._lotes_existentes.add(numero_lote)
+        self._pendientes["lotes"].append(
+            (hoja, fila, {"id": lote_id, **lote.model_dump(exclude={"corrales_ids"}, mode="json")})
+        )
+        for corral_id in corrales_ids:
+            self._pendientes["lotes_corrales"].append((hoja, fila, {
+                "lote_id": lote_id,
+                "corral_id": str(corral_id),
+                "fecha_asignacion": lote.fecha_inicio.isoformat(),
+            }))
+        self.registros["lotes"] += 1
+        self.registros["lotes_corrales"] += len(corrales_ids)
+        
+        return lote_id
+    
+    async def _agregar_hijo(
+        self, hoja: str, lote_id: str, tipo: str, fila: int, datos: dict
+    ) -> None:
+        """Deja pendiente un registro hijo del lote; vacía la tabla al llenar un bloque"""
+        if tipo == "consumo":
+            alimento_id = self._alimentos.get(datos["alimento"])
+            if alimento_id is None:
+                self._error(hoja, fila, "consumo_alimento", [
+                    {
+                        "campo": "alimento_id",
+                        "mensaje": f"No existe el alimento '{datos['alimento']}'"
+                    }
+                ])
+                return
+            tabla = "consumo_alimento"
+            registro = {
+                "lote_id": lote_id,
+                "alimento_id": alimento_id,
+                "fecha": datos["fecha"],
+                "cantidad_bultos": datos["cantidad_bultos"],
+            }
+        elif tipo == "gasto":
+            tabla = "gastos_directos"
+            registro = {"lote_id": lote_id, **datos}
+        else:
+            tabla = "cosechas"
+            registro = {"lote_id": lote_id, "tipo": "cabezas", **datos}
+        
+        self._pendientes[tabla].append((hoja, fila, registro))
+        if len(self._pendientes[tabla]) >= self.tamano_bloque:
+            await self._vaciar(tabla)
+    
+    async def _vaciar(self, tabla: str) -> None:
+        """Valida e inserta las filas pendientes de una tabla"""
+        if tabla in MODELOS:
+            # Los lotes deben existir antes que sus registros
+            await self._vaciar("lotes")
+            await self._vaciar("lotes_corrales")
+        
+        pendientes, self._pendientes[tabla] = self._pendientes[tabla], []
+        if not pendientes:
+            return
+        
+        filas = [registro for _, _, registro in pendientes]
+        if tabla in MODELOS:
+            validas, errores = CargaMasivaService.validar(MODELOS[tabla], filas)
+            for posicion, errores_fila in errores.items():
+                hoja, fila, _ = pendientes[posicion]
+                self._error(hoja, fila, tabla, errores_fila)
+            filas = [validas[i].model_dump(mode="json") for i in sorted(validas)]
+            self.registros[tabla] += len(filas)
+        
+        if filas and not self.dry_run:
+            response = await db.table(tabla).insert(filas).execute()
+            self.insertados[tabla] += len(response.data)
@@ -0,0 +1,183 @@
+# app/services/indice_ocupacion.py
+
+"""
+Índice histórico de ocupación de corrales.
+Se construye una vez con todas las asignaciones de `lotes_corrales`
+(incluidas las ya liberadas) y responde en tiempo logarítmico qué área
+ocupaba un lote, o toda la granja, en una fecha o durante un período.
+"""
+
+from bisect import bisect_right
+from calendar import monthrange
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+
+def _parsear_fecha(valor) -> Optional[date]:
+    """Acepta 'AAAA-MM-DD' o timestamps ISO; None queda como None"""
+    if not valor:
+        return None
+    return datetime.strptime(str(valor)[:10], "%Y-%m-%d").date()
+
+
+class FuncionEscalonada:
+    """
+    Área ocupada en función del día, a partir de intervalos [inicio, fin].
+    
+    Guarda los puntos de cambio ordenados, el área vigente desde cada uno y
+    el acumulado de área-días hasta cada uno, de modo que el área en un día
+    y el área-días de un rango se obtienen con una búsqueda binaria.
+    """
+    
+    def __init__(self, intervalos: list[tuple[int, Optional[int], Decimal]]):
+        # intervalos: (día inicial, día final inclusivo o None si sigue abierto, área)
+        cambios: dict[int, Decimal] = {}
+        for inicio, fin, area in intervalos:
+            cambios[inicio] = cambios.get(inicio, Decimal(0)) + area
+            if fin is not None:
+                cambios[fin + 1] = cambios.get(fin + 1, Decimal(0)) - area
+        
+        self._dias: list[int] = []
+        self._areas: list[Decimal] = []
+        self._acumulado: list[Decimal] = []
+        
+        area_actual = Decimal(0)
+        acumulado = Decimal(0)
+        for dia in sorted(cambios):
+            if self._dias:
+                acumulado += area_actual * (dia - self._dias[-1])
+            area_actual += cambios[dia]
+            self._dias.append(dia)
+            self._areas.append(area_actual)
+            self._acumulado.append(acumulado)
+    
+    def area_en(self, dia: int) -> Decimal:
+        """Área ocupada en el día (ordinal)"""
+        i = bisect_right(self._dias, dia) - 1
+        return self._areas[i] if i >= 0 else Decimal(0)
+    
+    def _area_dias_antes_de(self, dia: int) -> Decimal:
+        """Área-días acumulados en todos los días anteriores a `dia`"""
+        i = bisect_right(self._dias, dia) - 1
+        if i < 0:
+            return Decimal(0)
+        return self._acumulado[i] + self._areas[i] * (dia - self._dias[i])
+    
+    def area_dias(self, desde: int, hasta: int) -> Decimal:
+        """Área-días entre dos días (ordinales), ambos incluidos"""
+        if hasta < desde:
+            return Decimal(0)
+        return self._area_dias_antes_de(hasta + 1) - self._area_dias_antes_de(desde)
+
+
+class IndiceOcupacion:
+    """
+    Ocupación de corrales por lote y total, a lo largo del tiempo.
+    
+    Ejemplo de uso:
+        indice = IndiceOcupacion(asignaciones)  # filas de lotes_corrales con corrales(area_m2)
+        indice.area_en(lote_id, date(2024, 5, 10))
+        indice.area_promedio(lote_id, date(2024, 5, 1), date(2024, 5, 31))
+        indice.area_total_en_mes(2024, 5)
+    """
+    
+    def __init__(self, asignaciones: list[dict]):
+        intervalos_por_lote: dict[str, list] = {}
+        todos = []
+        # (lote_id, inicio, fin, área) para los barridos de varios lotes a la vez
+        self._asignaciones: list[tuple[str, int, Optional[int], Decimal]] = []
+        
+        for asignacion in asignaciones:
+            if not asignacion.get("corrales"):
+                continue
+            
+            inicio = _parsear_fecha(asignacion.get("fecha_asignacion")) or date.min
+            fin = _parsear_fecha(asignacion.get("fecha_liberacion"))
+            intervalo = (
+                inicio.toordinal(),
+                fin.toordinal() if fin else None,
+                Decimal(str(asignacion["corrales"]["area_m2"]))
+            )
+            
+            intervalos_por_lote.setdefault(str(asignacion["lote_id"]), []).append(intervalo)
+            todos.append(intervalo)
+            self._asignaciones.append((str(asignacion["lote_id"]), *intervalo))
+        
+        self._por_lote = {
+            lote_id: FuncionEscalonada(intervalos)
+            for lote_id, intervalos in intervalos_por_lote.items()
+        }
+        self._total = FuncionEscalonada(todos)
+    
+    def area_en(self, lote_id, fecha: date) -> Decimal:
+        """Área que ocupaba el lote en una fecha"""
+        funcion = self._por_lote.get(str(lote_id))
+        return funcion.area_en(fecha.toordinal()) if funcion else Decimal(0)
+    
+    def area_dias(self, lote_id, desde: date, hasta: date) -> Decimal:
+        """Área-días (m² × días) ocupados por el lote entre dos fechas incluidas"""
+        funcion = self._por_lote.get(str(lote_id))
+        return funcion.area_dias(desde.toordinal(), hasta.toordinal()) if funcion else Decimal(0)
+    
+    def area_promedio(self, lote_id, desde: date, hasta: date) -> Decimal:
+        """Área promedio ocupada por el lote entre dos fechas incluidas"""
+        dias = (hasta - desde).days + 1
+        if dias <= 0:
+            return Decimal(0)
+        return self.area_dias(lote_id, desde, hasta) / dias
+    
+    def area_en_mes(self, lote_id, anio: int, mes: int) -> Decimal:
+        """Área promedio ocupada por el lote durante el mes"""
+        ultimo_dia = monthrange(anio, mes)[1]
+        return self.area_promedio(lote_id, date(anio, mes, 1), date(anio, mes, ultimo_dia))
+    
+    def area_total_en(self, fecha: date) -> Decimal:
+        """Área ocupada por todos los lotes en una fecha"""
+        return self._total.area_en(fecha.toordinal())
+    
+    def area_total_dias(self, desde: date, hasta: date) -> Decimal:
+        """Área-días ocupados por todos los lotes entre dos fechas incluidas"""
+        return self._total.area_dias(desde.toordinal(), hasta.toordinal())
+    
+    def area_total_en_mes(self, anio: int, mes: int) -> Decimal:
+        """Área promedio ocupada por todos los lotes durante el mes"""
+        dias_mes = monthrange(anio, mes)[1]
+        return self.area_total_dias(date(anio, mes, 1), date(anio, mes, dias_mes)) / dias_mes
+    
+    def area_dias_por_lote(self, ventanas: dict[str, tuple[date, date]]) -> dict[str, Decimal]:
+        """
+        Área-días de varios lotes, cada uno dentro de su ventana [desde, hasta].
+        
+        Un solo barrido sobre los eventos de inicio y fin de las asignaciones
+        recortadas a cada ventana: O(A log A) para A asignaciones, sin importar
+        cuántos lotes se pidan.
+        """
+        eventos = []
+        for lote_id, inicio, fin, area in self._asignaciones:
+            ventana = ventanas.get(lote_id)
+            if ventana is None:
+                continue
+            
+            desde = max(inicio, ventana[0].toordinal())
+            hasta = min(fin, ventana[1].toordinal()) if fin is not None else ventana[1].toordinal()
+            if desde > hasta:
+                continue
+            
+            eventos.append((desde, lote_id, area))
+            eventos.append((hasta + 1, lote_id, -area))
+        
+        eventos.sort(key=lambda evento: evento[0])
+        
+        # Área vigente y último día contabilizado de cada lote durante el barrido
+        area_vigente: dict[str, Decimal] = {}
+        ultimo_dia: dict[str, int] = {}
+        resultado = {lote_id: Decimal(0) for lote_id in ventanas}
+        
+        for dia, lote_id, delta in eventos:
+            if lote_id in ultimo_dia:
+                resultado[lote_id] += area_vigente[lote_id] * (dia - ultimo_dia[lote_id])
+            area_vigente[lote_id] = area_vigente.get(lote_id, Decimal(0)) + delta
+            ultimo_dia[lote_id] = dia
+        
+        return resultado
@@ -0,0 +1,286 @@
+# app/services/motor_vectorizado.py
+
+"""
+Motor vectorizado (NumPy) del resumen de la granja.
+Alternativa a CalculoCostosService.calcular_resumen_granja para historias
+largas. Las filas de las vistas se pasan a columnas de enteros, leídas
+como Decimal (sin pasar por float): montos en diezmilésimas de peso, kilos
+en gramos y áreas en diezmilésimas de m². Las sumas por lote son sumas
+agrupadas exactas (np.add.at). El prorrateo de gastos mensuales se resuelve
+con una matriz lote × mes en lugar de recorrer cada mes de cada lote, en
+aritmética entera: cada celda es un cociente exacto que se redondea a
+diezmilésimas con su resto.
+
+Devuelve el mismo formato que el motor Decimal; tests/test_motor_vectorizado.py
+compara ambos lote por lote.
+"""
+
+from datetime import date
+from decimal import Decimal
+from fractions import Fraction
+from typing import Optional
+
+import numpy as np
+
+from app.services.calculo_service import CENTESIMAS, CalculoCostosService
+from app.services.contexto_calculo import ContextoCalculo
+
+# Los agregados de las vistas traen hasta 4 decimales (bultos × costo por bulto)
+ESCALA_MONTOS = 10_000
+ESCALA_KG = 1_000  # gramos
+ESCALA_AREA = 10_000
+
+# Escala de los cocientes (costo por animal, por kg...) al volver a Decimal
+ESCALA_COCIENTES = Decimal("0.000001")
+
+
+def _entero(valor, escala: int) -> int:
+    """Número (float, Decimal o texto) como entero exacto en la escala dada"""
+    return int((Decimal(str(valor)) * escala).to_integral_value())
+
+
+def _enteros(valores: list, escala: int) -> np.ndarray:
+    """Columna de números como enteros exactos en la escala dada"""
+    return np.fromiter(
+        (_entero(valor, escala) for valor in valores), dtype=np.int64, count=len(valores)
+    )
+
+
+def _decimal(entero: int, escala: int) -> Decimal:
+    """Entero en escala fija -> Decimal exacto"""
+    return Decimal(int(entero)) / escala
+
+
+def _ordinal(valor, defecto: int) -> int:
+    """'AAAA-MM-DD' o timestamp ISO como ordinal; sin fecha -> defecto"""
+    return date.fromisoformat(str(valor)[:10]).toordinal() if valor else defecto
+
+
+def _cociente(numerador: int, denominador: int) -> Decimal:
+    """numerador / denominador en Decimal; sin divisor queda en 0 como en el motor Decimal"""
+    if denominador <= 0:
+        return Decimal(0)
+    return Decimal(int(numerador)) / Decimal(int(denominador))
+
+
+def _redondear(numerador: np.ndarray, denominador: np.ndarray) -> np.ndarray:
+    """Cocientes enteros (arreglos de object) redondeados a la mitad hacia arriba por el resto"""
+    cociente = numerador // denominador
+    resto = numerador - cociente * denominador
+    return cociente + (2 * resto >= denominador)
+
+
+class MotorVectorizado:
+    """
+    Cálculo del resumen de la granja con arreglos de NumPy.
+    
+    Ejemplo de uso:
+        resumen = await MotorVectorizado.calcular_resumen_granja(estado="cerrado")
+    """
+    
+    @staticmethod
+    async def calcular_resumen_granja(
+        estado: Optional[str] = None,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None,
+        ctx: Optional[ContextoCalculo] = None
+    ) -> dict:
+        """Mismos argumentos y formato que CalculoCostosService.calcular_resumen_granja"""
+        ctx = ctx or ContextoCalculo()
+        todos_los_lotes = await ctx.lotes()
+        lotes = CalculoCostosService._filtrar_lotes(
+            todos_los_lotes, estado, fecha_desde, fecha_hasta
+        )
+        
+        if not lotes:
+            return {"lotes": [], "totales": CalculoCostosService._totalizar_resumen([])}
+        
+        filas = await CalculoCostosService._cargar_datos_resumen(ctx, lotes, todos_los_lotes)
+        consumo, gastos_directos = filas.consumo, filas.gastos_directos
+        mortalidad, cosechas = filas.mortalidad, filas.cosechas
+        asignaciones = filas.asignaciones
+        gastos_por_mes = CalculoCostosService._agrupar_gastos_mensuales(filas.gastos_mensuales)
+        
+        posiciones = {lote["id"]: i for i, lote in enumerate(lotes)}
+        sumar = MotorVectorizado._sumar_por_lote
+        
+        costo_alimento = sumar(consumo, "costo", ESCALA_MONTOS, posiciones)
+        kg_alimento = sumar(consumo, "kg", ESCALA_KG, posiciones)
+        costo_directos = sumar(gastos_directos, "monto", ESCALA_MONTOS, posiciones)
+        muertes = sumar(mortalidad, "cantidad", 1, posiciones)
+        vendidos = sumar(cosechas, "cantidad_animales", 1, posiciones)
+        gramos_vendidos = sumar(cosechas, "peso_total_kg", ESCALA_KG, posiciones)
+        
+        lechones = _enteros([lote["costo_lechones"] for lote in lotes], ESCALA_MONTOS)
+        iniciales = np.array([lote["animales_iniciales"] for lote in lotes], dtype=np.int64)
+        gramos_iniciales = _enteros([lote["peso_promedio_inicial"] for lote in lotes], ESCALA_KG)
+        
+        prorrateados = MotorVectorizado._prorratear(
+            lotes, todos_los_lotes, asignaciones, gastos_por_mes
+        )
+        
+        costo_total = lechones + costo_alimento + costo_directos + prorrateados
+        gramos_ganancia = gramos_vendidos - vendidos * gramos_iniciales
+        
+        resumen_lotes = []
+        for i, lote in enumerate(lotes):
+            resumen_lotes.append({
+                "lote_id": lote["id"],
+                "numero_lote": lote["numero_lote"],
+                "estado": lote["estado"],
+                "fecha_inicio": lote["fecha_inicio"],
+                "fecha_cierre": lote["fecha_cierre"],
+                "costo_total": _decimal(costo_total[i], ESCALA_MONTOS),
+                "detalle_costos": {
+                    "lechones": _decimal(lechones[i], ESCALA_MONTOS),
+                    "alimento": _decimal(costo_alimento[i], ESCALA_MONTOS),
+                    "gastos_directos": _decimal(costo_directos[i], ESCALA_MONTOS),
+                    "gastos_prorrateados": _decimal(prorrateados[i], ESCALA_MONTOS)
+                },
+                "kg_alimento": _decimal(kg_alimento[i], ESCALA_KG),
+                "animales": {
+                    "iniciales": int(iniciales[i]),
+                    "mortalidad": int(muertes[i]),
+                    "vendidos": int(vendidos[i]),
+                    "porcentaje_mortalidad": (
+                        _cociente(muertes[i] * 100, iniciales[i]).quantize(CENTESIMAS)
+                    )
+                },
+                "total_vendido_kg": _decimal(gramos_vendidos[i], ESCALA_KG),
+                "conversion_alimenticia": (
+                    _cociente(kg_alimento[i], gramos_ganancia[i]).quantize(CENTESIMAS)
+                ),
+                "costo_por_animal": _cociente(
+                    costo_total[i], ESCALA_MONTOS * int(vendidos[i])
+                ).quantize(ESCALA_COCIENTES),
+                "costo_por_kg_producido": _cociente(
+                    int(costo_total[i]) * ESCALA_KG, ESCALA_MONTOS * int(gramos_vendidos[i])
+                ).quantize(ESCALA_COCIENTES)
+            })
+        
+        return {
+            "lotes": resumen_lotes,
+            "totales": CalculoCostosService._totalizar_resumen(resumen_lotes)
+        }
+    
+    @staticmethod
+    def _sumar_por_lote(
+        filas: list[dict],
+        columna: str,
+        escala: int,
+        posiciones: dict[str, int]
+    ) -> np.ndarray:
+        """Suma entera exacta de una columna por lote; ignora filas de lotes fuera del resumen"""
+        total = np.zeros(len(posiciones), dtype=np.int64)
+        filas = [fila for fila in filas if fila["lote_id"] in posiciones]
+        if not filas:
+            return total
+        
+        indices = np.fromiter(
+            (posiciones[fila["lote_id"]] for fila in filas), dtype=np.intp, count=len(filas)
+        )
+        np.add.at(total, indices, _enteros([fila[columna] for fila in filas], escala))
+        return total
+    
+    @staticmethod
+    def _prorratear(
+        lotes: list[dict],
+        todos_los_lotes: list[dict],
+        asignaciones: list[dict],
+        gastos_por_mes: dict[tuple[int, int], list[dict]]
+    ) -> np.ndarray:
+        """
+        Total de gastos mensuales prorrateados de cada lote de `lotes`, en
+        diezmilésimas de peso.
+        
+        Mismas fórmulas que _distribuir_gastos_mes, para todos los meses a la vez:
+        - Arriendo: (Área Lote / Suma Áreas Activas) × (Días Lote / Días Mes) × Monto
+        - Otros: (Área Lote / Suma Áreas Activas) × Monto
+        El área de un lote en un mes es su área-días en los días activos del mes
+        dividida por esos días; la suma de áreas incluye a todos los lotes.
+        
+        Con a = área-días, d = días activos, D = días del mes y S = Σ a/d de
+        todos los lotes (una fracción exacta N / M por mes), cada celda es
+            a × (Otros × D + Arriendo × d) × M / (d × D × N)
+        en enteros de Python; se redondea con su resto y se suma por lote.
+        """
+        fechas = [CalculoCostosService._parsear_fechas_lote(lote) for lote in todos_los_lotes]
+        inicio = np.array([i.toordinal() for i, _ in fechas], dtype=np.int64)
+        cierre = np.array([c.toordinal() for _, c in fechas], dtype=np.int64)
+        
+        # Meses de los lotes del resumen
+        seleccion = [CalculoCostosService._parsear_fechas_lote(lote) for lote in lotes]
+        meses = CalculoCostosService._meses_periodo(
+            min(i for i, _ in seleccion), max(c for _, c in seleccion)
+        )
+        primer_dia = np.array([date(a, m, 1).toordinal() for a, m in meses], dtype=np.int64)
+        dias_mes = np.array(
+            [(date(a + m // 12, m % 12 + 1, 1) - date(a, m, 1)).days for a, m in meses],
+            dtype=np.int64
+        )
+        ultimo_dia = primer_dia + dias_mes - 1
+        
+        # Días activos de cada lote en cada mes: matriz lotes × meses
+        desde = np.maximum(inicio[:, None], primer_dia[None, :])
+        hasta = np.minimum(cierre[:, None], ultimo_dia[None, :])
+        dias_activos = np.maximum(hasta - desde + 1, 0)
+        
+        # Área-días: cada asignación aporta área × días de traslape con la ventana activa
+        posiciones = {lote["id"]: i for i, lote in enumerate(todos_los_lotes)}
+        validas = [
+            a for a in asignaciones if a.get("corrales") and str(a["lote_id"]) in posiciones
+        ]
+        area_dias = np.zeros(dias_activos.shape, dtype=np.int64)
+        if validas:
+            lote_de = np.array([posiciones[str(a["lote_id"])] for a in validas], dtype=np.intp)
+            asignado = np.array(
+                [_ordinal(a.get("fecha_asignacion"), 1) for a in validas], dtype=np.int64
+            )
+            liberado = np.array(
+                [_ordinal(a.get("fecha_liberacion"), date.max.toordinal()) for a in validas],
+                dtype=np.int64
+            )
+            area = _enteros([a["corrales"]["area_m2"] for a in validas], ESCALA_AREA)
+            
+            traslape = np.maximum(
+                np.minimum(liberado[:, None], hasta[lote_de])
+                - np.maximum(asignado[:, None], desde[lote_de]) + 1,
+                0
+            )
+            np.add.at(area_dias, lote_de, area[:, None] * traslape)
+        
+        # Suma de áreas promedio de cada mes como fracción exacta
+        suma_areas = [Fraction(0)] * len(meses)
+        for i, j in zip(*np.nonzero(area_dias)):
+            suma_areas[j] += Fraction(int(area_dias[i, j]), int(dias_activos[i, j]))
+        
+        # Gastos del mes separados en arriendo y el resto
+        arriendo = np.zeros(len(meses), dtype=np.int64)
+        otros = np.zeros(len(meses), dtype=np.int64)
+        for j, mes in enumerate(meses):
+            for gasto in gastos_por_mes.get(mes, []):
+                monto = _entero(gasto["monto"], ESCALA_MONTOS)
+                if gasto["tipo"] == "arriendo":
+                    arriendo[j] += monto
+                else:
+                    otros[j] += monto
+        
+        filas = np.array([posiciones[lote["id"]] for lote in lotes], dtype=np.intp)
+        numerador_suma = np.array([s.numerator for s in suma_areas], dtype=object)
+        denominador_suma = np.array([s.denominator for s in suma_areas], dtype=object)
+        
+        # Enteros de Python (dtype object): los productos exceden int64
+        area = area_dias[filas].astype(object)
+        dias = dias_activos[filas].astype(object)
+        mes = dias_mes.astype(object)
+        numerador = (
+            area * (otros.astype(object) * mes + arriendo.astype(object) * dias)
+            * denominador_suma
+        )
+        denominador = dias * mes * numerador_suma
+        
+        # Sin área en el mes el lote no recibe gastos (y d o N pueden ser 0)
+        con_area = area_dias[filas] > 0
+        por_mes = np.zeros(numerador.shape, dtype=object)
+        por_mes[con_area] = _redondear(numerador[con_area], denominador[con_area])
+        return por_mes.sum(axis=1).astype(np.int64)
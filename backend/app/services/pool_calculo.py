@@ -0,0 +1,107 @@
+# app/services/pool_calculo.py
+
+"""
+Pool de procesos para la etapa de cálculo de los reportes.
+Con los datos ya cargados, la aritmética Decimal de costos, indicadores y
+resumen es CPU pura: en el event loop, un reporte de muchos lotes o años
+ocupa un núcleo y las demás peticiones esperan detrás. Los cálculos grandes
+(trabajo estimado >= CALCULO_UMBRAL_TRABAJO) corren en un ProcessPoolExecutor
+de CALCULO_PROCESOS procesos; los chicos siguen en el event loop, donde
+copiar las filas a otro proceso costaría más que calcularlas.
+Con CALCULO_PROCESOS=0 (por defecto) todo se calcula en el event loop.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _iniciar_proceso() -> None:
+    """Cada proceso importa los cálculos al arrancar, no en su primera tarea"""
+    import app.services.calculo_service  # noqa: F401
+
+
+def _listo() -> bool:
+    return True
+
+
+class PoolCalculo:
+    """
+    Ejecuta funciones puras (filas -> resultado) en procesos aparte.
+    
+    Las funciones y sus argumentos tienen que poder serializarse con pickle:
+    funciones de módulo o staticmethods, y datos planos (dict, list, Decimal).
+    
+    Ejemplo de uso:
+        resultado = await pool_calculo.ejecutar(
+            trabajo, CalculoCostosService.resumen_de_filas, lotes, filas
+        )
+    """
+    
+    def __init__(self, procesos: int, umbral_trabajo: int):
+        self.procesos = procesos
+        self.umbral_trabajo = umbral_trabajo
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    @property
+    def activo(self) -> bool:
+        return self.procesos > 0
+    
+    def _obtener(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: un fork copiaría los hilos del pool de Supabase a medio usar
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.procesos,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_iniciar_proceso
+            )
+        return self._executor
+    
+    async def ejecutar(self, trabajo: int, funcion: Callable[..., Any], *args: Any) -> Any:
+        """
+        Resultado de funcion(*args): en el pool si `trabajo` llega al umbral,
+        si no en el event loop.
+        """
+        if not self.activo or trabajo < self.umbral_trabajo:
+            return funcion(*args)
+        
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._obtener(), funcion, *args)
+        except BrokenProcessPool:
+            # Un proceso murió (ej. sin memoria): se descarta el pool y se
+            # calcula aquí; la próxima petición crea uno nuevo
+            logger.exception("El pool de cálculo se rompió; se calcula en el event loop")
+            self._descartar()
+            return funcion(*args)
+    
+    async def calentar(self) -> None:
+        """Lanza los procesos por adelantado, así la primera petición grande no los espera"""
+        if not self.activo:
+            return
+        
+        loop = asyncio.get_running_loop()
+        executor = self._obtener()
+        await asyncio.gather(*(
+            loop.run_in_executor(executor, _listo) for _ in range(self.procesos)
+        ))
+    
+    def _descartar(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def cerrar(self) -> None:
+        """Termina los procesos (al apagar la app)"""
+        self._descartar()
+
+
+# Instancia única del proceso
+pool_calculo = PoolCalculo(settings.calculo_procesos, settings.calculo_umbral_trabajo)
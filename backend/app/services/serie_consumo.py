@@ -0,0 +1,184 @@
+# app/services/serie_consumo.py
+
+"""
+Series de consumo de alimento para gráficos.
+Lee el consumo ya sumado por día y tipo (vistas consumo_por_lote_dia y
+consumo_por_dia), ordenado por fecha, y lo agrupa en días, semanas o meses
+en una sola pasada. Si el rango tiene más períodos que el máximo de puntos,
+cada punto junta varios períodos seguidos: la respuesta tiene a lo sumo
+`max_puntos` puntos sin importar cuántos registros haya.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Literal, Optional
+from uuid import UUID
+
+from app.database import db, leer_por_bloques
+
+Bucket = Literal["dia", "semana", "mes"]
+
+COLUMNAS = "fecha, tipo, bultos, kg, costo"
+
+
+def _fecha(valor) -> date:
+    """'AAAA-MM-DD' o timestamp ISO como date"""
+    return valor if isinstance(valor, date) else date.fromisoformat(str(valor)[:10])
+
+
+def _periodo(fecha: date, bucket: Bucket) -> int:
+    """Número correlativo del día, semana (lunes a domingo) o mes de una fecha"""
+    if bucket == "dia":
+        return fecha.toordinal()
+    if bucket == "semana":
+        return (fecha.toordinal() - 1) // 7  # El ordinal 1 (0001-01-01) es lunes
+    return fecha.year * 12 + fecha.month - 1
+
+
+def _inicio_periodo(periodo: int, bucket: Bucket) -> date:
+    """Primer día de un período numerado con _periodo"""
+    if bucket == "dia":
+        return date.fromordinal(periodo)
+    if bucket == "semana":
+        return date.fromordinal(periodo * 7 + 1)
+    return date(periodo // 12, periodo % 12 + 1, 1)
+
+
+def _vacio() -> dict:
+    return {"bultos": Decimal(0), "kg": Decimal(0), "costo": Decimal(0)}
+
+
+class SerieConsumoService:
+    """
+    Series de consumo de un lote o de toda la granja.
+    
+    Ejemplo de uso:
+        serie = await SerieConsumoService.serie_lote(lote_id, "semana", max_puntos=52)
+    """
+    
+    @staticmethod
+    async def serie_lote(
+        lote_id: UUID,
+        bucket: Bucket,
+        max_puntos: int,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None
+    ) -> dict:
+        """Serie de consumo de un lote"""
+        filas = await SerieConsumoService._leer(
+            "consumo_por_lote_dia", fecha_desde, fecha_hasta, lote_id=str(lote_id)
+        )
+        serie = SerieConsumoService.agrupar(filas, bucket, max_puntos, fecha_desde, fecha_hasta)
+        return {"lote_id": str(lote_id), **serie}
+    
+    @staticmethod
+    async def serie_granja(
+        bucket: Bucket,
+        max_puntos: int,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None
+    ) -> dict:
+        """Serie de consumo de toda la granja"""
+        filas = await SerieConsumoService._leer("consumo_por_dia", fecha_desde, fecha_hasta)
+        serie = SerieConsumoService.agrupar(filas, bucket, max_puntos, fecha_desde, fecha_hasta)
+        return {"lote_id": None, **serie}
+    
+    @staticmethod
+    async def _leer(
+        vista: str,
+        fecha_desde: Optional[date],
+        fecha_hasta: Optional[date],
+        lote_id: Optional[str] = None
+    ) -> list[dict]:
+        """Filas de la vista en el rango, ordenadas por fecha, leídas por bloques"""
+        def consulta():
+            query = db.table(vista).select(COLUMNAS)
+            if lote_id is not None:
+                query = query.eq("lote_id", lote_id)
+            if fecha_desde:
+                query = query.gte("fecha", fecha_desde.isoformat())
+            if fecha_hasta:
+                query = query.lte("fecha", fecha_hasta.isoformat())
+            return query
+        
+        # El tipo desempata el orden para que los bloques no se solapen
+        return await leer_por_bloques(consulta, "fecha", "tipo")
+    
+    @staticmethod
+    def agrupar(
+        filas: list[dict],
+        bucket: Bucket,
+        max_puntos: int,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None
+    ) -> dict:
+        """
+        Agrupa filas diarias (fecha, tipo, bultos, kg, costo) ordenadas por fecha.
+        
+        Sin fechas, el rango va del primer al último día con consumo. Los
+        períodos sin consumo quedan como puntos en cero para que el eje del
+        gráfico sea continuo.
+        """
+        desde = fecha_desde or (_fecha(filas[0]["fecha"]) if filas else None)
+        hasta = fecha_hasta or (_fecha(filas[-1]["fecha"]) if filas else None)
+        
+        if desde is None or hasta is None or desde > hasta:
+            return {
+                "bucket": bucket,
+                "periodos_por_punto": 1,
+                "desde": desde,
+                "hasta": hasta,
+                "totales": _vacio(),
+                "puntos": []
+            }
+        
+        primero = _periodo(desde, bucket)
+        periodos = _periodo(hasta, bucket) - primero + 1
+        # Períodos por punto: el menor que deja la serie en max_puntos o menos
+        por_punto = -(-periodos // max_puntos)
+        cantidad = -(-periodos // por_punto)
+        
+        def punto(indice: int, acumulado: dict, por_tipo: dict) -> dict:
+            inicio = _inicio_periodo(primero + indice * por_punto, bucket)
+            fin = _inicio_periodo(primero + (indice + 1) * por_punto, bucket) - timedelta(days=1)
+            return {
+                "desde": max(inicio, desde),
+                "hasta": min(fin, hasta),
+                **acumulado,
+                "por_tipo": por_tipo
+            }
+        
+        puntos = []
+        totales = _vacio()
+        actual, acumulado, por_tipo = 0, _vacio(), {}
+        
+        for fila in filas:
+            indice = (_periodo(_fecha(fila["fecha"]), bucket) - primero) // por_punto
+            if not 0 <= indice < cantidad:
+                continue
+            
+            # Las filas vienen por fecha: al cambiar de punto se cierra el anterior
+            # y se rellenan con ceros los que no tuvieron consumo
+            if indice != actual:
+                puntos.append(punto(actual, acumulado, por_tipo))
+                puntos.extend(punto(i, _vacio(), {}) for i in range(actual + 1, indice))
+                actual, acumulado, por_tipo = indice, _vacio(), {}
+            
+            del_tipo = por_tipo.setdefault(fila["tipo"], _vacio())
+            for columna in ("bultos", "kg", "costo"):
+                valor = Decimal(str(fila[columna]))
+                acumulado[columna] += valor
+                del_tipo[columna] += valor
+                totales[columna] += valor
+        
+        puntos.append(punto(actual, acumulado, por_tipo))
+        puntos.extend(punto(i, _vacio(), {}) for i in range(actual + 1, cantidad))
+        
+        return {
+            "bucket": bucket,
+            "periodos_por_punto": por_punto,
+            "desde": desde,
+            "hasta": hasta,
+            "totales": totales,
+            "puntos": puntos
+        }
@@ -0,0 +1,117 @@
+# app/services/snapshot_service.py
+
+"""
+Servicio de snapshots de lotes cerrados.
+Guarda en `lotes_snapshots` el resultado completo de costos e indicadores
+cuando un lote se cierra, para no recalcularlo en cada consulta. Los montos
+se guardan como texto decimal exacto y al leerlos se reconstruyen con los
+modelos de respuesta, así el snapshot responde lo mismo que el cálculo en vivo.
+"""
+
+import asyncio
+import logging
+from decimal import Decimal
+from typing import Any, Optional
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+
+from app.database import db
+from app.models.reporte import CostosLoteResponse, IndicadoresLoteResponse
+from app.services.calculo_service import CalculoCostosService
+from app.services.contexto_calculo import ContextoCalculo
+
+logger = logging.getLogger(__name__)
+
+
+def _a_jsonb(datos: Any) -> Any:
+    """Datos para una columna JSONB, con los Decimal como texto exacto (sin pasar por float)"""
+    return jsonable_encoder(datos, custom_encoder={Decimal: lambda valor: format(valor, "f")})
+
+
+class SnapshotService:
+    """Servicio para crear y leer snapshots de costos de lotes cerrados"""
+    
+    @staticmethod
+    async def crear_snapshot(lote_id: UUID) -> dict:
+        """
+        Calcula costos e indicadores del lote y los guarda como una nueva versión.
+        
+        Returns:
+            Fila creada en lotes_snapshots
+        """
+        ctx = ContextoCalculo()
+        
+        costos, indicadores, ultima_response = await asyncio.gather(
+            CalculoCostosService.calcular_costo_total_lote(lote_id, ctx),
+            CalculoCostosService.calcular_indicadores_eficiencia(lote_id, ctx),
+            db.table("lotes_snapshots")
+                .select("version")
+                .eq("lote_id", str(lote_id))
+                .order("version", desc=True)
+                .limit(1)
+                .execute(),
+        )
+        
+        version = ultima_response.data[0]["version"] + 1 if ultima_response.data else 1
+        
+        response = await db.table("lotes_snapshots").insert({
+            "lote_id": str(lote_id),
+            "version": version,
+            "costos": _a_jsonb(costos),
+            "indicadores": _a_jsonb(indicadores)
+        }).execute()
+        
+        return response.data[0]
+    
+    @staticmethod
+    async def crear_snapshot_al_cerrar(lote_id: UUID) -> None:
+        """
+        Crea el snapshot de un lote recién cerrado.
+        
+        Se llama antes de liberar sus corrales, para que el prorrateo del
+        snapshot vea las mismas asignaciones que el cálculo en vivo del lote.
+        Un error aquí no debe revertir el cierre: los reportes del lote se
+        siguen calculando en vivo hasta que se pida un nuevo snapshot.
+        """
+        try:
+            await SnapshotService.crear_snapshot(lote_id)
+        except Exception:
+            logger.exception("No se pudo crear el snapshot del lote %s", lote_id)
+    
+    @staticmethod
+    async def obtener_snapshot(
+        lote_id: UUID, ctx: Optional[ContextoCalculo] = None
+    ) -> Optional[dict]:
+        """
+        Retorna la versión más reciente del snapshot de un lote cerrado.
+        
+        Si el lote está activo (o se reabrió) retorna None sin consultar
+        los snapshots: sus reportes se calculan en vivo. `costos` e
+        `indicadores` vuelven con Decimal, como los del cálculo.
+        """
+        ctx = ctx or ContextoCalculo()
+        lote = await ctx.lote(lote_id)
+        
+        if not lote or lote["estado"] != "cerrado":
+            return None
+        
+        response = await db.table("lotes_snapshots")\
+            .select("*")\
+            .eq("lote_id", str(lote_id))\
+            .order("version", desc=True)\
+            .limit(1)\
+            .execute()
+        
+        if not response.data:
+            return None
+        
+        # Los snapshots viejos tienen los montos como números (float): se leen igual
+        snapshot = response.data[0]
+        return {
+            **snapshot,
+            "costos": CostosLoteResponse.model_validate(snapshot["costos"]).model_dump(),
+            "indicadores": (
+                IndicadoresLoteResponse.model_validate(snapshot["indicadores"]).model_dump()
+            )
+        }
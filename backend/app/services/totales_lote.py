@@ -0,0 +1,154 @@
+# app/services/totales_lote.py
+
+"""
+Totales acumulados por lote (tabla lotes_totales, migrations/004).
+Las rutas de escritura de mortalidad, cosechas, consumo de alimento y
+gastos directos registran aquí las filas que crean, modifican o eliminan;
+el servicio calcula la diferencia por lote y la suma en la base con
+acumular_totales_lote. Si una escritura queda a medias (el registro se
+guardó pero la suma falló), reconciliar() recalcula todo desde cero.
+"""
+
+import asyncio
+import logging
+from decimal import Decimal
+from typing import Iterable, Optional
+from uuid import UUID
+
+from app.database import db
+
+logger = logging.getLogger(__name__)
+
+# Columnas de cada tabla que cambian los totales
+COLUMNAS_TOTALES = {
+    "mortalidad": {"cantidad"},
+    "cosechas": {"cantidad_animales", "peso_total_kg"},
+    "consumo_alimento": {"cantidad_bultos"},
+    "gastos_directos": {"monto"},
+}
+
+# Totales de un lote sin registros
+TOTALES_VACIOS = {
+    "mortalidad": 0,
+    "animales_vendidos": 0,
+    "kg_vendidos": Decimal(0),
+    "alimento_kg": Decimal(0),
+    "alimento_costo": Decimal(0),
+    "gastos_directos": Decimal(0),
+}
+
+
+def _numero(valor) -> Decimal:
+    return Decimal(str(valor))
+
+
+class TotalesLoteService:
+    """
+    Mantenimiento incremental de lotes_totales.
+    
+    Ejemplo de uso:
+        response = await db.table("mortalidad").insert(datos).execute()
+        await TotalesLoteService.registrar("mortalidad", nuevas=response.data)
+    """
+    
+    @staticmethod
+    def afecta(tabla: str, datos: dict) -> bool:
+        """El cambio `datos` sobre una fila de `tabla` modifica los totales"""
+        return not COLUMNAS_TOTALES[tabla].isdisjoint(datos)
+    
+    @staticmethod
+    async def anterior(tabla: str, registro_id: UUID, datos: dict) -> Optional[dict]:
+        """
+        Fila antes de una actualización, para restar lo que aportaba.
+        
+        None si el cambio no toca los totales (ej. solo observaciones) o si
+        el registro no existe.
+        """
+        if not TotalesLoteService.afecta(tabla, datos):
+            return None
+        
+        response = await db.table(tabla).select("*").eq("id", str(registro_id)).execute()
+        return response.data[0] if response.data else None
+    
+    @staticmethod
+    async def registrar(
+        tabla: str,
+        nuevas: Iterable[dict] = (),
+        anteriores: Iterable[dict] = ()
+    ) -> None:
+        """
+        Suma a los totales lo que aportan `nuevas` y resta lo de `anteriores`.
+        
+        Creación: solo nuevas. Eliminación: solo anteriores. Actualización:
+        la fila antes y después del cambio. Un error no revierte la escritura
+        del registro: queda en el log y lo corrige reconciliar().
+        """
+        nuevas, anteriores = list(nuevas), list(anteriores)
+        
+        try:
+            aportes = await TotalesLoteService._aportes(tabla, nuevas + anteriores)
+            deltas: dict[str, dict[str, Decimal]] = {}
+            for fila, signo in [(fila, 1) for fila in nuevas] + [(fila, -1) for fila in anteriores]:
+                del_lote = deltas.setdefault(str(fila["lote_id"]), {})
+                for columna, valor in aportes(fila).items():
+                    del_lote[columna] = del_lote.get(columna, Decimal(0)) + signo * valor
+            
+            await asyncio.gather(*(
+                db.rpc("acumular_totales_lote", {
+                    "p_lote_id": lote_id,
+                    # Como texto: el numeric de Postgres los recibe sin pasar por float
+                    "p_deltas": {columna: str(valor) for columna, valor in delta.items() if valor}
+                }).execute()
+                for lote_id, delta in deltas.items()
+                if any(delta.values())
+            ))
+        except Exception:
+            logger.exception("No se pudieron actualizar los totales de %s", tabla)
+    
+    @staticmethod
+    async def _aportes(tabla: str, filas: list[dict]):
+        """Función fila -> {columna de lotes_totales: valor} para las filas de `tabla`"""
+        if tabla == "mortalidad":
+            return lambda fila: {"mortalidad": _numero(fila["cantidad"])}
+        
+        if tabla == "cosechas":
+            return lambda fila: {
+                "animales_vendidos": _numero(fila["cantidad_animales"]),
+                "kg_vendidos": _numero(fila["peso_total_kg"]),
+            }
+        
+        if tabla == "gastos_directos":
+            return lambda fila: {"gastos_directos": _numero(fila["monto"])}
+        
+        # Consumo: kg y costo salen del peso y precio del bulto de cada alimento
+        ids = sorted({str(fila["alimento_id"]) for fila in filas})
+        response = await db.table("alimentos")\
+            .select("id, peso_bulto_kg, costo_por_bulto")\
+            .in_("id", ids)\
+            .execute()
+        alimentos = {alimento["id"]: alimento for alimento in response.data}
+        
+        def consumo(fila: dict) -> dict:
+            alimento = alimentos[str(fila["alimento_id"])]
+            bultos = _numero(fila["cantidad_bultos"])
+            return {
+                "alimento_kg": bultos * _numero(alimento["peso_bulto_kg"]),
+                "alimento_costo": bultos * _numero(alimento["costo_por_bulto"]),
+            }
+        
+        return consumo
+    
+    @staticmethod
+    async def reconciliar(lote_id: Optional[UUID] = None) -> int:
+        """Recalcula desde cero los totales de un lote, o de todos; retorna cuántos lotes"""
+        response = await db.rpc(
+            "reconciliar_totales_lotes",
+            {"p_lote_id": str(lote_id) if lote_id else None}
+        ).execute()
+        return response.data
+    
+    @staticmethod
+    def con_vacios(totales: Optional[dict]) -> dict:
+        """Fila de lotes_totales, o ceros si el lote todavía no tiene registros"""
+        totales = totales or {}
+        return {columna: totales.get(columna, vacio) for columna, vacio in TOTALES_VACIOS.items()}
@@ -0,0 +1,209 @@
+# app/transporte_db.py
+
+"""
+Transporte HTTP de las consultas a Supabase (PostgREST).
+El cliente de postgrest trae una sesión httpx con valores genéricos:
+timeout único de 120 s, conexiones ociosas cerradas a los 5 s (la siguiente
+consulta paga otra vez TCP + TLS) y ningún reintento. Aquí la sesión se arma
+con la configuración de app/config.py (DB_*):
+- pool de conexiones del tamaño del pool de hilos, reutilizadas (keep-alive)
+- HTTP/2 opcional
+- timeouts separados de conexión y de lectura
+- reintentos acotados, con espera exponencial y jitter, solo para GET y
+  HEAD: una escritura (o una función de Postgres, que va por POST) nunca
+  se repite.
+Se importa recién al crear el cliente (ver app/database.py).
+"""
+
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+from postgrest import SyncPostgrestClient
+from postgrest.utils import SyncClient
+from supabase import Client
+
+from app.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+# Errores de red que vale la pena reintentar. PoolTimeout no: el pool está
+# lleno y reintentar solo suma espera
+ERRORES_TRANSITORIOS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadError,
+    httpx.ReadTimeout,
+    httpx.RemoteProtocolError,
+)
+
+# Respuestas del gateway de Supabase que suelen resolverse solas
+ESTADOS_TRANSITORIOS = {502, 503, 504}
+
+METODOS_IDEMPOTENTES = {"GET", "HEAD"}
+
+
+@dataclass(frozen=True)
+class OpcionesTransporte:
+    """Parámetros de la sesión HTTP; por defecto los de Settings"""
+    conexiones: int
+    conexiones_ociosas: int
+    keepalive_segundos: float
+    http2: bool
+    timeout_conexion: float
+    timeout_lectura: float
+    reintentos: int
+    espera_base_segundos: float
+    espera_maxima_segundos: float
+    
+    @classmethod
+    def desde_settings(cls, config: Settings = settings) -> "OpcionesTransporte":
+        return cls(
+            conexiones=config.db_pool_conexiones,
+            conexiones_ociosas=config.db_pool_conexiones_ociosas,
+            keepalive_segundos=config.db_keepalive_segundos,
+            http2=config.db_http2,
+            timeout_conexion=config.db_timeout_conexion_segundos,
+            timeout_lectura=config.db_timeout_lectura_segundos,
+            reintentos=config.db_reintentos,
+            espera_base_segundos=config.db_reintento_espera_base_segundos,
+            espera_maxima_segundos=config.db_reintento_espera_maxima_segundos,
+        )
+
+
+def espera_reintento(intento: int, opciones: OpcionesTransporte) -> float:
+    """
+    Segundos antes del reintento número `intento` (1, 2, ...).
+    
+    Jitter completo: un valor al azar entre 0 y base * 2^(intento - 1), con
+    tope. Así los hilos que fallaron juntos no vuelven a pegarle juntos.
+    """
+    tope = min(opciones.espera_maxima_segundos, opciones.espera_base_segundos * 2 ** (intento - 1))
+    return random.uniform(0, tope)
+
+
+class TransporteConReintentos(httpx.BaseTransport):
+    """
+    Transporte httpx que repite GET y HEAD ante errores transitorios.
+    
+    Envuelve al transporte real (el que tiene el pool de conexiones); los
+    demás métodos pasan sin cambios.
+    """
+    
+    def __init__(self, transporte: httpx.BaseTransport, opciones: OpcionesTransporte):
+        self._transporte = transporte
+        self._opciones = opciones
+    
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method not in METODOS_IDEMPOTENTES:
+            return self._transporte.handle_request(request)
+        
+        intento = 0
+        while True:
+            try:
+                respuesta = self._transporte.handle_request(request)
+            except ERRORES_TRANSITORIOS as e:
+                if intento >= self._opciones.reintentos:
+                    raise
+                motivo = type(e).__name__
+            else:
+                transitorio = respuesta.status_code in ESTADOS_TRANSITORIOS
+                if not transitorio or intento >= self._opciones.reintentos:
+                    return respuesta
+                motivo = str(respuesta.status_code)
+                respuesta.close()  # Devuelve la conexión al pool
+            
+            intento += 1
+            espera = espera_reintento(intento, self._opciones)
+            logger.warning(
+                "Reintento %d/%d de %s %s (%s) en %.0f ms",
+                intento, self._opciones.reintentos, request.method, request.url.path,
+                motivo, espera * 1000
+            )
+            time.sleep(espera)
+    
+    def close(self) -> None:
+        self._transporte.close()
+
+
+def crear_sesion(
+    base_url: str,
+    headers: dict[str, str],
+    opciones: Optional[OpcionesTransporte] = None,
+    verify: bool = True,
+    proxy: Optional[str] = None
+) -> SyncClient:
+    """
+    Sesión con pool, keep-alive, timeouts y reintentos según `opciones`.
+    
+    Es un SyncClient de postgrest (un httpx.Client con aclose()), que es lo
+    que SyncPostgrestClient.aclose() y __exit__ esperan de su sesión.
+    """
+    opciones = opciones or OpcionesTransporte.desde_settings()
+    
+    http2 = opciones.http2
+    if http2:
+        try:
+            import h2  # noqa: F401 (httpx lo necesita para HTTP/2)
+        except ImportError:
+            logger.warning("DB_HTTP2 activo pero falta el paquete h2; se usa HTTP/1.1")
+            http2 = False
+    
+    transporte = httpx.HTTPTransport(
+        http2=http2,
+        verify=verify,
+        proxy=proxy,
+        limits=httpx.Limits(
+            max_connections=opciones.conexiones,
+            max_keepalive_connections=opciones.conexiones_ociosas,
+            keepalive_expiry=opciones.keepalive_segundos,
+        ),
+    )
+    
+    return SyncClient(
+        base_url=base_url,
+        headers=headers,
+        # Esperar un lugar en el pool cuenta como conexión
+        timeout=httpx.Timeout(
+            opciones.timeout_lectura,
+            connect=opciones.timeout_conexion,
+            pool=opciones.timeout_conexion,
+        ),
+        transport=TransporteConReintentos(transporte, opciones),
+        follow_redirects=True,
+    )
+
+
+class PostgrestConPool(SyncPostgrestClient):
+    """Cliente de postgrest que usa la sesión de crear_sesion()"""
+    
+    def create_session(
+        self,
+        base_url: str,
+        headers: dict[str, str],
+        timeout,
+        verify: bool = True,
+        proxy: Optional[str] = None
+    ) -> SyncClient:
+        # `timeout` (postgrest_client_timeout) se ignora: mandan los DB_TIMEOUT_*
+        return crear_sesion(base_url, headers, verify=verify, proxy=proxy)
+
+
+class ClienteSupabase(Client):
+    """Cliente de Supabase cuyas consultas a tablas y funciones usan PostgrestConPool"""
+    
+    @staticmethod
+    def _init_postgrest_client(
+        rest_url: str,
+        headers: dict[str, str],
+        schema: str,
+        timeout=None,
+        verify: bool = True,
+        proxy: Optional[str] = None
+    ) -> SyncPostgrestClient:
+        return PostgrestConPool(
+            rest_url, headers=headers, schema=schema, verify=verify, proxy=proxy
+        )
@@ -0,0 +1,176 @@
+# benchmarks/arranque.py
+
+"""
+Arranque en frío del backend.
+Mide dos cosas, cada una en procesos nuevos de Python:
+
+- importación: tiempo de `import app.main`. Falla (código 1) si la mediana
+  supera el presupuesto (--presupuesto-import-ms).
+- primera respuesta: desde que se lanza uvicorn hasta la primera respuesta
+  200 de /livez, /readyz y /api/corrales/. Por defecto el servidor usa
+  ClienteFalso con una granja sintética; con --supabase usa las
+  credenciales del entorno (.env) y mide también la conexión real.
+
+Uso (desde backend/):
+    python -m benchmarks.arranque
+    python -m benchmarks.arranque --repeticiones 10 --detalle
+    python -m benchmarks.arranque --supabase
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+# La configuración exige credenciales aunque nunca se usen
+ENTORNO_SIN_RED = {"SUPABASE_URL": "http://localhost:54321", "SUPABASE_KEY": "benchmark.sin.red"}
+
+# Presupuesto de `import app.main` en ms (mediana)
+PRESUPUESTO_IMPORT_MS = 1000
+
+# Rutas a esperar, en orden: el proceso responde, la BD responde, una ruta con datos
+RUTAS = ["/livez", "/readyz", "/api/corrales/"]
+
+_MEDIR_IMPORT = (
+    "import time; inicio = time.perf_counter(); import app.main; "
+    "print((time.perf_counter() - inicio) * 1000)"
+)
+
+
+def _entorno(supabase: bool) -> dict[str, str]:
+    entorno = dict(os.environ)
+    if not supabase:
+        entorno.update(ENTORNO_SIN_RED)
+    return entorno
+
+
+def medir_importacion(repeticiones: int, supabase: bool) -> list[float]:
+    """Milisegundos de `import app.main` en procesos nuevos"""
+    tiempos = []
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, "-c", _MEDIR_IMPORT],
+            env=_entorno(supabase), capture_output=True, text=True, check=True
+        )
+        tiempos.append(float(salida.stdout.strip()))
+    return tiempos
+
+
+def detalle_importacion(supabase: bool, cantidad: int = 15) -> list[tuple[float, str]]:
+    """Módulos que más tardan en importarse (acumulado, ms) según python -X importtime"""
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=_entorno(supabase), capture_output=True, text=True, check=True
+    )
+    modulos = []
+    for linea in salida.stderr.splitlines():
+        partes = linea.removeprefix("import time:").split("|")
+        if len(partes) == 3 and partes[1].strip().isdigit():
+            modulos.append((int(partes[1]) / 1000, partes[2].rstrip()))
+    return sorted(modulos, reverse=True)[:cantidad]
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _responde(url: str) -> bool:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as respuesta:
+            return respuesta.status == 200
+    except (urllib.error.URLError, ConnectionError, TimeoutError):
+        return False
+
+
+def medir_primera_respuesta(supabase: bool, limite_segundos: float = 60) -> dict[str, float]:
+    """Milisegundos desde lanzar el servidor hasta el primer 200 de cada ruta de RUTAS"""
+    puerto = _puerto_libre()
+    comando = [sys.executable, "-m", "benchmarks.arranque", "--servidor", str(puerto)]
+    if supabase:
+        comando.append("--supabase")
+    
+    inicio = time.perf_counter()
+    servidor = subprocess.Popen(
+        comando, env=_entorno(supabase), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    tiempos = {}
+    try:
+        for ruta in RUTAS:
+            while not _responde(f"http://127.0.0.1:{puerto}{ruta}"):
+                if servidor.poll() is not None:
+                    raise RuntimeError(f"El servidor terminó con código {servidor.returncode}")
+                if time.perf_counter() - inicio > limite_segundos:
+                    raise RuntimeError(f"{ruta} no respondió en {limite_segundos:g} s")
+                time.sleep(0.005)
+            tiempos[ruta] = (time.perf_counter() - inicio) * 1000
+    finally:
+        servidor.terminate()
+        servidor.wait()
+    return tiempos
+
+
+def servir(puerto: int, supabase: bool) -> None:
+    """Proceso hijo: uvicorn con la app, sobre ClienteFalso salvo con --supabase"""
+    import uvicorn
+    
+    import app.database as database
+    from app.main import app
+    
+    if not supabase:
+        from benchmarks.cliente_falso import ClienteFalso
+        from benchmarks.granja_sintetica import generar_granja
+        database.db._client = ClienteFalso(generar_granja(10, anios=1))
+    
+    uvicorn.run(app, host="127.0.0.1", port=puerto, log_level="warning")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Arranque en frío: importación y primera respuesta"
+    )
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--presupuesto-import-ms", type=float, default=PRESUPUESTO_IMPORT_MS)
+    parser.add_argument(
+        "--detalle", action="store_true", help="Módulos que más tardan en importarse"
+    )
+    parser.add_argument(
+        "--supabase", action="store_true", help="Usar el Supabase del entorno (.env)"
+    )
+    parser.add_argument("--servidor", type=int, metavar="PUERTO", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.servidor:
+        servir(args.servidor, args.supabase)
+        return
+    
+    importacion = medir_importacion(args.repeticiones, args.supabase)
+    mediana_import = statistics.median(importacion)
+    print(
+        f"import app.main: mediana {mediana_import:.0f} ms, máximo {max(importacion):.0f} ms "
+        f"(presupuesto {args.presupuesto_import_ms:.0f} ms)"
+    )
+    
+    if args.detalle:
+        for ms, modulo in detalle_importacion(args.supabase):
+            print(f"  {ms:>8.1f} ms  {modulo}")
+    
+    corridas = [medir_primera_respuesta(args.supabase) for _ in range(args.repeticiones)]
+    print(f"\n{'ruta':<16} {'primera respuesta ms':>21} {'máximo ms':>10}")
+    for ruta in RUTAS:
+        tiempos = [corrida[ruta] for corrida in corridas]
+        print(f"{ruta:<16} {statistics.median(tiempos):>21.0f} {max(tiempos):>10.0f}")
+    
+    if mediana_import > args.presupuesto_import_ms:
+        print(f"\nLa importación excede el presupuesto de {args.presupuesto_import_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,588 @@
+# benchmarks/cliente_falso.py
+
+"""
+Cliente de Supabase en memoria para pruebas y benchmarks.
+Implementa el subconjunto del query builder de postgrest que usa el proyecto
+(table/select/eq/neq/gt/gte/lt/lte/in_/is_/or_/order/limit/range/insert/update/delete,
+con recursos embebidos como `corrales(area_m2)`), las vistas de agregados y las
+funciones (rpc) de migrations/, y cuenta cada execute() como una ida y vuelta a la base de datos.
+Con `max_filas` corta cada respuesta como el `max_rows` de PostgREST (1000 en Supabase).
+
+Uso:
+    import app.database as database
+    cliente = ClienteFalso(tablas)
+    database.db._client = cliente
+"""
+
+import re
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Optional
+
+# Valores por defecto de columnas que pone la base de datos al insertar
+DEFECTOS_POR_TABLA = {
+    "lotes": {"estado": "activo", "fecha_cierre": None, "observaciones": None},
+    "lotes_corrales": {"fecha_liberacion": None},
+}
+
+# Tablas cuya llave primaria es la llave foránea a otra (relación uno a uno):
+# se embeben desde la fila apuntada, ej. lotes -> lotes_totales(*)
+UNO_A_UNO = {"lotes_totales": "lote_id"}
+
+Fila = dict[str, Any]
+Condicion = Callable[[Fila], bool]
+
+
+@dataclass
+class RespuestaFalsa:
+    """Misma forma que la respuesta de postgrest (`.data`, `.count`)"""
+    data: list[Fila]
+    count: Optional[int] = None
+
+
+def _comparar(a: Any, b: Any) -> int:
+    """Compara como números si ambos lo son; si no, como texto (fechas ISO, UUID)"""
+    try:
+        a, b = float(a), float(b)
+    except (TypeError, ValueError):
+        a, b = str(a), str(b)
+    return (a > b) - (a < b)
+
+
+def _literal(valor: str) -> Any:
+    """Valor de un filtro en texto de PostgREST -> valor de Python"""
+    return {"null": None, "true": True, "false": False}.get(valor, valor)
+
+
+def _partir(expresion: str) -> list[str]:
+    """Parte por comas de primer nivel, respetando paréntesis y comillas"""
+    partes, actual, profundidad, en_comillas = [], "", 0, False
+    i = 0
+    while i < len(expresion):
+        caracter = expresion[i]
+        if en_comillas and caracter == "\\":
+            actual += expresion[i:i + 2]
+            i += 2
+            continue
+        if caracter == '"':
+            en_comillas = not en_comillas
+        elif not en_comillas and caracter == "(":
+            profundidad += 1
+        elif not en_comillas and caracter == ")":
+            profundidad -= 1
+        
+        if caracter == "," and profundidad == 0 and not en_comillas:
+            partes.append(actual)
+            actual = ""
+        else:
+            actual += caracter
+        i += 1
+    
+    partes.append(actual)
+    return [parte.strip() for parte in partes if parte.strip()]
+
+
+def _condicion(columna: str, operador: str, valor: Any) -> Condicion:
+    """Filtro simple de PostgREST sobre una fila"""
+    def cumple(fila: Fila) -> bool:
+        actual = fila.get(columna)
+        if operador == "is":
+            return actual is valor or actual == valor
+        if operador == "in":
+            return actual is not None and str(actual) in valor
+        if actual is None or valor is None:
+            return operador == "neq" and actual is not valor
+        resultado = _comparar(actual, valor)
+        return {
+            "eq": resultado == 0,
+            "neq": resultado != 0,
+            "gt": resultado > 0,
+            "gte": resultado >= 0,
+            "lt": resultado < 0,
+            "lte": resultado <= 0,
+        }[operador]
+    
+    return cumple
+
+
+def _condicion_logica(expresion: str) -> Condicion:
+    """Una condición de un or_/and(...): `col.op.valor` o `and(...)`/`or(...)`"""
+    for conector, combinar in (("and(", all), ("or(", any)):
+        if expresion.startswith(conector):
+            partes = [_condicion_logica(p) for p in _partir(expresion[len(conector):-1])]
+            return lambda fila: combinar(parte(fila) for parte in partes)
+    
+    columna, operador, valor = expresion.split(".", 2)
+    if valor.startswith('"'):
+        valor = valor[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    else:
+        valor = _literal(valor)
+    return _condicion(columna, operador, valor)
+
+
+@dataclass
+class _Proyeccion:
+    """Columnas pedidas en un select y recursos embebidos"""
+    columnas: list[str] = field(default_factory=list)
+    # alias en la respuesta -> (tabla embebida, proyección), ej. `alimento:alimentos(nombre)`
+    embebidos: dict[str, tuple[str, "_Proyeccion"]] = field(default_factory=dict)
+    
+    @classmethod
+    def desde(cls, seleccion: str) -> "_Proyeccion":
+        proyeccion = cls()
+        for parte in _partir(seleccion):
+            recurso = re.fullmatch(r"(?:(\w+):)?(\w+)\((.*)\)", parte, re.S)
+            if recurso:
+                alias, tabla, interior = recurso.groups()
+                proyeccion.embebidos[alias or tabla] = (tabla, cls.desde(interior))
+            else:
+                proyeccion.columnas.append(parte)
+        return proyeccion
+
+
+class ConsultaFalsa:
+    """Query builder en memoria sobre una tabla del ClienteFalso"""
+    
+    def __init__(self, cliente: "ClienteFalso", tabla: str):
+        self._cliente = cliente
+        self._tabla = tabla
+        self._operacion = "select"
+        self._proyeccion = _Proyeccion(columnas=["*"])
+        self._condiciones: list[Condicion] = []
+        self._orden: list[tuple[str, bool]] = []
+        self._desde = 0
+        self._limite: Optional[int] = None
+        self._datos: Any = None
+    
+    # Operaciones
+    
+    def select(self, columnas: str = "*", count: Optional[str] = None) -> "ConsultaFalsa":
+        self._proyeccion = _Proyeccion.desde(columnas)
+        return self
+    
+    def insert(self, datos: Fila | list[Fila]) -> "ConsultaFalsa":
+        self._operacion = "insert"
+        self._datos = datos if isinstance(datos, list) else [datos]
+        return self
+    
+    def update(self, datos: Fila) -> "ConsultaFalsa":
+        self._operacion = "update"
+        self._datos = datos
+        return self
+    
+    def delete(self) -> "ConsultaFalsa":
+        self._operacion = "delete"
+        return self
+    
+    # Filtros
+    
+    def _filtro(self, columna: str, operador: str, valor: Any) -> "ConsultaFalsa":
+        self._condiciones.append(_condicion(columna, operador, valor))
+        return self
+    
+    def eq(self, columna: str, valor: Any) -> "ConsultaFalsa":
+        return self._filtro(columna, "eq", valor)
+    
+    def neq(self, columna: str, valor: Any) -> "ConsultaFalsa":
+        return self._filtro(columna, "neq", valor)
+    
+    def gt(self, columna: str, valor: Any) -> "ConsultaFalsa":
+        return self._filtro(columna, "gt", valor)
+    
+    def gte(self, columna: str, valor: Any) -> "ConsultaFalsa":
+        return self._filtro(columna, "gte", valor)
+    
+    def lt(self, columna: str, valor: Any) -> "ConsultaFalsa":
+        return self._filtro(columna, "lt", valor)
+    
+    def lte(self, columna: str, valor: Any) -> "ConsultaFalsa":
+        return self._filtro(columna, "lte", valor)
+    
+    def in_(self, columna: str, valores: list[Any]) -> "ConsultaFalsa":
+        return self._filtro(columna, "in", {str(valor) for valor in valores})
+    
+    def is_(self, columna: str, valor: Any) -> "ConsultaFalsa":
+        return self._filtro(columna, "is", _literal(valor) if isinstance(valor, str) else valor)
+    
+    def or_(self, filtros: str) -> "ConsultaFalsa":
+        self._condiciones.append(_condicion_logica(f"or({filtros})"))
+        return self
+    
+    # Modificadores
+    
+    def order(self, columna: str, desc: bool = False) -> "ConsultaFalsa":
+        self._orden.append((columna, desc))
+        return self
+    
+    def limit(self, cantidad: int) -> "ConsultaFalsa":
+        self._limite = cantidad
+        return self
+    
+    def range(self, inicio: int, fin: int) -> "ConsultaFalsa":
+        self._desde = inicio
+        self._limite = fin - inicio + 1
+        return self
+    
+    # Ejecución
+    
+    def execute(self) -> RespuestaFalsa:
+        with self._cliente.candado:
+            self._cliente.peticiones.append((self._tabla, self._operacion))
+            if self._tabla in VISTAS:
+                return self._ejecutar_select(self._cliente.vista(self._tabla))
+            return getattr(self, f"_ejecutar_{self._operacion}")(
+                self._cliente.tablas.setdefault(self._tabla, [])
+            )
+    
+    def _filtradas(self, filas: list[Fila]) -> list[Fila]:
+        return [fila for fila in filas if all(cumple(fila) for cumple in self._condiciones)]
+    
+    def _ejecutar_select(self, filas: list[Fila]) -> RespuestaFalsa:
+        resultado = self._filtradas(filas)
+        
+        # Ordenar por la última clave primero (orden estable), nulos al final
+        for columna, desc in reversed(self._orden):
+            presentes = [fila for fila in resultado if fila.get(columna) is not None]
+            nulos = [fila for fila in resultado if fila.get(columna) is None]
+            presentes.sort(key=lambda fila: _ClaveOrden(fila[columna]), reverse=desc)
+            resultado = presentes + nulos
+        
+        resultado = resultado[self._desde:]
+        if self._limite is not None:
+            resultado = resultado[:self._limite]
+        if self._cliente.max_filas is not None:
+            resultado = resultado[:self._cliente.max_filas]
+        
+        return RespuestaFalsa(data=[self._proyectar(fila, self._proyeccion) for fila in resultado])
+    
+    def _ejecutar_insert(self, filas: list[Fila]) -> RespuestaFalsa:
+        ahora = datetime.now(timezone.utc).isoformat()
+        creadas = []
+        for datos in self._datos:
+            fila = {
+                "id": str(uuid.uuid4()),
+                "created_at": ahora,
+                "updated_at": ahora,
+                **DEFECTOS_POR_TABLA.get(self._tabla, {}),
+                **datos
+            }
+            filas.append(fila)
+            creadas.append(dict(fila))
+        self._cliente.descartar_indice(self._tabla)
+        return RespuestaFalsa(data=creadas)
+    
+    def _ejecutar_update(self, filas: list[Fila]) -> RespuestaFalsa:
+        actualizadas = self._filtradas(filas)
+        for fila in actualizadas:
+            fila.update(self._datos)
+        self._cliente.descartar_indice(self._tabla)
+        return RespuestaFalsa(data=[dict(fila) for fila in actualizadas])
+    
+    def _ejecutar_delete(self, filas: list[Fila]) -> RespuestaFalsa:
+        borradas = self._filtradas(filas)
+        ids = {id(fila) for fila in borradas}
+        filas[:] = [fila for fila in filas if id(fila) not in ids]
+        self._cliente.descartar_indice(self._tabla)
+        return RespuestaFalsa(data=[dict(fila) for fila in borradas])
+    
+    def _proyectar(self, fila: Fila, proyeccion: _Proyeccion) -> Fila:
+        """Copia la fila con las columnas pedidas y resuelve los recursos embebidos"""
+        if "*" in proyeccion.columnas:
+            resultado = dict(fila)
+        else:
+            resultado = {columna: fila.get(columna) for columna in proyeccion.columnas}
+        
+        for alias, (recurso, sub_proyeccion) in proyeccion.embebidos.items():
+            relacionada = self._cliente.relacionada(fila, recurso)
+            resultado[alias] = (
+                self._proyectar(relacionada, sub_proyeccion) if relacionada is not None else None
+            )
+        
+        return resultado
+
+
+class _ClaveOrden:
+    """Clave de orden con la misma regla de comparación que los filtros"""
+    
+    def __init__(self, valor: Any):
+        self.valor = valor
+    
+    def __lt__(self, otra: "_ClaveOrden") -> bool:
+        return _comparar(self.valor, otra.valor) < 0
+
+
+def _sumar(
+    filas: list[Fila],
+    llave: Callable[[Fila], tuple],
+    valores: Callable[[Fila], dict]
+) -> list[Fila]:
+    """GROUP BY llave con SUM de cada valor; las sumas se hacen en Decimal como numeric"""
+    grupos: dict[tuple, dict[str, Decimal]] = {}
+    for fila in filas:
+        acumulado = grupos.setdefault(llave(fila), {})
+        for columna, valor in valores(fila).items():
+            acumulado[columna] = acumulado.get(columna, Decimal(0)) + Decimal(str(valor))
+    return [
+        {**dict(clave), **{columna: float(total) for columna, total in sumas.items()}}
+        for clave, sumas in grupos.items()
+    ]
+
+
+def _sumar_consumo(cliente: "ClienteFalso", llave: Callable[[Fila, Fila], tuple]) -> list[Fila]:
+    """Consumo JOIN alimentos sumado por llave(consumo, alimento)"""
+    alimentos = {alimento["id"]: alimento for alimento in cliente.tablas.get("alimentos", [])}
+    filas = [
+        (consumo, alimentos[consumo["alimento_id"]])
+        for consumo in cliente.tablas.get("consumo_alimento", [])
+        if consumo["alimento_id"] in alimentos
+    ]
+    return _sumar(
+        filas,
+        lambda par: llave(*par),
+        lambda par: {
+            "bultos": par[0]["cantidad_bultos"],
+            "kg": Decimal(str(par[0]["cantidad_bultos"])) * Decimal(str(par[1]["peso_bulto_kg"])),
+            "costo": (
+                Decimal(str(par[0]["cantidad_bultos"])) * Decimal(str(par[1]["costo_por_bulto"]))
+            ),
+        }
+    )
+
+
+def _consumo_por_lote_mes(cliente: "ClienteFalso") -> list[Fila]:
+    return _sumar_consumo(
+        cliente,
+        lambda consumo, alimento: (
+            ("lote_id", consumo["lote_id"]),
+            ("mes", str(consumo["fecha"])[:7]),
+            ("tipo", alimento["tipo"]),
+        )
+    )
+
+
+def _consumo_por_lote_dia(cliente: "ClienteFalso") -> list[Fila]:
+    return _sumar_consumo(
+        cliente,
+        lambda consumo, alimento: (
+            ("lote_id", consumo["lote_id"]),
+            ("fecha", str(consumo["fecha"])[:10]),
+            ("tipo", alimento["tipo"]),
+        )
+    )
+
+
+def _consumo_por_dia(cliente: "ClienteFalso") -> list[Fila]:
+    return _sumar_consumo(
+        cliente,
+        lambda consumo, alimento: (
+            ("fecha", str(consumo["fecha"])[:10]), ("tipo", alimento["tipo"])
+        )
+    )
+
+
+def _gastos_directos_por_lote_mes(cliente: "ClienteFalso") -> list[Fila]:
+    return _sumar(
+        cliente.tablas.get("gastos_directos", []),
+        lambda gasto: (
+            ("lote_id", gasto["lote_id"]), ("mes", str(gasto["fecha"])[:7]), ("tipo", gasto["tipo"])
+        ),
+        lambda gasto: {"monto": gasto["monto"]}
+    )
+
+
+def _mortalidad_por_lote(cliente: "ClienteFalso") -> list[Fila]:
+    filas = _sumar(
+        cliente.tablas.get("mortalidad", []),
+        lambda registro: (("lote_id", registro["lote_id"]),),
+        lambda registro: {"cantidad": registro["cantidad"]}
+    )
+    return [{**fila, "cantidad": int(fila["cantidad"])} for fila in filas]
+
+
+def _cosechas_por_lote(cliente: "ClienteFalso") -> list[Fila]:
+    filas = _sumar(
+        cliente.tablas.get("cosechas", []),
+        lambda cosecha: (("lote_id", cosecha["lote_id"]),),
+        lambda cosecha: {
+            "cantidad_animales": cosecha["cantidad_animales"],
+            "peso_total_kg": cosecha["peso_total_kg"],
+        }
+    )
+    return [{**fila, "cantidad_animales": int(fila["cantidad_animales"])} for fila in filas]
+
+
+# Vistas de migrations/ calculadas sobre las tablas en cada consulta
+VISTAS: dict[str, Callable[["ClienteFalso"], list[Fila]]] = {
+    "consumo_por_lote_mes": _consumo_por_lote_mes,
+    "consumo_por_lote_dia": _consumo_por_lote_dia,
+    "consumo_por_dia": _consumo_por_dia,
+    "gastos_directos_por_lote_mes": _gastos_directos_por_lote_mes,
+    "mortalidad_por_lote": _mortalidad_por_lote,
+    "cosechas_por_lote": _cosechas_por_lote,
+}
+
+
+# Columnas de lotes_totales y su tipo (las INTEGER se guardan como int)
+COLUMNAS_TOTALES = {
+    "mortalidad": int,
+    "animales_vendidos": int,
+    "kg_vendidos": float,
+    "alimento_kg": float,
+    "alimento_costo": float,
+    "gastos_directos": float,
+}
+
+
+def _acumular_totales_lote(cliente: "ClienteFalso", parametros: dict) -> None:
+    totales = cliente.tablas.setdefault("lotes_totales", [])
+    fila = next((fila for fila in totales if fila["lote_id"] == parametros["p_lote_id"]), None)
+    if fila is None:
+        fila = {
+            "lote_id": parametros["p_lote_id"],
+            **{columna: tipo(0) for columna, tipo in COLUMNAS_TOTALES.items()}
+        }
+        totales.append(fila)
+    
+    for columna, delta in parametros["p_deltas"].items():
+        tipo = COLUMNAS_TOTALES[columna]
+        fila[columna] = tipo(Decimal(str(fila[columna])) + Decimal(str(delta)))
+    fila["updated_at"] = datetime.now(timezone.utc).isoformat()
+    cliente.descartar_indice("lotes_totales")
+
+
+def _reconciliar_totales_lotes(cliente: "ClienteFalso", parametros: dict) -> int:
+    lote_id = parametros.get("p_lote_id")
+    lotes = [
+        lote["id"] for lote in cliente.tablas.get("lotes", [])
+        if lote_id is None or lote["id"] == lote_id
+    ]
+    
+    sumas = {lote: {columna: Decimal(0) for columna in COLUMNAS_TOTALES} for lote in lotes}
+    vistas = [
+        ("mortalidad_por_lote", {"cantidad": "mortalidad"}),
+        (
+            "cosechas_por_lote",
+            {"cantidad_animales": "animales_vendidos", "peso_total_kg": "kg_vendidos"}
+        ),
+        ("consumo_por_lote_mes", {"kg": "alimento_kg", "costo": "alimento_costo"}),
+        ("gastos_directos_por_lote_mes", {"monto": "gastos_directos"}),
+    ]
+    for vista, columnas in vistas:
+        for fila in cliente.vista(vista):
+            if fila["lote_id"] in sumas:
+                for origen, destino in columnas.items():
+                    sumas[fila["lote_id"]][destino] += Decimal(str(fila[origen]))
+    
+    ahora = datetime.now(timezone.utc).isoformat()
+    otras = [
+        fila for fila in cliente.tablas.get("lotes_totales", []) if fila["lote_id"] not in sumas
+    ]
+    cliente.tablas["lotes_totales"] = otras + [
+        {
+            "lote_id": lote,
+            **{c: COLUMNAS_TOTALES[c](v) for c, v in totales.items()},
+            "updated_at": ahora
+        }
+        for lote, totales in sumas.items()
+    ]
+    cliente.descartar_indice("lotes_totales")
+    return len(sumas)
+
+
+# Funciones de migrations/ que se llaman con rpc()
+FUNCIONES: dict[str, Callable[["ClienteFalso", dict], Any]] = {
+    "acumular_totales_lote": _acumular_totales_lote,
+    "reconciliar_totales_lotes": _reconciliar_totales_lotes,
+}
+
+
+class LlamadaFalsa:
+    """rpc() pendiente de execute()"""
+    
+    def __init__(self, cliente: "ClienteFalso", funcion: str, parametros: dict):
+        self._cliente = cliente
+        self._funcion = funcion
+        self._parametros = parametros
+    
+    def execute(self) -> RespuestaFalsa:
+        with self._cliente.candado:
+            self._cliente.peticiones.append((self._funcion, "rpc"))
+            return RespuestaFalsa(data=FUNCIONES[self._funcion](self._cliente, self._parametros))
+
+
+class ClienteFalso:
+    """
+    Cliente de Supabase en memoria.
+    
+    Attributes:
+        tablas: Filas por tabla (se modifican con insert/update/delete)
+        peticiones: (tabla, operación) de cada execute(), en orden
+        max_filas: Tope de filas de cada select, sin aviso (None = sin tope)
+    """
+    
+    def __init__(
+        self,
+        tablas: Optional[dict[str, list[Fila]]] = None,
+        max_filas: Optional[int] = None
+    ):
+        self.tablas: dict[str, list[Fila]] = tablas if tablas is not None else {}
+        self.max_filas = max_filas
+        self.peticiones: list[tuple[str, str]] = []
+        self.candado = threading.Lock()
+        self._por_id: dict[str, dict[str, Fila]] = {}
+        self._vistas: dict[str, list[Fila]] = {}
+        
+        # Carga inicial de lotes_totales, como al aplicar migrations/004
+        if "lotes" in self.tablas and "lotes_totales" not in self.tablas:
+            _reconciliar_totales_lotes(self, {})
+    
+    def table(self, nombre: str) -> ConsultaFalsa:
+        return ConsultaFalsa(self, nombre)
+    
+    def rpc(self, funcion: str, parametros: Optional[dict] = None) -> LlamadaFalsa:
+        return LlamadaFalsa(self, funcion, parametros or {})
+    
+    def relacionada(self, fila: Fila, recurso: str) -> Optional[Fila]:
+        """
+        Fila de `recurso` a la que apunta la llave foránea de `fila`.
+        
+        La llave se deduce del nombre del recurso en plural:
+        corrales -> corral_id, alimentos -> alimento_id, lotes -> lote_id.
+        En las relaciones de UNO_A_UNO es al revés: la fila del recurso apunta a `fila`.
+        """
+        if recurso in UNO_A_UNO:
+            return self._indice(recurso, UNO_A_UNO[recurso]).get(str(fila.get("id")))
+        
+        llave = next(
+            (f"{recurso[:-n]}_id" for n in (1, 2) if f"{recurso[:-n]}_id" in fila),
+            None
+        )
+        if llave is None or fila[llave] is None:
+            return None
+        
+        return self._indice(recurso, "id").get(str(fila[llave]))
+    
+    def _indice(self, tabla: str, columna: str) -> dict[str, Fila]:
+        """Filas de `tabla` por `columna`; se reconstruye tras un insert o delete en la tabla"""
+        indice = self._por_id.get(tabla)
+        if indice is None:
+            indice = {str(fila[columna]): fila for fila in self.tablas.get(tabla, [])}
+            self._por_id[tabla] = indice
+        return indice
+    
+    def vista(self, nombre: str) -> list[Fila]:
+        """Filas de una vista; se recalculan solo después de una escritura"""
+        if nombre not in self._vistas:
+            self._vistas[nombre] = VISTAS[nombre](self)
+        return self._vistas[nombre]
+    
+    def descartar_indice(self, tabla: str) -> None:
+        """La tabla cambió: descarta su índice por id y las vistas calculadas"""
+        self._por_id.pop(tabla, None)
+        self._vistas.clear()
+    
+    def reiniciar_conteo(self) -> None:
+        self.peticiones.clear()
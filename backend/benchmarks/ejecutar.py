@@ -0,0 +1,148 @@
+# benchmarks/ejecutar.py
+
+"""
+Benchmarks de los reportes contra una granja sintética en memoria.
+No necesita red ni base de datos: el cliente de Supabase se reemplaza por
+ClienteFalso. Para cada tamaño de granja mide el tiempo de pared y las idas
+y vueltas a la base de datos de cada endpoint.
+
+Uso (desde backend/):
+    python -m benchmarks.ejecutar
+    python -m benchmarks.ejecutar --tamanos 10 50 --repeticiones 3 --json resultados.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from datetime import date
+
+# La configuración exige credenciales aunque nunca se usen
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "benchmark.sin.red")
+# Exceder el presupuesto de consultas de una ruta hace fallar la corrida
+os.environ.setdefault("PRESUPUESTO_CONSULTAS_ESTRICTO", "true")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app.database as database  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.cache_reportes import cache_reportes  # noqa: E402
+from benchmarks.cliente_falso import ClienteFalso  # noqa: E402
+from benchmarks.granja_sintetica import generar_granja  # noqa: E402
+
+
+def _mes_medio(lote: dict) -> tuple[int, int]:
+    """Un mes en la mitad del periodo del lote"""
+    inicio = date.fromisoformat(lote["fecha_inicio"])
+    fin = date.fromisoformat(lote["fecha_cierre"]) if lote["fecha_cierre"] else date.today()
+    medio = inicio + (fin - inicio) / 2
+    return medio.year, medio.month
+
+
+# Endpoint -> URL para un lote
+ESCENARIOS = {
+    "get_lote": lambda lote: f"/api/lotes/{lote['id']}",
+    "costos": lambda lote: f"/api/reportes/lote/{lote['id']}/costos",
+    "indicadores": lambda lote: f"/api/reportes/lote/{lote['id']}/indicadores",
+    "prorrateo": lambda lote: "/api/reportes/lote/{}/prorrateo/{}/{}".format(
+        lote["id"], *_mes_medio(lote)
+    ),
+}
+
+
+@dataclass
+class Resultado:
+    """Medición de un endpoint para un tamaño de granja"""
+    lotes: int
+    endpoint: str
+    mediciones: int
+    mediana_ms: float
+    maximo_ms: float
+    idas_y_vueltas: int
+
+
+def medir(
+    cliente_http: TestClient,
+    cliente_db: ClienteFalso,
+    tamano: int,
+    muestra: list[dict],
+    repeticiones: int
+) -> list[Resultado]:
+    """Mide cada escenario sobre los lotes de la muestra, sin cache de reportes"""
+    resultados = []
+    for endpoint, url in ESCENARIOS.items():
+        tiempos, idas = [], []
+        for lote in muestra:
+            for _ in range(repeticiones):
+                cache_reportes.limpiar()
+                cliente_db.reiniciar_conteo()
+                
+                inicio = time.perf_counter()
+                respuesta = cliente_http.get(url(lote))
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+                
+                if respuesta.status_code != 200:
+                    raise RuntimeError(
+                        f"{endpoint} respondió {respuesta.status_code}: {respuesta.text}"
+                    )
+                idas.append(len(cliente_db.peticiones))
+        
+        resultados.append(Resultado(
+            lotes=tamano,
+            endpoint=endpoint,
+            mediciones=len(tiempos),
+            mediana_ms=round(statistics.median(tiempos), 2),
+            maximo_ms=round(max(tiempos), 2),
+            idas_y_vueltas=max(idas)
+        ))
+    return resultados
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmarks de reportes sobre una granja sintética"
+    )
+    parser.add_argument(
+        "--tamanos", type=int, nargs="+", default=[10, 50, 200], help="Lotes por granja"
+    )
+    parser.add_argument("--corrales", type=int, default=30, help="Corrales por granja")
+    parser.add_argument("--anios", type=int, default=3, help="Años de historia")
+    parser.add_argument("--muestra", type=int, default=5, help="Lotes medidos por granja")
+    parser.add_argument(
+        "--repeticiones", type=int, default=3, help="Peticiones por lote y endpoint"
+    )
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--json", metavar="ARCHIVO", help="Guardar los resultados en un JSON")
+    args = parser.parse_args()
+    
+    cliente_http = TestClient(app)
+    resultados: list[Resultado] = []
+    
+    for tamano in args.tamanos:
+        tablas = generar_granja(
+            tamano, corrales=args.corrales, anios=args.anios, semilla=args.semilla
+        )
+        cliente_db = ClienteFalso(tablas)
+        database.db._client = cliente_db
+        
+        muestra = random.Random(args.semilla).sample(tablas["lotes"], k=min(args.muestra, tamano))
+        resultados.extend(medir(cliente_http, cliente_db, tamano, muestra, args.repeticiones))
+    
+    print(f"{'lotes':>6}  {'endpoint':<12} {'mediana ms':>10} {'máximo ms':>10} {'idas':>5}")
+    for r in resultados:
+        print(
+            f"{r.lotes:>6}  {r.endpoint:<12} {r.mediana_ms:>10.2f} {r.maximo_ms:>10.2f} "
+            f"{r.idas_y_vueltas:>5}"
+        )
+    
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as archivo:
+            json.dump([asdict(r) for r in resultados], archivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
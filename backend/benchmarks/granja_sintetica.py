@@ -0,0 +1,211 @@
+# benchmarks/granja_sintetica.py
+
+"""
+Generador de granjas sintéticas para los benchmarks.
+Produce las tablas de Supabase (mismas columnas que la base real) para una
+granja con N lotes repartidos en varios años, M corrales, consumo diario de
+alimento, mortalidad, cosechas y gastos. Con la misma semilla genera
+siempre los mismos datos.
+"""
+
+import random
+import uuid
+from datetime import date, timedelta
+from typing import Any, Optional
+
+TIPOS_ALIMENTO = ["preiniciador", "levante", "engorde"]
+
+CONCEPTOS_MENSUALES = [
+    ("Arriendo", "arriendo"),
+    ("Nómina", "nomina"),
+    ("Energía", "servicios"),
+    ("Agua", "servicios"),
+]
+
+TIPOS_GASTO_DIRECTO = ["flete", "inmunocastracion", "otro"]
+
+
+def _uuid(aleatorio: random.Random) -> str:
+    return str(uuid.UUID(int=aleatorio.getrandbits(128), version=4))
+
+
+def generar_granja(
+    lotes: int,
+    corrales: int = 20,
+    anios: int = 3,
+    semilla: int = 1,
+    hoy: Optional[date] = None
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Genera las tablas de una granja sintética.
+    
+    Los lotes empiezan repartidos en los últimos `anios` años y duran entre
+    120 y 170 días; los que terminarían después de `hoy` quedan activos.
+    Uno de cada cuatro lotes cambia de corrales a mitad del ciclo.
+    
+    Args:
+        lotes: Cantidad de lotes
+        corrales: Cantidad de corrales
+        anios: Años de historia
+        semilla: Semilla del generador
+        hoy: Fecha de corte (por defecto hoy)
+    
+    Returns:
+        Dict tabla -> filas
+    """
+    aleatorio = random.Random(semilla)
+    hoy = hoy or date.today()
+    inicio_historia = hoy - timedelta(days=365 * anios)
+    marca = f"{inicio_historia.isoformat()}T00:00:00+00:00"
+    
+    tablas: dict[str, list[dict[str, Any]]] = {
+        "corrales": [],
+        "alimentos": [],
+        "lotes": [],
+        "lotes_corrales": [],
+        "consumo_alimento": [],
+        "mortalidad": [],
+        "cosechas": [],
+        "gastos_directos": [],
+        "gastos_mensuales": [],
+        "lotes_snapshots": [],
+    }
+    
+    for i in range(corrales):
+        tablas["corrales"].append({
+            "id": _uuid(aleatorio),
+            "nombre": f"Corral {i + 1}",
+            "area_m2": aleatorio.choice([40, 50, 62.5, 75, 100]),
+            "activo": True,
+        })
+    
+    for tipo in TIPOS_ALIMENTO:
+        tablas["alimentos"].append({
+            "id": _uuid(aleatorio),
+            "nombre": f"Alimento {tipo}",
+            "tipo": tipo,
+            "costo_por_bulto": aleatorio.choice([78000, 85500, 92000, 99500.5]),
+            "peso_bulto_kg": 40,
+            "activo": True,
+        })
+    
+    for i in range(lotes):
+        lote_id = _uuid(aleatorio)
+        fecha_inicio = inicio_historia + timedelta(days=aleatorio.randint(0, 365 * anios - 30))
+        fecha_cierre: Optional[date] = fecha_inicio + timedelta(days=aleatorio.randint(120, 170))
+        if fecha_cierre >= hoy:
+            fecha_cierre = None
+        fin = fecha_cierre or hoy
+        
+        animales = aleatorio.randint(80, 200)
+        machos = animales // 2
+        
+        tablas["lotes"].append({
+            "id": lote_id,
+            "numero_lote": f"L{i + 1:04d}",
+            "fecha_inicio": fecha_inicio.isoformat(),
+            "fecha_cierre": fecha_cierre.isoformat() if fecha_cierre else None,
+            "estado": "cerrado" if fecha_cierre else "activo",
+            "animales_iniciales": animales,
+            "cantidad_machos": machos,
+            "cantidad_hembras": animales - machos,
+            "peso_promedio_inicial": round(aleatorio.uniform(20, 30), 2),
+            "costo_lechones": animales * aleatorio.choice([280000, 300000, 320000]),
+            "observaciones": None,
+        })
+        
+        # Corrales: a veces se mudan a mitad del ciclo
+        asignados = aleatorio.sample(tablas["corrales"], k=min(2, corrales))
+        cambio = fecha_inicio + (fin - fecha_inicio) / 2 if i % 4 == 0 and corrales > 2 else None
+        for corral in asignados:
+            liberacion = cambio or fecha_cierre
+            tablas["lotes_corrales"].append({
+                "id": _uuid(aleatorio),
+                "lote_id": lote_id,
+                "corral_id": corral["id"],
+                "fecha_asignacion": fecha_inicio.isoformat(),
+                "fecha_liberacion": liberacion.isoformat() if liberacion else None,
+            })
+        if cambio:
+            nuevo = aleatorio.choice([c for c in tablas["corrales"] if c not in asignados])
+            tablas["lotes_corrales"].append({
+                "id": _uuid(aleatorio),
+                "lote_id": lote_id,
+                "corral_id": nuevo["id"],
+                "fecha_asignacion": (cambio + timedelta(days=1)).isoformat(),
+                "fecha_liberacion": fecha_cierre.isoformat() if fecha_cierre else None,
+            })
+        
+        # Consumo diario, avanzando de tipo de alimento con la edad del lote
+        dias = (fin - fecha_inicio).days + 1
+        for dia in range(dias):
+            etapa = min(dia * len(TIPOS_ALIMENTO) // dias, len(TIPOS_ALIMENTO) - 1)
+            alimento = tablas["alimentos"][etapa]
+            tablas["consumo_alimento"].append({
+                "id": _uuid(aleatorio),
+                "lote_id": lote_id,
+                "alimento_id": alimento["id"],
+                "fecha": (fecha_inicio + timedelta(days=dia)).isoformat(),
+                "cantidad_bultos": aleatorio.choice([1, 1.5, 2, 2.5, 3, 4]),
+                "observaciones": None,
+            })
+        
+        muertes = 0
+        for _ in range(aleatorio.randint(1, 5)):
+            muertes += 1
+            tablas["mortalidad"].append({
+                "id": _uuid(aleatorio),
+                "lote_id": lote_id,
+                "fecha": (
+                    fecha_inicio + timedelta(days=aleatorio.randint(0, dias - 1))
+                ).isoformat(),
+                "cantidad": 1,
+                "causa": None,
+                "observaciones": None,
+            })
+        
+        for _ in range(aleatorio.randint(2, 6)):
+            tablas["gastos_directos"].append({
+                "id": _uuid(aleatorio),
+                "lote_id": lote_id,
+                "fecha": (
+                    fecha_inicio + timedelta(days=aleatorio.randint(0, dias - 1))
+                ).isoformat(),
+                "concepto": "Gasto sintético",
+                "tipo": aleatorio.choice(TIPOS_GASTO_DIRECTO),
+                "monto": aleatorio.choice([150000, 420000.5, 980000]),
+                "observaciones": None,
+            })
+        
+        if fecha_cierre:
+            vendidos = animales - muertes
+            tablas["cosechas"].append({
+                "id": _uuid(aleatorio),
+                "lote_id": lote_id,
+                "fecha": fecha_cierre.isoformat(),
+                "tipo": "cabezas",
+                "cantidad_animales": vendidos,
+                "peso_total_kg": round(vendidos * aleatorio.uniform(105, 120), 2),
+                "es_ultima_cosecha": True,
+                "observaciones": None,
+            })
+    
+    for anio in range(inicio_historia.year, hoy.year + 1):
+        for mes in range(1, 13):
+            for concepto, tipo in CONCEPTOS_MENSUALES:
+                tablas["gastos_mensuales"].append({
+                    "id": _uuid(aleatorio),
+                    "anio": anio,
+                    "mes": mes,
+                    "concepto": concepto,
+                    "tipo": tipo,
+                    "monto": aleatorio.choice([850000, 1200000, 2345678.9]),
+                    "observaciones": None,
+                })
+    
+    for filas in tablas.values():
+        for fila in filas:
+            fila.setdefault("created_at", marca)
+            fila.setdefault("updated_at", marca)
+    
+    return tablas
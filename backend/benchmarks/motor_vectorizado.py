@@ -0,0 +1,134 @@
+# benchmarks/motor_vectorizado.py
+
+"""
+Motor vectorizado contra el motor Decimal en el resumen de la granja.
+Para cada tamaño calcula el resumen con ambos motores sobre la misma granja
+sintética, mide el tiempo de cada uno y compara lote por lote:
+
+- montos, kilos y cantidades exactos; el prorrateo y el costo total, que
+  redondean cada mes a diezmilésimas, al centavo
+- cocientes (costo por animal, por kg) con error relativo menor a 1e-6
+- porcentaje de mortalidad y conversión (redondeados) con 0.01 de diferencia
+  como máximo
+
+Termina con código 1 si alguna comparación falla.
+
+Uso (desde backend/):
+    python -m benchmarks.motor_vectorizado
+    python -m benchmarks.motor_vectorizado --tamanos 100 500 --anios 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "benchmark.sin.red")
+
+import app.database as database  # noqa: E402
+from app.services.calculo_service import CalculoCostosService  # noqa: E402
+from app.services.motor_vectorizado import MotorVectorizado  # noqa: E402
+from benchmarks.cliente_falso import ClienteFalso  # noqa: E402
+from benchmarks.granja_sintetica import generar_granja  # noqa: E402
+
+# Campo -> diferencia máxima permitida (absoluta, o relativa si es float)
+TOLERANCIAS = {
+    "costo_total": Decimal("0.01"),
+    "detalle_costos.lechones": Decimal(0),
+    "detalle_costos.alimento": Decimal(0),
+    "detalle_costos.gastos_directos": Decimal(0),
+    "detalle_costos.gastos_prorrateados": Decimal("0.01"),
+    "kg_alimento": Decimal(0),
+    "total_vendido_kg": Decimal(0),
+    "animales.iniciales": Decimal(0),
+    "animales.mortalidad": Decimal(0),
+    "animales.vendidos": Decimal(0),
+    "animales.porcentaje_mortalidad": Decimal("0.01"),
+    "conversion_alimenticia": Decimal("0.01"),
+    "costo_por_animal": 1e-6,
+    "costo_por_kg_producido": 1e-6,
+}
+
+
+def _valor(fila: dict, campo: str):
+    for parte in campo.split("."):
+        fila = fila[parte]
+    return fila
+
+
+def comparar(decimal: dict, vectorizado: dict) -> list[str]:
+    """Diferencias fuera de tolerancia entre los dos resúmenes"""
+    errores = []
+    por_id = {fila["lote_id"]: fila for fila in vectorizado["lotes"]}
+    
+    if len(por_id) != len(decimal["lotes"]):
+        return [f"Lotes: {len(decimal['lotes'])} con Decimal y {len(por_id)} vectorizado"]
+    
+    for fila in decimal["lotes"]:
+        otra = por_id[fila["lote_id"]]
+        for campo, tolerancia in TOLERANCIAS.items():
+            esperado, obtenido = Decimal(_valor(fila, campo)), Decimal(_valor(otra, campo))
+            diferencia = abs(esperado - obtenido)
+            if isinstance(tolerancia, float):
+                diferencia = float(diferencia) / max(float(abs(esperado)), 1.0)
+            if diferencia > tolerancia:
+                errores.append(f"{fila['numero_lote']} {campo}: {esperado} != {obtenido}")
+    
+    return errores
+
+
+def _medir(calcular, repeticiones: int) -> tuple[dict, float]:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = asyncio.run(calcular())
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return resultado, statistics.median(tiempos)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Motor vectorizado vs. motor Decimal")
+    parser.add_argument(
+        "--tamanos", type=int, nargs="+", default=[50, 200], help="Lotes por granja"
+    )
+    parser.add_argument("--corrales", type=int, default=30, help="Corrales por granja")
+    parser.add_argument("--anios", type=int, default=3, help="Años de historia")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--semilla", type=int, default=1)
+    args = parser.parse_args()
+    
+    errores = []
+    print(f"{'lotes':>6} {'Decimal ms':>11} {'vectorizado ms':>15} {'aceleración':>12}")
+    for tamano in args.tamanos:
+        tablas = generar_granja(
+            tamano, corrales=args.corrales, anios=args.anios, semilla=args.semilla
+        )
+        database.db._client = ClienteFalso(tablas)
+        
+        decimal, decimal_ms = _medir(
+            CalculoCostosService.calcular_resumen_granja, args.repeticiones
+        )
+        vectorizado, vectorizado_ms = _medir(
+            MotorVectorizado.calcular_resumen_granja, args.repeticiones
+        )
+        
+        print(
+            f"{tamano:>6} {decimal_ms:>11.1f} {vectorizado_ms:>15.1f} "
+            f"{decimal_ms / vectorizado_ms:>11.1f}x"
+        )
+        errores += [f"[{tamano} lotes] {error}" for error in comparar(decimal, vectorizado)]
+    
+    if errores:
+        print(f"\n{len(errores)} diferencias:")
+        print("\n".join(errores[:20]))
+        sys.exit(1)
+    
+    print("\nAmbos motores coinciden")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# benchmarks/pool_calculo.py
+
+"""
+Etapa de cálculo del resumen de la granja en el event loop vs. en el pool
+de procesos (CALCULO_PROCESOS, app/services/pool_calculo.py).
+Para cada tamaño carga una vez las filas de una granja sintética y mide:
+
+- una petición: el cálculo solo, y en el pool (incluye copiar las filas al
+  proceso y el resultado de vuelta). Junto al trabajo estimado sirve para
+  elegir CALCULO_UMBRAL_TRABAJO.
+- --concurrentes peticiones a la vez: tiempo total y la mayor demora del
+  event loop (un temporizador de 5 ms que mide cuánto tarda en volver a
+  correr). En el event loop las demás peticiones esperan todo el cálculo;
+  con el pool el loop queda libre y los cálculos usan varios núcleos.
+
+Uso (desde backend/):
+    python -m benchmarks.pool_calculo
+    python -m benchmarks.pool_calculo --tamanos 100 300 --procesos 4 --concurrentes 8
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "benchmark.sin.red")
+
+import app.database as database  # noqa: E402
+from app.services.calculo_service import CalculoCostosService  # noqa: E402
+from app.services.contexto_calculo import ContextoCalculo  # noqa: E402
+from app.services.pool_calculo import PoolCalculo  # noqa: E402
+from benchmarks.cliente_falso import ClienteFalso  # noqa: E402
+from benchmarks.granja_sintetica import generar_granja  # noqa: E402
+
+# Período del temporizador que mide la demora del event loop
+TIC_SEGUNDOS = 0.005
+
+
+async def _demora_maxima(hasta: asyncio.Event) -> float:
+    """Mayor atraso (ms) del temporizador mientras `hasta` no se activa"""
+    demora = 0.0
+    while not hasta.is_set():
+        inicio = time.perf_counter()
+        await asyncio.sleep(TIC_SEGUNDOS)
+        demora = max(demora, time.perf_counter() - inicio - TIC_SEGUNDOS)
+    return demora * 1000
+
+
+async def _concurrentes(
+    pool: PoolCalculo, cantidad: int, lotes: list[dict], filas
+) -> tuple[float, float]:
+    """(ms totales, demora máxima del loop en ms) de `cantidad` resúmenes a la vez"""
+    listo = asyncio.Event()
+    vigilante = asyncio.create_task(_demora_maxima(listo))
+    await asyncio.sleep(TIC_SEGUNDOS * 2)
+    
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        pool.ejecutar(0, CalculoCostosService.resumen_de_filas, lotes, filas)
+        for _ in range(cantidad)
+    ))
+    total_ms = (time.perf_counter() - inicio) * 1000
+    
+    listo.set()
+    return total_ms, await vigilante
+
+
+async def medir(tamano: int, args: argparse.Namespace, pool: PoolCalculo) -> dict:
+    tablas = generar_granja(tamano, corrales=args.corrales, anios=args.anios, semilla=args.semilla)
+    database.db._client = ClienteFalso(tablas)
+    
+    ctx = ContextoCalculo()
+    lotes = CalculoCostosService._filtrar_lotes(await ctx.lotes(), None, None, None)
+    filas = await CalculoCostosService._cargar_datos_resumen(ctx, lotes, await ctx.lotes())
+    
+    en_loop = PoolCalculo(procesos=0, umbral_trabajo=0)
+    tiempos = {"loop": [], "pool": []}
+    for _ in range(args.repeticiones):
+        for nombre, destino in (("loop", en_loop), ("pool", pool)):
+            inicio = time.perf_counter()
+            await destino.ejecutar(0, CalculoCostosService.resumen_de_filas, lotes, filas)
+            tiempos[nombre].append((time.perf_counter() - inicio) * 1000)
+    
+    return {
+        "lotes": tamano,
+        "trabajo": CalculoCostosService._trabajo(lotes, filas),
+        "loop_ms": statistics.median(tiempos["loop"]),
+        "pool_ms": statistics.median(tiempos["pool"]),
+        "concurrentes_loop": await _concurrentes(en_loop, args.concurrentes, lotes, filas),
+        "concurrentes_pool": await _concurrentes(pool, args.concurrentes, lotes, filas),
+    }
+
+
+async def _principal(args: argparse.Namespace) -> list[dict]:
+    pool = PoolCalculo(procesos=args.procesos, umbral_trabajo=0)
+    try:
+        await pool.calentar()
+        return [await medir(tamano, args, pool) for tamano in args.tamanos]
+    finally:
+        pool.cerrar()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Etapa de cálculo en el event loop vs. en el pool de procesos"
+    )
+    parser.add_argument(
+        "--tamanos", type=int, nargs="+", default=[20, 100, 300], help="Lotes por granja"
+    )
+    parser.add_argument("--corrales", type=int, default=30, help="Corrales por granja")
+    parser.add_argument("--anios", type=int, default=3, help="Años de historia")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--concurrentes", type=int, default=4, help="Resúmenes pedidos a la vez")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--semilla", type=int, default=1)
+    args = parser.parse_args()
+    
+    resultados = asyncio.run(_principal(args))
+    
+    print(
+        f"{args.procesos} procesos, {args.concurrentes} resúmenes concurrentes, "
+        f"{os.cpu_count()} núcleos\n"
+    )
+    print(
+        f"{'lotes':>6} {'trabajo':>9} {'loop ms':>9} {'pool ms':>9}   "
+        f"{'total loop':>10} {'total pool':>10} {'demora loop':>11} {'demora pool':>11}"
+    )
+    for r in resultados:
+        total_loop, demora_loop = r["concurrentes_loop"]
+        total_pool, demora_pool = r["concurrentes_pool"]
+        print(
+            f"{r['lotes']:>6} {r['trabajo']:>9} {r['loop_ms']:>9.1f} {r['pool_ms']:>9.1f}   "
+            f"{total_loop:>10.0f} {total_pool:>10.0f} {demora_loop:>11.0f} {demora_pool:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
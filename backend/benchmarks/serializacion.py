@@ -0,0 +1,103 @@
+# benchmarks/serializacion.py
+
+"""
+Parte de la serialización JSON en la latencia de /costos y /resumen.
+Calcula el reporte una vez sobre la granja sintética y mide por separado el
+cálculo y cada forma de serializarlo:
+
+- jsonable: lo que hace FastAPI con un dict sin response_model
+  (jsonable_encoder + json.dumps)
+- response_model: re-validar con el modelo tipado y volcarlo a JSON
+- orjson: el camino rápido de app/respuestas.py
+
+Uso (desde backend/):
+    python -m benchmarks.serializacion
+    python -m benchmarks.serializacion --lotes 200 --repeticiones 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Callable
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "benchmark.sin.red")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+import app.database as database  # noqa: E402
+from app.models.reporte import CostosLoteResponse, ResumenGranjaResponse  # noqa: E402
+from app.respuestas import codificar_json  # noqa: E402
+from app.services.calculo_service import CalculoCostosService  # noqa: E402
+from benchmarks.cliente_falso import ClienteFalso  # noqa: E402
+from benchmarks.granja_sintetica import generar_granja  # noqa: E402
+
+
+def _mediana_ms(funcion: Callable[[], object], repeticiones: int) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def _serializadores(modelo) -> dict[str, Callable[[object], bytes]]:
+    adaptador = TypeAdapter(modelo)
+    return {
+        "jsonable": lambda datos: JSONResponse(jsonable_encoder(datos)).body,
+        "response_model": lambda datos: JSONResponse(
+            adaptador.dump_python(adaptador.validate_python(datos), mode="json")
+        ).body,
+        "orjson": codificar_json,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Costo de serializar los reportes")
+    parser.add_argument("--lotes", type=int, default=100, help="Lotes de la granja")
+    parser.add_argument("--anios", type=int, default=3, help="Años de historia")
+    parser.add_argument("--repeticiones", type=int, default=10)
+    parser.add_argument("--semilla", type=int, default=1)
+    args = parser.parse_args()
+    
+    tablas = generar_granja(args.lotes, anios=args.anios, semilla=args.semilla)
+    database.db._client = ClienteFalso(tablas)
+    
+    # El lote más largo tiene el detalle de prorrateo más grande
+    lote = min(tablas["lotes"], key=lambda otro: otro["fecha_inicio"])
+    reportes = {
+        "costos": (
+            lambda: asyncio.run(CalculoCostosService.calcular_costo_total_lote(lote["id"])),
+            CostosLoteResponse
+        ),
+        "resumen": (
+            lambda: asyncio.run(CalculoCostosService.calcular_resumen_granja()),
+            ResumenGranjaResponse
+        ),
+    }
+    
+    print(
+        f"{'reporte':<9} {'serializador':<15} {'cálculo ms':>10} {'serializar ms':>13} "
+        f"{'% del total':>11} {'KB':>7}"
+    )
+    for nombre, (calcular, modelo) in reportes.items():
+        datos = calcular()
+        calculo_ms = _mediana_ms(calcular, args.repeticiones)
+        
+        for serializador, serializar in _serializadores(modelo).items():
+            serializar_ms = _mediana_ms(lambda: serializar(datos), args.repeticiones)
+            porcentaje = serializar_ms / (calculo_ms + serializar_ms) * 100
+            kb = len(serializar(datos)) / 1024
+            print(
+                f"{nombre:<9} {serializador:<15} {calculo_ms:>10.2f} {serializar_ms:>13.2f} "
+                f"{porcentaje:>10.1f}% {kb:>7.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+# benchmarks/transporte.py
+
+"""
+Prueba de carga del transporte HTTP hacia PostgREST (app/transporte_db.py).
+Levanta en otro proceso un servidor local que imita a PostgREST: responde
+JSON por HTTP/1.1 con keep-alive, tarda --latencia-ms por consulta y
+--conexion-ms extra en la primera consulta de cada conexión (lo que cuesta
+TCP + TLS contra Supabase), y responde 503 en una fracción --fallos de las
+consultas. Contra él corre la misma carga con tres sesiones:
+
+- sin_pool: una conexión nueva por consulta
+- postgrest: la sesión por defecto de postgrest (conexiones ociosas
+  cerradas a los 5 s, sin reintentos)
+- afinado: crear_sesion() con la configuración DB_* del entorno
+
+La carga son --rafagas ráfagas de --consultas GET desde --hilos hilos
+(como el pool de app/database.py), separadas por --pausa segundos, como el
+tráfico de una granja: unas pantallas seguidas y después nada por un rato.
+El rendimiento se mide solo durante las ráfagas.
+
+Uso (desde backend/):
+    python -m benchmarks.transporte
+    python -m benchmarks.transporte --fallos 0.05 --rafagas 2 --pausa 6
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# La configuración exige credenciales aunque nunca se usen
+ENTORNO_SIN_RED = {"SUPABASE_URL": "http://localhost:54321", "SUPABASE_KEY": "benchmark.sin.red"}
+for _clave, _valor in ENTORNO_SIN_RED.items():
+    os.environ.setdefault(_clave, _valor)
+
+SESIONES = ["sin_pool", "postgrest", "afinado"]
+
+# Filas que devuelve cada consulta al servidor de prueba
+FILAS = [{"id": i, "nombre": f"Corral {i}", "capacidad": 100 + i} for i in range(20)]
+
+
+def servir(puerto: int, latencia_ms: float, conexion_ms: float, fallos: float) -> None:
+    """Proceso hijo: servidor HTTP/1.1 que imita a PostgREST"""
+    cuerpo = json.dumps(FILAS).encode()
+    
+    class Manejador(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        disable_nagle_algorithm = True  # Encabezados y cuerpo salen en dos escrituras
+        timeout = 120
+        
+        def setup(self):
+            super().setup()
+            self.conexion_nueva = True
+        
+        def do_GET(self):
+            # postgrest manda "{}" como cuerpo también en los GET: hay que
+            # leerlo o queda mezclado con la consulta siguiente de la conexión
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            
+            espera = latencia_ms
+            if self.conexion_nueva:
+                espera += conexion_ms
+                self.conexion_nueva = False
+            time.sleep(espera / 1000)
+            
+            if random.random() < fallos:
+                estado, datos = 503, b'{"message": "Service Unavailable"}'
+            else:
+                estado, datos = 200, cuerpo
+            self.send_response(estado)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(datos)))
+            self.end_headers()
+            self.wfile.write(datos)
+        
+        def log_message(self, *args):
+            pass
+    
+    servidor = ThreadingHTTPServer(("127.0.0.1", puerto), Manejador)
+    servidor.daemon_threads = True
+    servidor.serve_forever()
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _esperar_servidor(puerto: int, limite_segundos: float = 10) -> None:
+    inicio = time.perf_counter()
+    while time.perf_counter() - inicio < limite_segundos:
+        try:
+            socket.create_connection(("127.0.0.1", puerto), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.02)
+    raise RuntimeError(f"El servidor de prueba no respondió en {limite_segundos:g} s")
+
+
+def crear_cliente(nombre: str, url: str):
+    """Cliente de postgrest con la sesión `nombre` (ver SESIONES)"""
+    import httpx
+    from postgrest import SyncPostgrestClient
+    from postgrest.utils import SyncClient
+    
+    from app.transporte_db import PostgrestConPool
+    
+    if nombre == "afinado":
+        return PostgrestConPool(url)
+    
+    cliente = SyncPostgrestClient(url)
+    if nombre == "sin_pool":
+        sesion = cliente.session
+        cliente.session = SyncClient(
+            base_url=sesion.base_url,
+            headers=sesion.headers,
+            limits=httpx.Limits(max_keepalive_connections=0)
+        )
+        sesion.close()
+    return cliente
+
+
+def medir(nombre: str, url: str, hilos: int, consultas: int, rafagas: int, pausa: float) -> dict:
+    """Consultas por segundo, latencias y errores de una sesión"""
+    cliente = crear_cliente(nombre, url)
+    
+    def consultar(_) -> tuple[float, bool]:
+        inicio = time.perf_counter()
+        try:
+            cliente.from_("corrales").select("*").execute()
+            ok = True
+        except Exception:
+            ok = False
+        return (time.perf_counter() - inicio) * 1000, ok
+    
+    latencias: list[float] = []
+    errores = 0
+    segundos_activos = 0.0
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        for rafaga in range(rafagas):
+            if rafaga:
+                time.sleep(pausa)
+            inicio = time.perf_counter()
+            for ms, ok in pool.map(consultar, range(consultas)):
+                latencias.append(ms)
+                errores += not ok
+            segundos_activos += time.perf_counter() - inicio
+    
+    cliente.session.close()
+    latencias.sort()
+    total = consultas * rafagas
+    return {
+        "sesion": nombre,
+        "consultas_por_segundo": total / segundos_activos,
+        "p50_ms": statistics.median(latencias),
+        "p95_ms": latencias[int(len(latencias) * 0.95) - 1],
+        "errores": errores,
+        "total": total,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Prueba de carga del transporte HTTP hacia PostgREST"
+    )
+    parser.add_argument("--hilos", type=int, default=10)
+    parser.add_argument("--consultas", type=int, default=50, help="Consultas por ráfaga")
+    parser.add_argument("--rafagas", type=int, default=4)
+    parser.add_argument("--pausa", type=float, default=6, help="Segundos entre ráfagas")
+    parser.add_argument("--latencia-ms", type=float, default=5)
+    parser.add_argument("--conexion-ms", type=float, default=60, help="Costo de abrir una conexión")
+    parser.add_argument(
+        "--fallos", type=float, default=0, help="Fracción de consultas que responden 503"
+    )
+    parser.add_argument("--sesiones", nargs="+", choices=SESIONES, default=SESIONES)
+    parser.add_argument("--servidor", type=int, metavar="PUERTO", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.servidor:
+        servir(args.servidor, args.latencia_ms, args.conexion_ms, args.fallos)
+        return
+    
+    # Los avisos de cada reintento taparían la tabla
+    logging.getLogger("app.transporte_db").setLevel(logging.ERROR)
+    
+    puerto = _puerto_libre()
+    servidor = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.transporte", "--servidor", str(puerto),
+        "--latencia-ms", str(args.latencia_ms),
+        "--conexion-ms", str(args.conexion_ms),
+        "--fallos", str(args.fallos),
+    ])
+    try:
+        _esperar_servidor(puerto)
+        url = f"http://127.0.0.1:{puerto}"
+        resultados = [
+            medir(nombre, url, args.hilos, args.consultas, args.rafagas, args.pausa)
+            for nombre in args.sesiones
+        ]
+    finally:
+        servidor.terminate()
+        servidor.wait()
+    
+    print(
+        f"{args.rafagas} ráfagas de {args.consultas} consultas, {args.hilos} hilos, "
+        f"pausa {args.pausa:g} s, "
+        f"latencia {args.latencia_ms:g} ms + {args.conexion_ms:g} ms por conexión, "
+        f"fallos {args.fallos:.0%}\n"
+    )
+    print(f"{'sesión':<10} {'consultas/s':>12} {'p50 ms':>8} {'p95 ms':>8} {'errores':>10}")
+    for r in resultados:
+        print(
+            f"{r['sesion']:<10} {r['consultas_por_segundo']:>12.0f} {r['p50_ms']:>8.1f} "
+            f"{r['p95_ms']:>8.1f} {r['errores']:>5}/{r['total']:<4}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+-- migrations/001_lotes_snapshots.sql
+--
+-- Snapshots versionados de costos e indicadores de lotes cerrados.
+-- Se crean al cerrar un lote y cuando se pide recalcular tras una corrección;
+-- los reportes de un lote cerrado se sirven desde la versión más reciente.
+
+CREATE TABLE IF NOT EXISTS lotes_snapshots (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    lote_id UUID NOT NULL REFERENCES lotes(id) ON DELETE CASCADE,
+    version INTEGER NOT NULL CHECK (version > 0),
+    costos JSONB NOT NULL,
+    indicadores JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    UNIQUE (lote_id, version)
+);
+
+CREATE INDEX IF NOT EXISTS idx_lotes_snapshots_lote_version
+    ON lotes_snapshots(lote_id, version DESC);
@@ -0,0 +1,59 @@
+-- migrations/002_vistas_agregados_costos.sql
+--
+-- Vistas de agregados para los cálculos de costos e indicadores.
+-- El backend las consulta en lugar de traer cada fila de consumo, gastos,
+-- mortalidad y cosechas: Postgres suma y por la red solo viajan totales.
+-- Los filtros por lote_id (eq / in) se aplican antes de agrupar, así que
+-- consultar la vista de un lote no recorre los demás.
+--
+-- security_invoker: la vista respeta los permisos (RLS) de quien consulta.
+
+-- Consumo de alimento por lote, mes y tipo de alimento
+CREATE OR REPLACE VIEW consumo_por_lote_mes
+WITH (security_invoker = true) AS
+SELECT
+    c.lote_id,
+    to_char(c.fecha, 'YYYY-MM') AS mes,
+    a.tipo,
+    SUM(c.cantidad_bultos) AS bultos,
+    SUM(c.cantidad_bultos * a.peso_bulto_kg) AS kg,
+    SUM(c.cantidad_bultos * a.costo_por_bulto) AS costo
+FROM consumo_alimento c
+JOIN alimentos a ON a.id = c.alimento_id
+GROUP BY c.lote_id, to_char(c.fecha, 'YYYY-MM'), a.tipo;
+
+-- Gastos directos por lote, mes y tipo
+CREATE OR REPLACE VIEW gastos_directos_por_lote_mes
+WITH (security_invoker = true) AS
+SELECT
+    lote_id,
+    to_char(fecha, 'YYYY-MM') AS mes,
+    tipo,
+    SUM(monto) AS monto
+FROM gastos_directos
+GROUP BY lote_id, to_char(fecha, 'YYYY-MM'), tipo;
+
+-- Total de mortalidad por lote
+CREATE OR REPLACE VIEW mortalidad_por_lote
+WITH (security_invoker = true) AS
+SELECT
+    lote_id,
+    SUM(cantidad)::INTEGER AS cantidad
+FROM mortalidad
+GROUP BY lote_id;
+
+-- Animales y kilos vendidos por lote
+CREATE OR REPLACE VIEW cosechas_por_lote
+WITH (security_invoker = true) AS
+SELECT
+    lote_id,
+    SUM(cantidad_animales)::INTEGER AS cantidad_animales,
+    SUM(peso_total_kg) AS peso_total_kg
+FROM cosechas
+GROUP BY lote_id;
+
+-- Índices para filtrar por lote antes de agrupar
+CREATE INDEX IF NOT EXISTS idx_consumo_alimento_lote ON consumo_alimento(lote_id);
+CREATE INDEX IF NOT EXISTS idx_gastos_directos_lote ON gastos_directos(lote_id);
+CREATE INDEX IF NOT EXISTS idx_mortalidad_lote ON mortalidad(lote_id);
+CREATE INDEX IF NOT EXISTS idx_cosechas_lote ON cosechas(lote_id);
@@ -0,0 +1,39 @@
+-- migrations/003_vistas_consumo_diario.sql
+--
+-- Consumo de alimento sumado por día y tipo, para las series de consumo
+-- (GET /api/consumo-alimento/.../serie). El backend agrupa estas filas en
+-- días, semanas o meses; por la red viaja a lo sumo una fila por día y tipo,
+-- no cada registro de consumo.
+--
+-- security_invoker: la vista respeta los permisos (RLS) de quien consulta.
+
+-- Consumo de un lote por día y tipo de alimento
+CREATE OR REPLACE VIEW consumo_por_lote_dia
+WITH (security_invoker = true) AS
+SELECT
+    c.lote_id,
+    c.fecha,
+    a.tipo,
+    SUM(c.cantidad_bultos) AS bultos,
+    SUM(c.cantidad_bultos * a.peso_bulto_kg) AS kg,
+    SUM(c.cantidad_bultos * a.costo_por_bulto) AS costo
+FROM consumo_alimento c
+JOIN alimentos a ON a.id = c.alimento_id
+GROUP BY c.lote_id, c.fecha, a.tipo;
+
+-- Consumo de toda la granja por día y tipo de alimento
+CREATE OR REPLACE VIEW consumo_por_dia
+WITH (security_invoker = true) AS
+SELECT
+    c.fecha,
+    a.tipo,
+    SUM(c.cantidad_bultos) AS bultos,
+    SUM(c.cantidad_bultos * a.peso_bulto_kg) AS kg,
+    SUM(c.cantidad_bultos * a.costo_por_bulto) AS costo
+FROM consumo_alimento c
+JOIN alimentos a ON a.id = c.alimento_id
+GROUP BY c.fecha, a.tipo;
+
+-- Series por lote filtran por lote_id y ordenan por fecha
+CREATE INDEX IF NOT EXISTS idx_consumo_alimento_lote_fecha ON consumo_alimento(lote_id, fecha);
+CREATE INDEX IF NOT EXISTS idx_consumo_alimento_fecha ON consumo_alimento(fecha);
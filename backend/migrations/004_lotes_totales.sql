@@ -0,0 +1,106 @@
+-- migrations/004_lotes_totales.sql
+--
+-- Totales acumulados por lote: mortalidad, animales y kilos vendidos,
+-- alimento (kg y costo) y gastos directos.
+-- Las rutas que crean, modifican o eliminan registros suman la diferencia
+-- con acumular_totales_lote, así get_lote y la lista de lotes leen una fila
+-- por lote en lugar de sumar todos los registros en cada consulta.
+-- reconciliar_totales_lotes los recalcula desde cero a partir de las vistas
+-- de migrations/002 (python -m app.reconciliar_totales).
+
+CREATE TABLE IF NOT EXISTS lotes_totales (
+    lote_id UUID PRIMARY KEY REFERENCES lotes(id) ON DELETE CASCADE,
+    mortalidad INTEGER NOT NULL DEFAULT 0,
+    animales_vendidos INTEGER NOT NULL DEFAULT 0,
+    kg_vendidos NUMERIC NOT NULL DEFAULT 0,
+    alimento_kg NUMERIC NOT NULL DEFAULT 0,
+    alimento_costo NUMERIC NOT NULL DEFAULT 0,
+    gastos_directos NUMERIC NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+);
+
+-- Suma diferencias a los totales de un lote, creando la fila si no existe.
+-- Es una sola sentencia: dos peticiones simultáneas no se pisan.
+-- p_deltas: {"mortalidad": 2, "kg_vendidos": "-105.5", ...}; lo que falta vale 0
+CREATE OR REPLACE FUNCTION acumular_totales_lote(p_lote_id UUID, p_deltas JSONB)
+RETURNS VOID
+LANGUAGE sql
+SECURITY INVOKER
+AS $$
+    INSERT INTO lotes_totales AS t (
+        lote_id, mortalidad, animales_vendidos, kg_vendidos,
+        alimento_kg, alimento_costo, gastos_directos, updated_at
+    )
+    VALUES (
+        p_lote_id,
+        COALESCE((p_deltas->>'mortalidad')::INTEGER, 0),
+        COALESCE((p_deltas->>'animales_vendidos')::INTEGER, 0),
+        COALESCE((p_deltas->>'kg_vendidos')::NUMERIC, 0),
+        COALESCE((p_deltas->>'alimento_kg')::NUMERIC, 0),
+        COALESCE((p_deltas->>'alimento_costo')::NUMERIC, 0),
+        COALESCE((p_deltas->>'gastos_directos')::NUMERIC, 0),
+        now()
+    )
+    ON CONFLICT (lote_id) DO UPDATE SET
+        mortalidad = t.mortalidad + EXCLUDED.mortalidad,
+        animales_vendidos = t.animales_vendidos + EXCLUDED.animales_vendidos,
+        kg_vendidos = t.kg_vendidos + EXCLUDED.kg_vendidos,
+        alimento_kg = t.alimento_kg + EXCLUDED.alimento_kg,
+        alimento_costo = t.alimento_costo + EXCLUDED.alimento_costo,
+        gastos_directos = t.gastos_directos + EXCLUDED.gastos_directos,
+        updated_at = now();
+$$;
+
+-- Recalcula desde cero los totales de un lote, o de todos con NULL.
+-- Retorna la cantidad de lotes recalculados.
+CREATE OR REPLACE FUNCTION reconciliar_totales_lotes(p_lote_id UUID DEFAULT NULL)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY INVOKER
+AS $$
+DECLARE
+    recalculados INTEGER;
+BEGIN
+    INSERT INTO lotes_totales AS t (
+        lote_id, mortalidad, animales_vendidos, kg_vendidos,
+        alimento_kg, alimento_costo, gastos_directos, updated_at
+    )
+    SELECT
+        l.id,
+        COALESCE(m.cantidad, 0),
+        COALESCE(c.cantidad_animales, 0),
+        COALESCE(c.peso_total_kg, 0),
+        COALESCE(a.kg, 0),
+        COALESCE(a.costo, 0),
+        COALESCE(g.monto, 0),
+        now()
+    FROM lotes l
+    LEFT JOIN mortalidad_por_lote m ON m.lote_id = l.id
+    LEFT JOIN cosechas_por_lote c ON c.lote_id = l.id
+    LEFT JOIN (
+        SELECT lote_id, SUM(kg) AS kg, SUM(costo) AS costo
+        FROM consumo_por_lote_mes
+        GROUP BY lote_id
+    ) a ON a.lote_id = l.id
+    LEFT JOIN (
+        SELECT lote_id, SUM(monto) AS monto
+        FROM gastos_directos_por_lote_mes
+        GROUP BY lote_id
+    ) g ON g.lote_id = l.id
+    WHERE p_lote_id IS NULL OR l.id = p_lote_id
+    ON CONFLICT (lote_id) DO UPDATE SET
+        mortalidad = EXCLUDED.mortalidad,
+        animales_vendidos = EXCLUDED.animales_vendidos,
+        kg_vendidos = EXCLUDED.kg_vendidos,
+        alimento_kg = EXCLUDED.alimento_kg,
+        alimento_costo = EXCLUDED.alimento_costo,
+        gastos_directos = EXCLUDED.gastos_directos,
+        updated_at = now();
+
+    GET DIAGNOSTICS recalculados = ROW_COUNT;
+    RETURN recalculados;
+END;
+$$;
+
+-- Carga inicial con los registros existentes
+SELECT reconciliar_totales_lotes();
@@ -0,0 +1,53 @@
+# tests/conftest.py
+
+"""
+Configuración común de las pruebas.
+No necesitan red ni base de datos: el cliente de Supabase se reemplaza por
+ClienteFalso (benchmarks/cliente_falso.py) con una granja sintética.
+"""
+
+import os
+
+# La configuración exige credenciales aunque nunca se usen
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "pruebas.sin.red")
+# Exceder el presupuesto de consultas de una ruta hace fallar la petición
+os.environ.setdefault("PRESUPUESTO_CONSULTAS_ESTRICTO", "true")
+# Sin calentamiento en segundo plano: cada prueba instala su propio cliente
+os.environ.setdefault("CALENTAR_AL_INICIAR", "false")
+
+import pytest  # noqa: E402
+
+import app.database as database  # noqa: E402
+from app.services.cache_reportes import cache_reportes  # noqa: E402
+from benchmarks.cliente_falso import ClienteFalso  # noqa: E402
+from benchmarks.granja_sintetica import generar_granja  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def granja() -> dict[str, list[dict]]:
+    """Tablas de una granja chica: 12 lotes, 6 corrales, 2 años"""
+    return generar_granja(12, corrales=6, anios=2, semilla=1)
+
+
+@pytest.fixture
+def instalar_cliente(monkeypatch):
+    """Instala un ClienteFalso como cliente de Supabase y lo devuelve"""
+    def instalar(tablas: dict[str, list[dict]], **opciones) -> ClienteFalso:
+        cliente = ClienteFalso(tablas, **opciones)
+        monkeypatch.setattr(database.db, "_client", cliente)
+        cache_reportes.limpiar()
+        return cliente
+    
+    return instalar
+
+
+@pytest.fixture
+def cliente_db(granja, instalar_cliente) -> ClienteFalso:
+    """ClienteFalso con la granja de `granja`, sin tope de filas"""
+    return instalar_cliente(granja)
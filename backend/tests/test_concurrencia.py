@@ -0,0 +1,57 @@
+# tests/test_concurrencia.py
+
+"""Un reporte lento no frena al resto de las peticiones del mismo worker"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from app.main import app
+from benchmarks.cliente_falso import ConsultaFalsa
+
+# Lo que tarda cada consulta del reporte (Supabase lento)
+DEMORA_SEGUNDOS = 0.3
+# Plazo de /health mientras corre el reporte
+PLAZO_SEGUNDOS = 0.1
+
+
+def _consultas_lentas(monkeypatch) -> threading.Event:
+    """
+    Cada execute() del cliente falso bloquea su hilo DEMORA_SEGUNDOS; el
+    evento marca la primera.
+    """
+    empezo = threading.Event()
+    execute = ConsultaFalsa.execute
+    
+    def lento(self):
+        empezo.set()
+        time.sleep(DEMORA_SEGUNDOS)
+        return execute(self)
+    
+    monkeypatch.setattr(ConsultaFalsa, "execute", lento)
+    return empezo
+
+
+@pytest.mark.anyio
+async def test_health_responde_mientras_corre_un_reporte_lento(cliente_db, monkeypatch):
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://prueba") as http:
+        # La sonda de /health queda en cache antes de que la base se ponga lenta
+        assert (await http.get("/health")).json()["database"] == "connected"
+        
+        empezo = _consultas_lentas(monkeypatch)
+        inicio = time.perf_counter()
+        reporte = asyncio.ensure_future(http.get("/api/reportes/resumen"))
+        while not empezo.is_set():
+            await asyncio.sleep(0.005)
+        
+        salud = await asyncio.wait_for(http.get("/health"), timeout=PLAZO_SEGUNDOS)
+        assert salud.status_code == 200
+        assert not reporte.done()
+        
+        respuesta = await reporte
+        assert respuesta.status_code == 200
+        assert time.perf_counter() - inicio >= DEMORA_SEGUNDOS
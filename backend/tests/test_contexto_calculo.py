@@ -0,0 +1,92 @@
+# tests/test_contexto_calculo.py
+
+"""
+Consultas de cada cálculo con un ContextoCalculo: fijan la cantidad para
+que un patrón N+1 o una carga repetida se note en la prueba, no en producción.
+"""
+
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.services.calculo_service import CalculoCostosService
+from app.services.contexto_calculo import ContextoCalculo
+
+# Tablas de toda la granja que necesita cualquier prorrateo
+PRORRATEO = ["lotes", "lotes_corrales", "gastos_mensuales"]
+COSTOS = PRORRATEO + ["consumo_por_lote_mes", "gastos_directos_por_lote_mes"]
+INDICADORES = COSTOS + ["mortalidad_por_lote", "cosechas_por_lote"]
+
+
+@pytest.fixture
+def lote(cliente_db) -> dict:
+    return cliente_db.tablas["lotes"][0]
+
+
+def _mes_inicio(lote: dict) -> tuple[int, int]:
+    inicio = date.fromisoformat(lote["fecha_inicio"])
+    return inicio.year, inicio.month
+
+
+@pytest.mark.anyio
+async def test_costos_consulta_cada_tabla_una_vez(cliente_db, lote):
+    ctx = ContextoCalculo()
+    
+    await CalculoCostosService.calcular_costo_total_lote(lote["id"], ctx)
+    
+    assert sorted(ctx.consultas) == sorted(COSTOS)
+    assert len(cliente_db.peticiones) == len(COSTOS)
+
+
+@pytest.mark.anyio
+async def test_indicadores_consulta_cada_tabla_una_vez(cliente_db, lote):
+    ctx = ContextoCalculo()
+    
+    await CalculoCostosService.calcular_indicadores_eficiencia(lote["id"], ctx)
+    
+    assert sorted(ctx.consultas) == sorted(INDICADORES)
+    assert len(cliente_db.peticiones) == len(INDICADORES)
+
+
+@pytest.mark.anyio
+async def test_prorrateo_consulta_cada_tabla_una_vez(cliente_db, lote):
+    anio, mes = _mes_inicio(lote)
+    
+    ctx = ContextoCalculo()
+    await CalculoCostosService.prorratear_gastos_mensuales(lote["id"], anio, mes, ctx)
+    assert sorted(ctx.consultas) == sorted(PRORRATEO)
+    
+    ctx = ContextoCalculo()
+    await CalculoCostosService.prorratear_mes_granja(anio, mes, ctx)
+    assert sorted(ctx.consultas) == sorted(PRORRATEO)
+    
+    assert len(cliente_db.peticiones) == 2 * len(PRORRATEO)
+
+
+@pytest.mark.anyio
+async def test_la_misma_peticion_reutiliza_las_cargas(cliente_db, lote):
+    ctx = ContextoCalculo()
+    
+    # Costos e indicadores del mismo lote, en paralelo y después otra vez
+    await asyncio.gather(
+        CalculoCostosService.calcular_costo_total_lote(lote["id"], ctx),
+        CalculoCostosService.calcular_indicadores_eficiencia(lote["id"], ctx),
+    )
+    await CalculoCostosService.calcular_costo_total_lote(lote["id"], ctx)
+    await ctx.consumo(lote["id"])
+    
+    assert sorted(ctx.consultas) == sorted(INDICADORES)
+    assert len(cliente_db.peticiones) == len(INDICADORES)
+
+
+@pytest.mark.anyio
+async def test_una_carga_repetida_devuelve_las_mismas_filas(cliente_db, lote):
+    ctx = ContextoCalculo()
+    
+    primera, segunda = await asyncio.gather(ctx.asignaciones(), ctx.asignaciones())
+    tercera = await ctx.asignaciones()
+    
+    assert primera is segunda is tercera
+    assert ctx.consultas == ["lotes_corrales"]
+    assert cliente_db.peticiones == [("lotes_corrales", "select")]
@@ -0,0 +1,86 @@
+# tests/test_exportacion.py
+
+"""
+Exportación en streaming (CSV y XLSX escrito a mano): los archivos se leen
+con las bibliotecas de siempre y el primer bloque sale antes de la primera fila.
+"""
+
+import csv
+import io
+from decimal import Decimal
+
+import openpyxl
+import pytest
+
+from app.services.exportacion import ExportacionService
+
+COLUMNAS = [("lote", "Lote"), ("mes", "Mes"), ("costo", "Costo"), ("nota", "Observación")]
+
+FILAS = [
+    {"lote": "L-1", "mes": "2024-01", "costo": Decimal("1234.5678"), "nota": "<&> \"ñandú\""},
+    {"lote": "L-1", "mes": "2024-02", "costo": Decimal("0.01"), "nota": None},
+    {"lote": "L-2", "mes": "2024-02", "costo": 42, "nota": "a & b < c"},
+]
+
+
+class _Filas:
+    """Iterador asíncrono de FILAS que cuenta cuántas entregó"""
+    
+    def __init__(self, filas: list[dict]):
+        self._filas = iter(filas)
+        self.entregadas = 0
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> dict:
+        try:
+            fila = next(self._filas)
+        except StopIteration:
+            raise StopAsyncIteration
+        self.entregadas += 1
+        return fila
+
+
+async def _generar(formato: str) -> tuple[bytes, int]:
+    """(archivo completo, filas entregadas antes del primer bloque)"""
+    filas = _Filas(FILAS)
+    generador = getattr(ExportacionService, f"generar_{formato}")(COLUMNAS, filas)
+    
+    primero = await generador.__anext__()
+    antes_del_primero = filas.entregadas
+    resto = [bloque async for bloque in generador]
+    
+    assert primero
+    assert filas.entregadas == len(FILAS)
+    return primero + b"".join(resto), antes_del_primero
+
+
+@pytest.mark.anyio
+async def test_xlsx_se_abre_con_openpyxl():
+    contenido, antes_del_primero = await _generar("xlsx")
+    
+    assert antes_del_primero == 0
+    libro = openpyxl.load_workbook(io.BytesIO(contenido))
+    filas = list(libro.active.iter_rows(values_only=True))
+    assert filas == [
+        ("Lote", "Mes", "Costo", "Observación"),
+        ("L-1", "2024-01", 1234.5678, "<&> \"ñandú\""),
+        ("L-1", "2024-02", 0.01, None),
+        ("L-2", "2024-02", 42, "a & b < c"),
+    ]
+
+
+@pytest.mark.anyio
+async def test_csv_se_lee_con_el_modulo_csv():
+    contenido, antes_del_primero = await _generar("csv")
+    
+    assert antes_del_primero == 0
+    assert contenido.startswith("\ufeff".encode("utf-8"))
+    filas = list(csv.reader(io.StringIO(contenido.decode("utf-8-sig"))))
+    assert filas == [
+        ["Lote", "Mes", "Costo", "Observación"],
+        ["L-1", "2024-01", "1234.5678", "<&> \"ñandú\""],
+        ["L-1", "2024-02", "0.01", ""],
+        ["L-2", "2024-02", "42", "a & b < c"],
+    ]
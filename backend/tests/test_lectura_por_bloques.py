@@ -0,0 +1,73 @@
+# tests/test_lectura_por_bloques.py
+
+"""
+Lecturas de tablas y vistas de toda la granja frente al tope de filas por
+respuesta de PostgREST (max_rows): ninguna fila se pierde en el camino.
+"""
+
+import pytest
+
+from app.config import settings
+from app.services.calculo_service import CalculoCostosService
+from app.services.motor_vectorizado import MotorVectorizado
+from app.services.serie_consumo import SerieConsumoService
+
+# Menor que cualquier vista de la granja de prueba, para que todo se lea en varios bloques
+TOPE = 10
+
+MOTORES = {
+    "decimal": CalculoCostosService.calcular_resumen_granja,
+    "vectorizado": MotorVectorizado.calcular_resumen_granja,
+}
+
+
+@pytest.fixture
+def con_tope(granja, instalar_cliente, monkeypatch):
+    """Instala un cliente que corta cada respuesta en TOPE filas, como max_rows"""
+    def instalar():
+        monkeypatch.setattr(settings, "db_filas_por_bloque", TOPE)
+        return instalar_cliente(granja, max_filas=TOPE)
+    
+    return instalar
+
+
+def test_el_cliente_falso_corta_las_respuestas(granja, instalar_cliente):
+    cliente = instalar_cliente(granja, max_filas=TOPE)
+    
+    filas = cliente.table("consumo_por_lote_mes").select("*").execute().data
+    
+    assert len(filas) == TOPE < len(cliente.vista("consumo_por_lote_mes"))
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("motor", MOTORES)
+@pytest.mark.parametrize("estado", [None, "cerrado"])
+async def test_resumen_granja_no_pierde_filas(cliente_db, con_tope, motor, estado):
+    esperado = await MOTORES[motor](estado)
+    
+    cliente = con_tope()
+    resumen = await MOTORES[motor](estado)
+    
+    assert resumen == esperado
+    # La vista de consumo tiene varias veces TOPE filas: se leyó en varios bloques
+    assert cliente.peticiones.count(("consumo_por_lote_mes", "select")) > 1
+
+
+@pytest.mark.anyio
+async def test_exportacion_no_pierde_filas(cliente_db, con_tope):
+    esperado = [fila async for fila in CalculoCostosService.iterar_costos_mensuales()]
+    
+    con_tope()
+    filas = [fila async for fila in CalculoCostosService.iterar_costos_mensuales(tamano_bloque=5)]
+    
+    assert filas == esperado
+
+
+@pytest.mark.anyio
+async def test_serie_de_consumo_no_pierde_filas(cliente_db, con_tope):
+    esperado = await SerieConsumoService.serie_granja("mes", max_puntos=120)
+    
+    con_tope()
+    serie = await SerieConsumoService.serie_granja("mes", max_puntos=120)
+    
+    assert serie == esperado
@@ -0,0 +1,67 @@
+# tests/test_motor_vectorizado.py
+
+"""
+El motor vectorizado (enteros en NumPy) y el motor Decimal dan el mismo
+resumen de la granja, lote por lote, sobre granjas sintéticas.
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from app.services.calculo_service import CalculoCostosService
+from app.services.motor_vectorizado import MotorVectorizado, _entero
+from benchmarks.granja_sintetica import generar_granja
+from benchmarks.motor_vectorizado import comparar
+
+# Totales de la granja -> diferencia máxima; los montos exactos no admiten ninguna
+TOLERANCIAS_TOTALES = {
+    "lotes": Decimal(0),
+    "animales_iniciales": Decimal(0),
+    "mortalidad": Decimal(0),
+    "vendidos": Decimal(0),
+    "porcentaje_mortalidad": Decimal(0),
+    "total_vendido_kg": Decimal(0),
+    "costo_total": Decimal("0.01"),
+    "costo_por_kg_producido": Decimal("0.000001"),
+}
+
+
+@pytest.fixture(params=[(12, 6, 2), (60, 15, 4)], ids=["chica", "mediana"])
+def granja(request) -> dict[str, list[dict]]:
+    lotes, corrales, anios = request.param
+    return generar_granja(lotes, corrales=corrales, anios=anios, semilla=7)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("estado", [None, "cerrado"])
+async def test_ambos_motores_coinciden(cliente_db, estado):
+    decimal = await CalculoCostosService.calcular_resumen_granja(estado)
+    vectorizado = await MotorVectorizado.calcular_resumen_granja(estado)
+    
+    assert decimal["lotes"]
+    assert comparar(decimal, vectorizado) == []
+    for campo, tolerancia in TOLERANCIAS_TOTALES.items():
+        esperado, obtenido = decimal["totales"][campo], vectorizado["totales"][campo]
+        assert abs(Decimal(esperado) - Decimal(obtenido)) <= tolerancia, campo
+
+
+@pytest.mark.anyio
+async def test_montos_sumados_son_exactos(cliente_db):
+    decimal = await CalculoCostosService.calcular_resumen_granja()
+    resumen = await MotorVectorizado.calcular_resumen_granja()
+    vectorizado = {fila["lote_id"]: fila for fila in resumen["lotes"]}
+    
+    for fila in decimal["lotes"]:
+        otra = vectorizado[fila["lote_id"]]
+        for concepto in ("lechones", "alimento", "gastos_directos"):
+            assert otra["detalle_costos"][concepto] == fila["detalle_costos"][concepto]
+        assert otra["kg_alimento"] == fila["kg_alimento"]
+        assert otra["total_vendido_kg"] == fila["total_vendido_kg"]
+
+
+def test_los_montos_se_leen_sin_pasar_por_float():
+    # 0.1 + 0.2 en float no da 0.3; leído como Decimal sí
+    assert _entero("0.1", 10_000) + _entero(0.2, 10_000) == _entero(Decimal("0.3"), 10_000)
+    # Más de 15 cifras: escalado en float64 daría ...4568
+    assert _entero("1234567890123.4567", 10_000) == 12345678901234567
@@ -0,0 +1,133 @@
+# tests/test_paginacion.py
+
+"""
+Paginación por cursor de los endpoints de listas: recorrer todas las páginas
+devuelve las mismas filas, en el mismo orden, que pedir la lista completa.
+"""
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.main import app
+from app.paginacion import CABECERA_CURSOR
+
+# Chico para que cada lista ocupe varias páginas
+LIMITE = 7
+
+# Listas por lote (se prueba con el lote de más registros) y listas generales
+POR_LOTE = {
+    "consumo_alimento": "/api/consumo-alimento/lote/{}",
+    "mortalidad": "/api/mortalidad/lote/{}",
+    "cosechas": "/api/cosechas/lote/{}",
+    "gastos_directos": "/api/gastos-directos/lote/{}",
+}
+GENERALES = ["/api/lotes/", "/api/alimentos/", "/api/corrales/", "/api/gastos-mensuales/"]
+
+
+def _lote_con_mas_filas(granja: dict[str, list[dict]], tabla: str) -> str:
+    cantidades: dict[str, int] = {}
+    for fila in granja[tabla]:
+        cantidades[fila["lote_id"]] = cantidades.get(fila["lote_id"], 0) + 1
+    return max(cantidades, key=cantidades.get)
+
+
+def _lote_con_empate(granja: dict[str, list[dict]], tabla: str) -> str:
+    """Un lote con dos registros de `tabla` en la misma fecha"""
+    vistos = set()
+    for fila in granja[tabla]:
+        clave = (fila["lote_id"], fila["fecha"])
+        if clave in vistos:
+            return fila["lote_id"]
+        vistos.add(clave)
+    raise AssertionError(f"La granja de prueba no tiene empates en {tabla}")
+
+
+def _urls(granja: dict[str, list[dict]]) -> list[str]:
+    return GENERALES + [
+        url.format(_lote_con_mas_filas(granja, tabla)) for tabla, url in POR_LOTE.items()
+    ]
+
+
+async def _recorrer(
+    http: httpx.AsyncClient, url: str, limite: int = LIMITE
+) -> tuple[list[dict], int]:
+    """(filas de todas las páginas, cantidad de páginas)"""
+    filas: list[dict] = []
+    parametros = {"limite": limite}
+    paginas = 0
+    while True:
+        respuesta = await http.get(url, params=parametros)
+        assert respuesta.status_code == 200
+        paginas += 1
+        pagina = respuesta.json()
+        assert len(pagina) <= limite
+        filas += pagina
+        
+        cursor = respuesta.headers.get(CABECERA_CURSOR)
+        if cursor is None:
+            return filas, paginas
+        parametros = {"limite": limite, "cursor": cursor}
+
+
+@pytest.fixture
+async def http(cliente_db):
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://prueba") as cliente:
+        yield cliente
+
+
+@pytest.mark.anyio
+async def test_recorrer_paginas_devuelve_la_lista_completa(granja, http):
+    for url in _urls(granja):
+        completa = await http.get(url)
+        assert completa.status_code == 200
+        assert CABECERA_CURSOR not in completa.headers
+        
+        filas, paginas = await _recorrer(http, url)
+        
+        assert filas == completa.json(), url
+        assert paginas == max(1, -(-len(filas) // LIMITE)), url
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("tabla, elegir_lote, limite", [
+    ("consumo_alimento", _lote_con_mas_filas, LIMITE),
+    # Dos muertes el mismo día: de a una fila, el cursor desempata por id
+    ("mortalidad", _lote_con_empate, 1),
+])
+async def test_recorrer_paginas_coincide_con_una_pagina_grande(
+    granja, http, tabla, elegir_lote, limite
+):
+    url = POR_LOTE[tabla].format(elegir_lote(granja, tabla))
+    grande = await http.get(url, params={"limite": settings.paginacion_limite_maximo})
+    assert CABECERA_CURSOR not in grande.headers
+    
+    filas, paginas = await _recorrer(http, url, limite)
+    
+    assert filas == grande.json()
+    assert paginas > 1
+
+
+@pytest.mark.anyio
+async def test_sin_limite_ni_cursor_no_se_corta_la_lista(granja, http):
+    lote_id = _lote_con_mas_filas(granja, "consumo_alimento")
+    registros = [fila for fila in granja["consumo_alimento"] if fila["lote_id"] == lote_id]
+    assert len(registros) > settings.paginacion_limite_defecto
+    
+    respuesta = await http.get(POR_LOTE["consumo_alimento"].format(lote_id))
+    
+    assert len(respuesta.json()) == len(registros)
+    fechas = [fila["fecha"] for fila in respuesta.json()]
+    assert fechas == sorted(fechas, reverse=True)
+
+
+@pytest.mark.anyio
+async def test_cursor_sin_limite_usa_el_limite_por_defecto(granja, http):
+    url = POR_LOTE["consumo_alimento"].format(_lote_con_mas_filas(granja, "consumo_alimento"))
+    primera = await http.get(url, params={"limite": LIMITE})
+    
+    siguiente = await http.get(url, params={"cursor": primera.headers[CABECERA_CURSOR]})
+    
+    assert len(siguiente.json()) == settings.paginacion_limite_defecto
+    assert CABECERA_CURSOR in siguiente.headers
@@ -0,0 +1,152 @@
+# tests/test_serie_consumo.py
+
+"""
+SerieConsumoService.agrupar: períodos, puntos que juntan varios períodos,
+relleno con ceros y separación por tipo de alimento. Es pura: no usa la base.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from app.services.serie_consumo import SerieConsumoService
+
+CERO = {"bultos": Decimal(0), "kg": Decimal(0), "costo": Decimal(0)}
+
+
+def _fila(fecha: str, tipo: str = "engorde", bultos="1", kg="40", costo="100") -> dict:
+    return {"fecha": fecha, "tipo": tipo, "bultos": bultos, "kg": kg, "costo": costo}
+
+
+def _montos(bultos, kg, costo) -> dict:
+    return {"bultos": Decimal(bultos), "kg": Decimal(kg), "costo": Decimal(costo)}
+
+
+def _rangos(serie: dict) -> list[tuple[date, date]]:
+    return [(punto["desde"], punto["hasta"]) for punto in serie["puntos"]]
+
+
+def test_sin_filas_ni_fechas_la_serie_queda_vacia():
+    serie = SerieConsumoService.agrupar([], "dia", 10)
+    
+    assert serie == {
+        "bucket": "dia",
+        "periodos_por_punto": 1,
+        "desde": None,
+        "hasta": None,
+        "totales": CERO,
+        "puntos": []
+    }
+
+
+def test_sin_filas_con_fechas_todos_los_puntos_en_cero():
+    serie = SerieConsumoService.agrupar([], "dia", 10, date(2024, 3, 1), date(2024, 3, 3))
+    
+    assert _rangos(serie) == [(date(2024, 3, d), date(2024, 3, d)) for d in (1, 2, 3)]
+    assert all(punto["por_tipo"] == {} for punto in serie["puntos"])
+    assert all({c: punto[c] for c in CERO} == CERO for punto in serie["puntos"])
+    assert serie["totales"] == CERO
+
+
+def test_dias_sin_consumo_quedan_en_cero():
+    filas = [_fila("2024-03-01"), _fila("2024-03-04", bultos="2", kg="80", costo="200")]
+    
+    serie = SerieConsumoService.agrupar(filas, "dia", 10)
+    
+    assert serie["desde"] == date(2024, 3, 1) and serie["hasta"] == date(2024, 3, 4)
+    assert [punto["bultos"] for punto in serie["puntos"]] == [
+        Decimal(1), Decimal(0), Decimal(0), Decimal(2)
+    ]
+    assert serie["totales"] == _montos("3", "120", "300")
+
+
+def test_mas_periodos_que_puntos_junta_periodos_seguidos():
+    # 10 días en 3 puntos como máximo: 4 días por punto, el último con 2
+    filas = [_fila(f"2024-03-{d:02d}", bultos=str(d)) for d in range(1, 11)]
+    
+    serie = SerieConsumoService.agrupar(filas, "dia", 3)
+    
+    assert serie["periodos_por_punto"] == 4
+    assert _rangos(serie) == [
+        (date(2024, 3, 1), date(2024, 3, 4)),
+        (date(2024, 3, 5), date(2024, 3, 8)),
+        (date(2024, 3, 9), date(2024, 3, 10)),
+    ]
+    assert [punto["bultos"] for punto in serie["puntos"]] == [
+        Decimal(1 + 2 + 3 + 4), Decimal(5 + 6 + 7 + 8), Decimal(9 + 10)
+    ]
+    assert serie["totales"]["bultos"] == Decimal(55)
+
+
+def test_fechas_mas_amplias_que_los_datos_rellenan_al_principio_y_al_final():
+    filas = [_fila("2024-03-03"), _fila("2024-03-04")]
+    
+    serie = SerieConsumoService.agrupar(filas, "dia", 10, date(2024, 3, 1), date(2024, 3, 6))
+    
+    assert serie["desde"] == date(2024, 3, 1) and serie["hasta"] == date(2024, 3, 6)
+    assert _rangos(serie) == [(date(2024, 3, d), date(2024, 3, d)) for d in range(1, 7)]
+    assert [punto["bultos"] for punto in serie["puntos"]] == [
+        Decimal(0), Decimal(0), Decimal(1), Decimal(1), Decimal(0), Decimal(0)
+    ]
+
+
+def test_filas_fuera_del_rango_no_se_cuentan():
+    filas = [_fila("2024-02-28"), _fila("2024-03-02"), _fila("2024-03-09")]
+    
+    serie = SerieConsumoService.agrupar(filas, "dia", 10, date(2024, 3, 1), date(2024, 3, 3))
+    
+    assert len(serie["puntos"]) == 3
+    assert serie["totales"] == _montos("1", "40", "100")
+
+
+def test_semanas_van_de_lunes_a_domingo():
+    # 2024-01-07 es domingo y 2024-01-08 lunes: caen en semanas distintas
+    filas = [
+        _fila("2024-01-03"),
+        _fila("2024-01-07", bultos="2"),
+        _fila("2024-01-08", bultos="4"),
+        _fila("2024-01-16", bultos="8"),
+    ]
+    
+    serie = SerieConsumoService.agrupar(filas, "semana", 10)
+    
+    # La primera y la última semana se recortan al rango pedido
+    assert _rangos(serie) == [
+        (date(2024, 1, 3), date(2024, 1, 7)),
+        (date(2024, 1, 8), date(2024, 1, 14)),
+        (date(2024, 1, 15), date(2024, 1, 16)),
+    ]
+    assert [punto["bultos"] for punto in serie["puntos"]] == [
+        Decimal(3), Decimal(4), Decimal(8)
+    ]
+
+
+def test_meses_con_varios_meses_por_punto():
+    filas = [_fila("2024-01-15"), _fila("2024-03-31"), _fila("2024-05-02")]
+    
+    serie = SerieConsumoService.agrupar(filas, "mes", 2)
+    
+    # 5 meses en 2 puntos como máximo: 3 meses por punto
+    assert serie["periodos_por_punto"] == 3
+    assert _rangos(serie) == [
+        (date(2024, 1, 15), date(2024, 3, 31)),
+        (date(2024, 4, 1), date(2024, 5, 2)),
+    ]
+    assert [punto["bultos"] for punto in serie["puntos"]] == [Decimal(2), Decimal(1)]
+
+
+def test_cada_punto_separa_por_tipo():
+    filas = [
+        _fila("2024-03-01", "iniciador", bultos="1", kg="25", costo="50.5"),
+        _fila("2024-03-01", "engorde", bultos="2", kg="80", costo="120"),
+        _fila("2024-03-02", "iniciador", bultos="1.5", kg="37.5", costo="75.75"),
+    ]
+    
+    serie = SerieConsumoService.agrupar(filas, "semana", 10)
+    
+    [punto] = serie["puntos"]
+    assert punto["por_tipo"] == {
+        "iniciador": _montos("2.5", "62.5", "126.25"),
+        "engorde": _montos("2", "80", "120"),
+    }
+    assert {c: punto[c] for c in CERO} == _montos("4.5", "142.5", "246.25")
+    assert serie["totales"] == _montos("4.5", "142.5", "246.25")
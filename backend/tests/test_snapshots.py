@@ -0,0 +1,84 @@
+# tests/test_snapshots.py
+
+"""Snapshots de costos e indicadores al cerrar un lote"""
+
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+REPORTES = ("costos", "indicadores")
+
+
+def _json(respuesta) -> dict:
+    """Cuerpo de la respuesta con los números como Decimal, para comparar sin redondeos"""
+    assert respuesta.status_code == 200, respuesta.text
+    return json.loads(respuesta.content, parse_float=Decimal)
+
+
+def _decimales(datos) -> list:
+    """Todos los valores con decimales de un JSON ya leído"""
+    if isinstance(datos, dict):
+        return [valor for v in datos.values() for valor in _decimales(v)]
+    if isinstance(datos, list):
+        return [valor for v in datos for valor in _decimales(v)]
+    return [datos] if isinstance(datos, (float, Decimal)) else []
+
+
+@pytest.fixture
+def lote_activo(cliente_db) -> dict:
+    return next(lote for lote in cliente_db.tablas["lotes"] if lote["estado"] == "activo")
+
+
+@pytest.fixture
+def http():
+    with TestClient(app) as cliente:
+        yield cliente
+
+
+def _snapshot_antes_de_liberar(cliente_db) -> bool:
+    peticiones = cliente_db.peticiones
+    return (
+        peticiones.index(("lotes_snapshots", "insert"))
+        < peticiones.index(("lotes_corrales", "update"))
+    )
+
+
+def test_el_snapshot_responde_igual_que_el_calculo_en_vivo(cliente_db, lote_activo, http):
+    url = f"/api/reportes/lote/{lote_activo['id']}"
+    en_vivo = {reporte: _json(http.get(f"{url}/{reporte}")) for reporte in REPORTES}
+    
+    cliente_db.reiniciar_conteo()
+    assert http.post(f"/api/lotes/{lote_activo['id']}/cerrar").status_code == 200
+    assert _snapshot_antes_de_liberar(cliente_db)
+    
+    # Los montos se guardan como texto decimal, no como float
+    snapshot = cliente_db.tablas["lotes_snapshots"][-1]
+    assert isinstance(snapshot["costos"]["costo_total"], str)
+    assert isinstance(snapshot["indicadores"]["costos"]["costo_por_kg_producido"], str)
+    
+    desde_snapshot = {reporte: _json(http.get(f"{url}/{reporte}")) for reporte in REPORTES}
+    assert desde_snapshot["costos"].pop("fecha_cierre") == str(date.today())
+    en_vivo["costos"].pop("fecha_cierre")
+    assert desde_snapshot == en_vivo
+    assert _decimales(desde_snapshot)
+
+
+def test_la_ultima_cosecha_guarda_el_snapshot_antes_de_liberar(cliente_db, lote_activo, http):
+    cliente_db.reiniciar_conteo()
+    respuesta = http.post("/api/cosechas/", json={
+        "lote_id": lote_activo["id"],
+        "fecha": str(date.today()),
+        "tipo": "cabezas",
+        "cantidad_animales": 10,
+        "peso_total_kg": "1050.5",
+        "es_ultima_cosecha": True
+    })
+    
+    assert respuesta.status_code == 201, respuesta.text
+    assert _snapshot_antes_de_liberar(cliente_db)
+    assert cliente_db.tablas["lotes_snapshots"][-1]["lote_id"] == lote_activo["id"]
@@ -0,0 +1,130 @@
+# tests/test_transporte_db.py
+
+"""
+Política de reintentos de la sesión con la base: GET y HEAD se repiten ante
+502/503/504 y errores de red transitorios, como mucho `reintentos` veces; POST
+(escrituras y RPC) nunca. Y la sesión se puede cerrar como espera postgrest.
+"""
+
+import httpx
+import pytest
+from postgrest.utils import SyncClient
+
+from app import transporte_db
+from app.transporte_db import OpcionesTransporte, PostgrestConPool, TransporteConReintentos
+
+REINTENTOS = 2
+
+OPCIONES = OpcionesTransporte(
+    conexiones=1,
+    conexiones_ociosas=1,
+    keepalive_segundos=1,
+    http2=False,
+    timeout_conexion=1,
+    timeout_lectura=1,
+    reintentos=REINTENTOS,
+    espera_base_segundos=0.1,
+    espera_maxima_segundos=0.1,
+)
+
+
+class _Servidor:
+    """Falla las primeras `fallas` peticiones (con `falla`) y después responde 200"""
+    
+    def __init__(self, fallas: int, falla):
+        self.fallas = fallas
+        self.falla = falla
+        self.intentos = 0
+    
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.intentos += 1
+        if self.intentos > self.fallas:
+            return httpx.Response(200, json=[])
+        if isinstance(self.falla, int):
+            return httpx.Response(self.falla)
+        raise self.falla("sin conexión", request=request)
+
+
+@pytest.fixture(autouse=True)
+def esperas(monkeypatch) -> list[float]:
+    """Registra las esperas entre intentos en lugar de dormir"""
+    registradas: list[float] = []
+    monkeypatch.setattr(transporte_db.time, "sleep", registradas.append)
+    return registradas
+
+
+def _cliente(servidor: _Servidor) -> httpx.Client:
+    transporte = TransporteConReintentos(httpx.MockTransport(servidor), OPCIONES)
+    return httpx.Client(transport=transporte, base_url="http://prueba")
+
+
+@pytest.mark.parametrize("metodo", ["GET", "HEAD"])
+@pytest.mark.parametrize("falla", [502, 503, 504, httpx.ConnectError, httpx.ReadTimeout])
+@pytest.mark.parametrize("fallas", range(1, REINTENTOS + 1))
+def test_lectura_se_reintenta_hasta_responder(metodo, falla, fallas, esperas):
+    servidor = _Servidor(fallas, falla)
+    
+    respuesta = _cliente(servidor).request(metodo, "/lotes")
+    
+    assert respuesta.status_code == 200
+    assert servidor.intentos == fallas + 1
+    assert len(esperas) == fallas
+    assert all(0 <= espera <= OPCIONES.espera_maxima_segundos for espera in esperas)
+
+
+@pytest.mark.parametrize("falla", [503, httpx.ConnectError])
+def test_post_no_se_reintenta(falla, esperas):
+    servidor = _Servidor(1, falla)
+    cliente = _cliente(servidor)
+    
+    if isinstance(falla, int):
+        assert cliente.post("/rpc/cerrar_lote", json={}).status_code == falla
+    else:
+        with pytest.raises(falla):
+            cliente.post("/rpc/cerrar_lote", json={})
+    
+    assert servidor.intentos == 1
+    assert esperas == []
+
+
+def test_error_de_red_se_propaga_despues_del_ultimo_reintento():
+    servidor = _Servidor(REINTENTOS + 1, httpx.ConnectError)
+    
+    with pytest.raises(httpx.ConnectError):
+        _cliente(servidor).get("/lotes")
+    
+    assert servidor.intentos == REINTENTOS + 1
+
+
+def test_estado_transitorio_se_devuelve_despues_del_ultimo_reintento():
+    servidor = _Servidor(REINTENTOS + 1, 503)
+    
+    respuesta = _cliente(servidor).get("/lotes")
+    
+    assert respuesta.status_code == 503
+    assert servidor.intentos == REINTENTOS + 1
+
+
+@pytest.mark.parametrize("falla", [500, 404, httpx.PoolTimeout])
+def test_errores_no_transitorios_no_se_reintentan(falla):
+    servidor = _Servidor(1, falla)
+    cliente = _cliente(servidor)
+    
+    if isinstance(falla, int):
+        assert cliente.get("/lotes").status_code == falla
+    else:
+        with pytest.raises(falla):
+            cliente.get("/lotes")
+    
+    assert servidor.intentos == 1
+
+
+def test_postgrest_con_pool_se_cierra_sin_errores():
+    with PostgrestConPool("http://prueba/rest/v1") as cliente:
+        assert isinstance(cliente.session, SyncClient)
+        assert isinstance(cliente.session._transport, TransporteConReintentos)
+    assert cliente.session.is_closed
+    
+    otro = PostgrestConPool("http://prueba/rest/v1")
+    otro.aclose()
+    assert otro.session.is_closed
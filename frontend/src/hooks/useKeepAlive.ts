@@ -1,9 +1,10 @@
 // Hook para mantener activo el backend con peticiones periódicas
 import { useEffect, useRef } from 'react';
 import apiClient from '../services/api.client';
+import { API_URL } from '../config/api.config';
 
 /**
- * Hook que hace peticiones periódicas al endpoint de health para mantener
+ * Hook que hace peticiones periódicas al endpoint /livez para mantener
  * activo el backend de Render (plan free se duerme después de 15 min de inactividad)
  * 
  * @param intervalMinutes - Intervalo en minutos entre cada petición (default: 3)
@@ -20,8 +21,10 @@ export function useKeepAlive(intervalMinutes: number = 3, enabled: boolean = tru
     // Función para hacer ping al backend
     const pingBackend = async () => {
       try {
-        // Hacer petición silenciosa al health endpoint
-        await apiClient.get('/health', {
+        // Petición silenciosa a /livez: no consulta la base de datos.
+        // Está en la raíz del backend, fuera de /api
+        await apiClient.get('/livez', {
+          baseURL: API_URL.replace(/\/api\/?$/, ''),
           // No mostrar logs en consola para esta petición
           headers: {
             'X-Keep-Alive': 'true'